@@ -1,44 +1,288 @@
-from bintrees import RBTree
 from process import Process
-from typing import List
+from typing import Any, Iterator, List, Optional, Tuple
+
+# CFS runqueue: a red-black tree ordered by (vruntime, seq) that caches its leftmost node,
+# the same idea as the kernel's rb_root_cached. seq is an insertion counter, so processes with
+# equal vruntime are kept in FIFO order instead of being nudged to a unique key.
+#
+# get_min / min_vruntime are O(1), add / pop_min / remove are O(log n). Items are handles
+# (a Process, or anything hashable) and can be removed directly without a key lookup.
+
+class _Node:
+    __slots__ = ("vruntime", "seq", "item", "left", "right", "parent", "red")
+
+    def __init__(self, vruntime: float, seq: int, item: Any):
+        self.vruntime = vruntime
+        self.seq = seq
+        self.item = item
+        self.left = None
+        self.right = None
+        self.parent = None
+        self.red = True
 
 class RedBlackTree:
     def __init__(self):
-        self.tree = RBTree()
-        self.pids = set()
-        self.vruntimes = set()
-
-    # add a process to the tree, return True if added successfully, False otherwise
-    def add(self, process: Process) -> bool:
-        # we need this because bintrees.RBTree does not allow duplicate keys and it will override the existing one
-        if process.pid in self.pids or process.vruntime in self.vruntimes:
+        nil = _Node(0.0, -1, None)
+        nil.left = nil.right = nil.parent = nil
+        nil.red = False
+        self._nil = nil
+        self._root = nil
+        self._leftmost = nil
+        self._nodes = {}
+        self._seq = 0
+        # inserts that found an equal vruntime already queued, ordered by insertion instead
+        self.ties = 0
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, item: Any) -> bool:
+        return item in self._nodes
+
+    # add an item with the given vruntime, return True if added, False if it is already queued
+    def add(self, item: Any, vruntime: float) -> bool:
+        if item in self._nodes:
             return False
-        self.tree.insert(process.vruntime, process)
-        self.pids.add(process.pid)
-        self.vruntimes.add(process.vruntime)
+
+        nil = self._nil
+        node = _Node(vruntime, self._seq, item)
+        self._seq += 1
+        node.left = node.right = nil
+
+        # seq only grows, so a new node goes right of every node with the same vruntime.
+        # the last node we go right of is the in-order predecessor of the new node
+        parent = nil
+        cur = self._root
+        predecessor = nil
+        while cur is not nil:
+            parent = cur
+            if vruntime < cur.vruntime:
+                cur = cur.left
+            else:
+                predecessor = cur
+                cur = cur.right
+
+        node.parent = parent
+        if parent is nil:
+            self._root = node
+        elif vruntime < parent.vruntime:
+            parent.left = node
+        else:
+            parent.right = node
+
+        if predecessor is nil:
+            self._leftmost = node
+        elif predecessor.vruntime == vruntime:
+            self.ties += 1
+
+        self._insert_fixup(node)
+        self._nodes[item] = node
         return True
 
-    # return True if the process is removed successfully, False if not found
-    # we assume that vruntime is unique
-    def remove(self, vruntime: float) -> bool:
-        process = self.tree.get(vruntime)
-        if process is None:
+    # return True if the item is removed, False if it is not queued
+    def remove(self, item: Any) -> bool:
+        node = self._nodes.pop(item, None)
+        if node is None:
             return False
-
-        self.tree.remove(vruntime)
-        self.pids.remove(process.pid)
-        self.vruntimes.remove(vruntime)
+        self._delete(node)
         return True
 
-    # return the process object that has the minimum vruntime
-    def get_min(self) -> Process:
-        return self.tree.min_item()[1]
+    # return the item with the minimum (vruntime, seq), None if the tree is empty
+    def get_min(self) -> Any:
+        return self._leftmost.item
+
+    def min_vruntime(self) -> float:
+        return self._leftmost.vruntime
+
+    def pop_min(self) -> Any:
+        node = self._leftmost
+        if node is self._nil:
+            return None
+        del self._nodes[node.item]
+        self._delete(node)
+        return node.item
+
+    # vruntime the item was queued with, None if not queued
+    def find(self, item: Any) -> Optional[float]:
+        node = self._nodes.get(item)
+        return None if node is None else node.vruntime
+
+    def items(self) -> Iterator[Tuple[float, Any]]:
+        nil = self._nil
+        stack = []
+        cur = self._root
+        while stack or cur is not nil:
+            while cur is not nil:
+                stack.append(cur)
+                cur = cur.left
+            cur = stack.pop()
+            yield cur.vruntime, cur.item
+            cur = cur.right
 
-    def find(self, vruntime: float) -> Process:
-        return self.tree.get(vruntime)
-    
     def get_all_vruntime(self) -> List[float]:
-        return list(self.tree.keys())
+        return [vruntime for vruntime, _ in self.items()]
+
+    def _rotate_left(self, x: _Node):
+        nil = self._nil
+        y = x.right
+        x.right = y.left
+        if y.left is not nil:
+            y.left.parent = x
+        y.parent = x.parent
+        if x.parent is nil:
+            self._root = y
+        elif x is x.parent.left:
+            x.parent.left = y
+        else:
+            x.parent.right = y
+        y.left = x
+        x.parent = y
+
+    def _rotate_right(self, x: _Node):
+        nil = self._nil
+        y = x.left
+        x.left = y.right
+        if y.right is not nil:
+            y.right.parent = x
+        y.parent = x.parent
+        if x.parent is nil:
+            self._root = y
+        elif x is x.parent.right:
+            x.parent.right = y
+        else:
+            x.parent.left = y
+        y.right = x
+        x.parent = y
+
+    def _insert_fixup(self, z: _Node):
+        while z.parent.red:
+            zp = z.parent
+            zpp = zp.parent
+            if zp is zpp.left:
+                uncle = zpp.right
+                if uncle.red:
+                    zp.red = False
+                    uncle.red = False
+                    zpp.red = True
+                    z = zpp
+                else:
+                    if z is zp.right:
+                        z = zp
+                        self._rotate_left(z)
+                        zp = z.parent
+                    zp.red = False
+                    zpp.red = True
+                    self._rotate_right(zpp)
+            else:
+                uncle = zpp.left
+                if uncle.red:
+                    zp.red = False
+                    uncle.red = False
+                    zpp.red = True
+                    z = zpp
+                else:
+                    if z is zp.left:
+                        z = zp
+                        self._rotate_right(z)
+                        zp = z.parent
+                    zp.red = False
+                    zpp.red = True
+                    self._rotate_left(zpp)
+        self._root.red = False
+
+    def _transplant(self, u: _Node, v: _Node):
+        if u.parent is self._nil:
+            self._root = v
+        elif u is u.parent.left:
+            u.parent.left = v
+        else:
+            u.parent.right = v
+        v.parent = u.parent
+
+    def _minimum(self, node: _Node) -> _Node:
+        while node.left is not self._nil:
+            node = node.left
+        return node
+
+    def _delete(self, z: _Node):
+        nil = self._nil
+        if z is self._leftmost:
+            # the leftmost node has no left child, so its successor is the minimum of its right
+            # subtree or else its parent
+            self._leftmost = self._minimum(z.right) if z.right is not nil else z.parent
+
+        y = z
+        y_red = y.red
+        if z.left is nil:
+            x = z.right
+            self._transplant(z, z.right)
+        elif z.right is nil:
+            x = z.left
+            self._transplant(z, z.left)
+        else:
+            y = self._minimum(z.right)
+            y_red = y.red
+            x = y.right
+            if y.parent is z:
+                x.parent = y
+            else:
+                self._transplant(y, y.right)
+                y.right = z.right
+                y.right.parent = y
+            self._transplant(z, y)
+            y.left = z.left
+            y.left.parent = y
+            y.red = z.red
+
+        if not y_red:
+            self._delete_fixup(x)
+
+    def _delete_fixup(self, x: _Node):
+        while x is not self._root and not x.red:
+            xp = x.parent
+            if x is xp.left:
+                w = xp.right
+                if w.red:
+                    w.red = False
+                    xp.red = True
+                    self._rotate_left(xp)
+                    w = xp.right
+                if not w.left.red and not w.right.red:
+                    w.red = True
+                    x = xp
+                else:
+                    if not w.right.red:
+                        w.left.red = False
+                        w.red = True
+                        self._rotate_right(w)
+                        w = xp.right
+                    w.red = xp.red
+                    xp.red = False
+                    w.right.red = False
+                    self._rotate_left(xp)
+                    x = self._root
+            else:
+                w = xp.left
+                if w.red:
+                    w.red = False
+                    xp.red = True
+                    self._rotate_right(xp)
+                    w = xp.left
+                if not w.left.red and not w.right.red:
+                    w.red = True
+                    x = xp
+                else:
+                    if not w.left.red:
+                        w.right.red = False
+                        w.red = True
+                        self._rotate_left(w)
+                        w = xp.left
+                    w.red = xp.red
+                    xp.red = False
+                    w.left.red = False
+                    self._rotate_right(xp)
+                    x = self._root
+        x.red = False
 
 if __name__ == "__main__":
     rbt = RedBlackTree()
@@ -46,19 +290,18 @@ if __name__ == "__main__":
     p1 = Process("process1", 0, 10, 1.0)
     p2 = Process("process2", 0, 15, 1.0)
     p3 = Process("process3", 0, 20, 1.0)
+    p4 = Process("process4", 0, 20, 1.0)
 
-    p1.vruntime = 5
-    p2.vruntime = 3
-    p3.vruntime = 8
-
-    rbt.add(p1)
-    rbt.add(p2)
-    rbt.add(p3)
+    rbt.add(p1, 5)
+    rbt.add(p2, 3)
+    rbt.add(p3, 8)
+    rbt.add(p4, 5) # same vruntime as process1, queued behind it
 
     print(rbt.get_min()) # process2
-    print(rbt.find(5)) # process1
-    print(rbt.find(10)) # None
-    print(rbt.remove(3)) # True
-    print(rbt.remove(3)) # False
-    print(rbt.get_min()) # process1
-    print(rbt.get_all_vruntime()) # [5, 8]
\ No newline at end of file
+    print(rbt.find(p1)) # 5
+    print(rbt.add(p1, 10)) # False
+    print(rbt.remove(p2)) # True
+    print(rbt.remove(p2)) # False
+    print(rbt.pop_min()) # process1
+    print(rbt.get_min()) # process4
+    print(rbt.get_all_vruntime()) # [5, 8]
@@ -0,0 +1,83 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from workload import Workload
+from scheduler.cfs import CFS
+from suite import SCALES, generate_workload
+
+# How far the fluid (GPS) CFS mode lands from the exact event engine.
+# For every workload of the validation set both run on the same jobs and the report gives the
+# largest per job deviation of completion and turnaround time, the error of the mean turnaround
+# and the time each engine took:
+#   python benchmarks/fluid_validation.py --sizes 100 1000 10000
+
+def deviation(workload: Workload, **options) -> Dict[str, float]:
+    exact_table = workload.new_table()
+    start = time.perf_counter()
+    CFS(**options).schedule(exact_table)
+    exact_seconds = time.perf_counter() - start
+
+    fluid_table = workload.new_table()
+    start = time.perf_counter()
+    CFS(mode="fluid", **options).schedule(fluid_table)
+    fluid_seconds = time.perf_counter() - start
+
+    exact = np.frombuffer(exact_table.completion_time, dtype=np.int64)
+    fluid = np.frombuffer(fluid_table.completion_time, dtype=np.int64)
+    arrival = np.frombuffer(exact_table.arrival_time, dtype=np.int64)
+    error = np.abs(fluid - exact)
+    exact_turnaround = exact - arrival
+    mean_turnaround = float(exact_turnaround.mean())
+    return {
+        "n": len(exact_table),
+        "max_completion_error": int(error.max()),
+        # per job, relative to its exact turnaround
+        "max_relative_error": float((error / np.maximum(exact_turnaround, 1)).max()),
+        "mean_turnaround": mean_turnaround,
+        "mean_turnaround_error": abs(float((fluid - arrival).mean()) - mean_turnaround) / max(mean_turnaround, 1.0),
+        "exact_seconds": exact_seconds,
+        "fluid_seconds": fluid_seconds,
+    }
+
+def validate(workloads: List[Workload], **options) -> Dict[str, Dict[str, float]]:
+    return {workload.name: deviation(workload, **options) for workload in workloads}
+
+def validation_set(sizes: List[int], scales: List[str], seeds: int = 1) -> List[Workload]:
+    workloads = []
+    for scale in scales:
+        for n in sizes:
+            for seed in range(seeds):
+                workload = generate_workload(n, scale, seed=7 + seed)
+                workload.name = f"{workload.name}-seed{7 + seed}"
+                workloads.append(workload)
+    return workloads
+
+def print_report(report: Dict[str, Dict[str, float]]):
+    print(f"{'workload':<24}{'max err ms':<12}{'max rel':<10}{'mean TAT':<12}{'TAT err':<10}"
+          f"{'exact s':<10}{'fluid s':<10}")
+    for name, row in report.items():
+        print(f"{name:<24}{row['max_completion_error']:<12}{row['max_relative_error']:<10.3f}"
+              f"{row['mean_turnaround']:<12.1f}{row['mean_turnaround_error']:<10.4f}"
+              f"{row['exact_seconds']:<10.3f}{row['fluid_seconds']:<10.3f}")
+    worst = max(report.values(), key=lambda row: row["mean_turnaround_error"])
+    print(f"\nworst mean turnaround error {worst['mean_turnaround_error']:.2%}, "
+          f"worst single job {max(row['max_completion_error'] for row in report.values())} ms")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="fluid CFS against the exact engine")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[100, 1000, 10000])
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=list(SCALES))
+    parser.add_argument("--seeds", type=int, default=1, help="workloads per size and scale")
+    args = parser.parse_args(argv)
+
+    print_report(validate(validation_set(args.sizes, args.scales, args.seeds)))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
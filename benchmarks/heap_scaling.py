@@ -0,0 +1,52 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import math
+import random
+import time
+from typing import List
+
+from process import Process
+from scheduler.sjf import SJF
+from scheduler.priority_scheduler import PriorityScheduler
+
+# Scaling of the heap-backed non-preemptive schedulers when jobs pile up.
+# Arrivals are much faster than the CPU drains them, so the ready queue grows to ~n
+# and every dispatch is a pop from a large queue.
+
+def backlog_processes(n: int, seed: int = 7) -> List[Process]:
+    rng = random.Random(seed)
+    return [Process(f"P{i+1}", rng.randint(0, n), rng.randint(1, 20), rng.randint(1, 3)) for i in range(n)]
+
+def time_schedule(scheduler, processes: List[Process]) -> float:
+    start = time.perf_counter()
+    scheduler.schedule(processes)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="SJF / Priority ready queue scaling benchmark")
+    parser.add_argument("--max-size", type=int, default=10**6)
+    args = parser.parse_args()
+
+    sizes = []
+    n = 1000
+    while n <= args.max_size:
+        sizes.append(n)
+        n *= 10
+
+    for scheduler in [SJF(), PriorityScheduler()]:
+        name = scheduler.__class__.__name__
+        print(f"\n=== {name} ===")
+        print(f"{'jobs':<12}{'seconds':<12}{'us/(n log n)':<16}{'exponent':<10}")
+        previous = None
+        for n in sizes:
+            elapsed = time_schedule(scheduler, backlog_processes(n))
+            per_op = 1e6 * elapsed / (n * math.log2(n))
+            # local slope on the log-log curve, ~1.0-1.1 for n log n
+            exponent = math.log(elapsed / previous[1]) / math.log(n / previous[0]) if previous else float("nan")
+            print(f"{n:<12}{elapsed:<12.3f}{per_op:<16.3f}{exponent:<10.2f}")
+            previous = (n, elapsed)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import random
+import time
+from typing import Callable, Dict, List
+
+from RBTree import RedBlackTree
+from scheduler_stats import SchedulerStats
+from scheduler.scheduler_base import Scheduler
+from scheduler.cfs import CFS
+from scheduler.o1 import NUM_PRIORITIES, O1Scheduler, RunQueue
+
+# Cost of one scheduling decision as the runqueue grows, O(1) bitmap arrays against the CFS
+# red-black tree.
+#   runqueue   the data structure alone: pick the next process and put it back with its new key
+#              (a new vruntime for CFS, the expired array for O(1)), runnable processes fixed at n
+#   scheduler  whole simulated decisions: n long jobs arrive at time 0 and the schedulers run
+#              until a fixed number of dispatches, through the online API
+#   python benchmarks/pick_next_cost.py --sizes 10 100 1000 10000 100000
+
+WEIGHTS = (1, 2, 3)
+
+def runqueue_cost(n: int, decisions: int, seed: int = 1) -> Dict[str, float]:
+    rng = random.Random(seed)
+    weights = [rng.choice(WEIGHTS) for _ in range(n)]
+
+    tree = RedBlackTree()
+    vruntime = [rng.random() for _ in range(n)]
+    for pid in range(n):
+        tree.add(pid, vruntime[pid])
+    start = time.perf_counter()
+    for _ in range(decisions):
+        pid = tree.pop_min()
+        vruntime[pid] += 4 / weights[pid]
+        tree.add(pid, vruntime[pid])
+    cfs = time.perf_counter() - start
+
+    scheduler = O1Scheduler()
+    priorities = [scheduler.level(weight)[0] for weight in weights]
+    rq = RunQueue()
+    for pid in range(n):
+        rq.active.push(pid, priorities[pid])
+    start = time.perf_counter()
+    for _ in range(decisions):
+        pid = rq.pop()
+        rq.expired.push(pid, priorities[pid])
+    o1 = time.perf_counter() - start
+    return {"CFS": 1e9 * cfs / decisions, "O1": 1e9 * o1 / decisions}
+
+def scheduler_cost(make: Callable[[], Scheduler], n: int, decisions: int, seed: int = 1) -> float:
+    rng = random.Random(seed)
+    stats = SchedulerStats()
+    online = make().online(stats=stats)
+    for i in range(n):
+        # long enough that nobody finishes before the dispatches are done. all n tie on vruntime 0,
+        # the CFS tree queues them FIFO in O(log n) each, so setup stays a few seconds at 10^5
+        online.submit((f"P{i}", 0, 10**9, rng.choice(WEIGHTS)))
+    online.pick_next()
+    base = stats.dispatches
+    start = time.perf_counter()
+    while stats.dispatches - base < decisions:
+        online.advance(online.time + 1000)
+    return 1e9 * (time.perf_counter() - start) / (stats.dispatches - base)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="per decision cost of O(1) vs CFS as the runqueue grows")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000, 100000])
+    parser.add_argument("--decisions", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    print(f"ns per decision, {NUM_PRIORITIES} priority levels, weights {WEIGHTS}")
+    print(f"{'runnable':>10}{'rq CFS':>10}{'rq O1':>10}{'sched CFS':>12}{'sched O1':>12}")
+    for n in args.sizes:
+        rq = runqueue_cost(n, args.decisions)
+        cfs = scheduler_cost(CFS, n, args.decisions)
+        o1 = scheduler_cost(O1Scheduler, n, args.decisions)
+        print(f"{n:>10}{rq['CFS']:>10.0f}{rq['O1']:>10.0f}{cfs:>12.0f}{o1:>12.0f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
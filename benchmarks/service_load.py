@@ -0,0 +1,71 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import asyncio
+import tempfile
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from service import SimulationService, query
+
+# Latency of the simulation service under many concurrent small queries.
+# A service is started in this process on a Unix socket, then every client connection sends its
+# queries of a small generated workload at once, and the time from the service reading a query to
+# its done message is recorded:
+#   python benchmarks/service_load.py --clients 20 --requests 20 --jobs 100 --batch-size 1 16
+
+def run_load(service: SimulationService, path: str, clients: int, requests: int, jobs: int,
+             schedulers: List[str]) -> Dict[str, float]:
+    async def client(index: int) -> List[float]:
+        batch = [{"id": k, "schedulers": schedulers,
+                  "workload": {"generator": {"seed": index}, "n": jobs, "replicate": k}} for k in range(requests)]
+        responses = await query(batch, path=path)
+        # the service stamps each done message with the time since it read the request
+        return [responses[k][-1]["ms"] for k in range(requests)]
+
+    async def main():
+        await service.start(path=path)
+        try:
+            start = time.perf_counter()
+            latencies = await asyncio.gather(*(client(i) for i in range(clients)))
+            return time.perf_counter() - start, np.concatenate([np.asarray(l) for l in latencies])
+        finally:
+            await service.close()
+
+    seconds, latencies = asyncio.run(main())
+    total = clients * requests
+    return {
+        "queries": total,
+        "seconds": seconds,
+        "queries_per_s": total / seconds,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "max_ms": float(latencies.max()),
+        "batches": service.batcher.batches,
+    }
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="load test of the simulation service")
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=20, help="queries per client")
+    parser.add_argument("--jobs", type=int, default=100, help="processes per workload")
+    parser.add_argument("--schedulers", nargs="+", default=["CFS", "RoundRobin"])
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, nargs="+", default=[1, 16])
+    args = parser.parse_args(argv)
+
+    print(f"{'batch':>6}{'queries':>9}{'q/s':>9}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}{'batches':>9}")
+    for batch_size in args.batch_size:
+        with tempfile.TemporaryDirectory() as tmp:
+            service = SimulationService(args.workers, batch_size=batch_size)
+            row = run_load(service, os.path.join(tmp, "service.sock"), args.clients, args.requests, args.jobs,
+                           args.schedulers)
+        print(f"{batch_size:>6}{row['queries']:>9}{row['queries_per_s']:>9.0f}{row['p50_ms']:>10.1f}"
+              f"{row['p99_ms']:>10.1f}{row['max_ms']:>10.1f}{row['batches']:>9}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import json
+import time
+import tracemalloc
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from process_table import ProcessTable
+from workload import Workload
+from scheduler.fcfs import FCFS
+from scheduler.sjf import SJF
+from scheduler.priority_scheduler import PriorityScheduler
+from scheduler.round_robin import RoundRobin
+from scheduler.cfs import CFS
+from scheduler.o1 import O1Scheduler
+
+# Timing and memory of every scheduler over generated workloads of growing size.
+# For each (scheduler, duration scale) the suite reports seconds and us per job for each size,
+# the fitted complexity exponent (slope of log time over log n) and the peak memory of one run,
+# and compares the times against a stored baseline:
+#   python benchmarks/suite.py --save-baseline benchmarks/baseline.json   # on the reference commit
+#   python benchmarks/suite.py --baseline benchmarks/baseline.json        # exits 1 on a regression
+
+SCHEDULERS = {
+    "FCFS": lambda: FCFS(),
+    "FCFS-vectorized": lambda: FCFS(vectorized=True),
+    "SJF": lambda: SJF(),
+    "Priority": lambda: PriorityScheduler(),
+    "RoundRobin": lambda: RoundRobin(time_slice=10),
+    "CFS": lambda: CFS(),
+    "CFS-fluid": lambda: CFS(mode="fluid"),
+    "O1": lambda: O1Scheduler(),
+}
+
+# (min, max) job duration in ms
+SCALES = {
+    "short": (1, 20),
+    "long": (10, 2000),
+}
+
+# arrivals are spread so the CPU is busy this fraction of the time, the ready queue
+# then stays short on average but builds up in bursts
+LOAD = 0.9
+
+def generate_workload(n: int, scale: str, seed: int = 7) -> Workload:
+    rng = np.random.default_rng(seed)
+    low, high = SCALES[scale]
+    duration = rng.integers(low, high + 1, size=n)
+    span = int(n * (low + high) / 2 / LOAD)
+    arrival = np.sort(rng.integers(0, span + 1, size=n))
+    weight = rng.integers(1, 4, size=n).astype(np.float64)
+    return Workload(ProcessTable.from_columns(arrival, duration, weight), name=f"{scale}-{n}")
+
+def time_run(name: str, workload: Workload) -> float:
+    table = workload.new_table()
+    scheduler = SCHEDULERS[name]()
+    start = time.perf_counter()
+    scheduler.schedule(table)
+    return time.perf_counter() - start
+
+def peak_memory(name: str, workload: Workload) -> int:
+    # bytes allocated by one run on top of the workload, measured on a separate run
+    # since tracing slows the hot loops down
+    tracemalloc.start()
+    try:
+        time_run(name, workload)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def fit_exponent(points: List[Tuple[int, float]]) -> float:
+    # sub-millisecond runs are mostly fixed cost, they would flatten the slope
+    points = [(n, seconds) for n, seconds in points if seconds >= 1e-3]
+    if len(points) < 2:
+        return float("nan")
+    sizes, seconds = zip(*points)
+    return float(np.polyfit(np.log(sizes), np.log(seconds), 1)[0])
+
+def default_sizes(max_size: int) -> List[int]:
+    sizes = []
+    n = 10
+    while n <= max_size:
+        sizes.append(n)
+        n *= 10
+    return sizes
+
+def run_suite(names: List[str], scales: List[str], sizes: List[int], repeat: int = 1, budget: float = 60.0,
+              memory: bool = True) -> Dict[str, Dict]:
+    """
+    results keyed by "scheduler/scale", each with the per size measurements and the fitted exponent.
+    a scheduler stops growing once a run takes longer than budget seconds.
+    """
+    results = {}
+    for scale in scales:
+        workloads = {}
+        for name in names:
+            points = []
+            rows = []
+            for n in sizes:
+                if n not in workloads:
+                    workloads[n] = generate_workload(n, scale)
+                seconds = min(time_run(name, workloads[n]) for _ in range(repeat))
+                row = {"n": n, "seconds": seconds, "us_per_job": 1e6 * seconds / n}
+                if memory:
+                    row["peak_bytes"] = peak_memory(name, workloads[n])
+                rows.append(row)
+                points.append((n, seconds))
+                if seconds > budget:
+                    break
+            results[f"{name}/{scale}"] = {"sizes": rows, "exponent": fit_exponent(points)}
+    return results
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float) -> List[str]:
+    # runs slower than tolerance times their baseline, runs under 50 ms are too noisy to judge
+    regressions = []
+    for key, result in results.items():
+        reference = {row["n"]: row["seconds"] for row in baseline.get(key, {}).get("sizes", [])}
+        for row in result["sizes"]:
+            before = reference.get(row["n"])
+            if before is None or max(before, row["seconds"]) < 0.05:
+                continue
+            if row["seconds"] > before * tolerance:
+                regressions.append(f"{key} n={row['n']}: {row['seconds']:.3f}s vs {before:.3f}s baseline "
+                                   f"({row['seconds'] / before:.2f}x)")
+    return regressions
+
+def print_results(results: Dict[str, Dict], baseline: Optional[Dict[str, Dict]] = None):
+    for key, result in results.items():
+        reference = {row["n"]: row["seconds"] for row in (baseline or {}).get(key, {}).get("sizes", [])}
+        print(f"\n=== {key}  (exponent {result['exponent']:.2f}) ===")
+        print(f"{'jobs':<12}{'seconds':<12}{'us/job':<12}{'peak MiB':<12}{'vs baseline':<12}")
+        for row in result["sizes"]:
+            peak = f"{row['peak_bytes'] / 2**20:.1f}" if "peak_bytes" in row else "-"
+            before = reference.get(row["n"])
+            ratio = f"{row['seconds'] / before:.2f}x" if before else "-"
+            print(f"{row['n']:<12}{row['seconds']:<12.4f}{row['us_per_job']:<12.2f}{peak:<12}{ratio:<12}")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="scheduler scaling benchmark suite")
+    parser.add_argument("--schedulers", nargs="+", choices=list(SCHEDULERS), default=list(SCHEDULERS))
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=list(SCALES))
+    parser.add_argument("--max-size", type=int, default=10**6)
+    parser.add_argument("--repeat", type=int, default=1, help="best of this many runs per size")
+    parser.add_argument("--budget", type=float, default=60.0, help="stop growing a scheduler after a run this slow (s)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=1.25, help="allowed slowdown against the baseline")
+    parser.add_argument("--save-baseline", help="write the results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.schedulers, args.scales, default_sizes(args.max_size), repeat=args.repeat,
+                        budget=args.budget, memory=not args.no_memory)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=1)
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\nregressions:")
+            for line in regressions:
+                print("  " + line)
+            return 1
+        print("\nno regressions")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+import argparse
+import os
+import sys
+from typing import List, Optional
+
+# Single command line entry point:
+#   python -m cli run    [--trace jobs.csv] [--scheduler CFS latency_buffer=-1] [--results DIR] [--no-cache]
+#   python -m cli sweep  --grid CFS target_latency=10,20 --test-cases ...    (see sweep.py)
+#   python -m cli bench  --max-size 10000 ...                               (see benchmarks/suite.py)
+#   python -m cli plot   [results directory]
+#   python -m cli table  [results directory] [--print]
+#   python -m cli serve  [--port 8765 | --unix PATH] [--workers N]            (see service.py)
+# Only argparse is imported up front. Every subcommand imports what it needs when it runs, so
+# headless runs never load matplotlib or pandas, and --help answers without loading NumPy.
+
+COMMANDS = ("run", "sweep", "bench", "plot", "table", "serve")
+
+def run(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog="cli run", description="simulate schedulers over workloads and print the metrics")
+    parser.add_argument("--trace", action="append", default=[],
+                        help="job trace file (.csv / .jsonl), streamed; the built-in test cases when none is given")
+    parser.add_argument("--scheduler", nargs="+", action="append", metavar="ARG",
+                        help="scheduler followed by name=value parameters (a,b runs one per value), repeatable; "
+                             "the default set when none is given")
+    parser.add_argument("--results", help="save the per-process results of the test cases to this directory")
+    parser.add_argument("--no-cache", action="store_true", help="always simulate, skip the result cache")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, default one per CPU")
+    args = parser.parse_args(argv)
+
+    import simulation
+    from sweep import config_label, configs, make_scheduler, parse_grid
+
+    try:
+        if args.scheduler:
+            schedulers = []
+            for kind, params in configs([parse_grid(spec) for spec in args.scheduler]):
+                scheduler = make_scheduler(kind, params)
+                if params and "name" not in params:
+                    # label the rows with the parameters, several configs of one scheduler may run
+                    scheduler.name = config_label(kind, params)
+                schedulers.append(scheduler)
+        else:
+            schedulers = simulation.default_schedulers()
+
+        if args.trace:
+            for path in args.trace:
+                simulation.run_trace(path, schedulers)
+            return 0
+
+        cache = None
+        if not args.no_cache:
+            from result_cache import ResultCache
+            cache = ResultCache()
+        simulation.run_test_cases(simulation.default_test_cases(), schedulers, max_workers=args.workers,
+                                  results_path=args.results, cache=cache)
+    except (ValueError, TypeError, OSError) as e:
+        print(f"run: {e}", file=sys.stderr)
+        return 2
+    if args.results:
+        print(f"\nResults saved to {args.results}/")
+    return 0
+
+def sweep(argv: List[str]) -> int:
+    import sweep
+    return sweep.main(argv)
+
+def bench(argv: List[str]) -> int:
+    # the benchmarks directory is a folder of scripts, not a package
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks"))
+    import suite
+    return suite.main(argv)
+
+def plot(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog="cli plot", description="plot a results directory, or simulate and plot")
+    parser.add_argument("results", nargs="?", help="results directory written by run --results")
+    args = parser.parse_args(argv)
+
+    import plot
+    if args.results:
+        plot.plot_saved_results(args.results)
+    else:
+        plot.main()
+    return 0
+
+def table(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog="cli table", description="metrics tables of a results directory")
+    parser.add_argument("results", nargs="?", help="results directory, default scheduler_results")
+    parser.add_argument("--print", action="store_true", help="print the tables instead of drawing them")
+    args = parser.parse_args(argv)
+
+    import table
+    from simulation import RESULTS_PATH
+    path = args.results or RESULTS_PATH
+    if not args.print:
+        table.draw_tables(path)
+        return 0
+    try:
+        frame = table.results_frame(path)
+    except FileNotFoundError:
+        print(f"no results in {path}/, run with --results first", file=sys.stderr)
+        return 2
+    for name, rows in frame.groupby("Test Case", sort=False):
+        print(f"\n=== {name} ===")
+        print(rows.drop(columns=["Test Case"]).to_string(index=False))
+    return 0
+
+def serve(argv: List[str]) -> int:
+    import service
+    return service.main(argv)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="cli", description="scheduler simulator")
+    parser.add_argument("command", choices=COMMANDS)
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="arguments of the command, see <command> --help")
+    args = parser.parse_args(argv)
+    return globals()[args.command](args.args)
+
+if __name__ == "__main__":
+    sys.exit(main())
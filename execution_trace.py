@@ -0,0 +1,98 @@
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from process_table import ProcessTable
+
+class ExecutionTrace:
+    """
+    run-length encoded timeline of a run: parallel int arrays of pid (row of the ProcessTable),
+    start time, length and cpu, one entry per stretch of time a process held a CPU.
+    a slice that continues the previous one of the same process on the same CPU is merged into it,
+    so a CFS tick run or an RR process alone on the CPU takes one segment instead of one per slice.
+    segments are in time order per CPU.
+    pass a trace to Scheduler.schedule to fill it, schedulers skip all of this when there is none.
+    """
+
+    def __init__(self):
+        self.pid = array('q')
+        self.start = array('q')
+        self.length = array('q')
+        self.cpu = array('q')
+        # per cpu, index of its last segment
+        self._last = []
+
+    def __len__(self):
+        return len(self.pid)
+
+    def __repr__(self):
+        return f"ExecutionTrace({len(self)} segments)"
+
+    def record(self, pid: int, start: int, length: int, cpu: int = 0):
+        if length <= 0:
+            return
+        if cpu >= len(self._last):
+            self._last.extend([-1] * (cpu + 1 - len(self._last)))
+        last = self._last[cpu]
+        if last >= 0 and self.pid[last] == pid and self.start[last] + self.length[last] == start:
+            self.length[last] += length
+            return
+        self._last[cpu] = len(self.pid)
+        self.pid.append(pid)
+        self.start.append(start)
+        self.length.append(length)
+        self.cpu.append(cpu)
+
+    def extend(self, pid, start, length):
+        # bulk append from NumPy arrays of CPU 0 segments in time order (vectorized FCFS), merged
+        # like record: a segment that continues the previous one of the same process extends it
+        import numpy as np
+        keep = length > 0
+        pid = pid[keep].astype(np.int64)
+        start = start[keep].astype(np.int64)
+        end = start + length[keep].astype(np.int64)
+        if not len(pid):
+            return
+        first = np.ones(len(pid), dtype=bool)
+        first[1:] = (pid[1:] != pid[:-1]) | (start[1:] != end[:-1])
+        runs = np.flatnonzero(first)
+        last = np.append(runs[1:] - 1, len(pid) - 1)
+        pid, start, length = pid[runs], start[runs], end[last] - start[runs]
+
+        if not self._last:
+            self._last.append(-1)
+        previous = self._last[0]
+        if previous >= 0 and self.pid[previous] == pid[0] and self.start[previous] + self.length[previous] == start[0]:
+            self.length[previous] += int(length[0])
+            pid, start, length = pid[1:], start[1:], length[1:]
+        if not len(pid):
+            return
+        self.pid.frombytes(pid.tobytes())
+        self.start.frombytes(start.tobytes())
+        self.length.frombytes(length.tobytes())
+        self.cpu.extend([0] * (len(self.pid) - len(self.cpu)))
+        self._last[0] = len(self.pid) - 1
+
+    def segments(self) -> Iterator[Tuple[int, int, int]]:
+        return zip(self.pid, self.start, self.length)
+
+    def numpy(self):
+        # zero-copy (pid, start, length) views
+        import numpy as np
+        return (np.frombuffer(self.pid, dtype=np.int64), np.frombuffer(self.start, dtype=np.int64),
+                np.frombuffer(self.length, dtype=np.int64))
+
+    def context_switches(self) -> int:
+        # changes of the running process between consecutive segments of a CPU, idle gaps do not count
+        last = {}
+        switches = 0
+        for pid, cpu in zip(self.pid, self.cpu):
+            if cpu in last and last[cpu] != pid:
+                switches += 1
+            last[cpu] = pid
+        return switches
+
+    def as_dicts(self, table: Optional[ProcessTable] = None) -> List[Dict]:
+        # the {'process', 'start_time', 'duration'} rows FCFS / SJF / Priority used to return
+        name = table.pid_name if table is not None else str
+        return [{'process': name(pid), 'start_time': start, 'duration': length}
+                for pid, start, length in self.segments()]
@@ -0,0 +1,86 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple, Union
+
+from execution_trace import ExecutionTrace
+from metrics import compute_metrics
+from process import Process
+from process_table import ProcessTable
+from scheduler_stats import SchedulerStats
+from scheduler.scheduler_base import Scheduler
+from workload import Workload
+
+if TYPE_CHECKING:
+    from result_cache import ResultCache
+
+# Experiment executor: simulates every (workload, scheduler config) pair exactly once,
+# fanned out over a process pool, and returns the results in a deterministic order
+# (workload by workload, schedulers in the order given) whatever finishes first.
+
+def scheduler_label(scheduler: Scheduler) -> str:
+    return scheduler.name if hasattr(scheduler, "name") else scheduler.__class__.__name__
+
+class ExperimentResult:
+    def __init__(self, workload: str, scheduler: str, table: ProcessTable, metrics: Dict,
+                 stats: Optional[SchedulerStats] = None, trace: Optional[ExecutionTrace] = None):
+        # table holds the per-process results, metrics is metrics.compute_metrics(table),
+        # stats the dispatch counters when they were collected, trace the CPU timeline when the
+        # run went through a result cache
+        self.workload = workload
+        self.scheduler = scheduler
+        self.table = table
+        self.metrics = metrics
+        self.stats = stats
+        self.trace = trace
+
+    def __repr__(self):
+        return f"ExperimentResult(workload={self.workload!r}, scheduler={self.scheduler!r}, n={len(self.table)})"
+
+def run_pair(name: str, workload: Workload, scheduler: Scheduler, collect_stats: bool = False,
+             cache: Optional["ResultCache"] = None) -> ExperimentResult:
+    if cache is not None:
+        cached = cache.get(workload, scheduler, stats=collect_stats)
+        if cached is not None:
+            return ExperimentResult(name, scheduler_label(scheduler), cached.table, cached.metrics,
+                                    cached.stats if collect_stats else None, cached.trace)
+
+    table = workload.new_table()
+    stats = SchedulerStats() if collect_stats else None
+    trace = ExecutionTrace() if cache is not None else None
+    scheduler.schedule(table, trace=trace, stats=stats)
+    result = ExperimentResult(name, scheduler_label(scheduler), table, compute_metrics(table), stats, trace)
+    if cache is not None:
+        cache.put(workload, scheduler, result)
+    return result
+
+def _run_pair(args) -> ExperimentResult:
+    return run_pair(*args)
+
+def run_experiments(workloads: Sequence[Tuple[str, Union[List[Process], Workload]]], schedulers: Sequence[Scheduler],
+                    max_workers: Optional[int] = None, collect_stats: bool = False,
+                    cache: Optional["ResultCache"] = None) -> List[ExperimentResult]:
+    """
+    run every scheduler on every (name, processes or compiled Workload) workload.
+    process lists are compiled once, every run starts from fresh state, the inputs are never modified.
+    max_workers defaults to the number of CPUs, 1 runs everything in this process.
+    collect_stats fills ExperimentResult.stats with the scheduler counters (see scheduler_stats).
+    with a cache (see result_cache) pairs already simulated are loaded instead of run again, and
+    ExperimentResult.trace holds the execution trace.
+    """
+    compiled = [(name, workload if isinstance(workload, Workload) else Workload.from_processes(workload, name=name))
+                for name, workload in workloads]
+    pairs = [(name, workload, scheduler, collect_stats, cache) for name, workload in compiled for scheduler in schedulers]
+
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1 or len(pairs) < 2:
+        return [run_pair(*pair) for pair in pairs]
+
+    chunksize = max(1, len(pairs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_run_pair, pairs, chunksize=chunksize))
+
+def group_by_workload(results: List[ExperimentResult]) -> Dict[str, List[ExperimentResult]]:
+    grouped = {}
+    for result in results:
+        grouped.setdefault(result.workload, []).append(result)
+    return grouped
@@ -0,0 +1,86 @@
+from typing import Dict, List, Union
+import numpy as np
+
+from process import Process
+from process_table import ProcessTable
+
+# Scheduling metrics shared by simulation.py and plot.py.
+# All statistics come from one vectorized pass over the per-process columns, so they stay
+# cheap for 10^6+ processes.
+
+TIME_METRICS = ("turnaround", "response", "waiting")
+PERCENTILES = (50, 95, 99)
+
+def _columns(processes: Union[List[Process], ProcessTable]):
+    if isinstance(processes, ProcessTable):
+        return (processes.numpy_column("arrival_time"),
+                processes.numpy_column("completion_time"),
+                processes.numpy_column("weight"),
+                np.stack([processes.numpy_column("turnaround_time"),
+                          processes.numpy_column("response_time"),
+                          processes.numpy_column("waiting_time")]))
+
+    n = len(processes)
+    arrival = np.fromiter((p.arrival_time for p in processes), dtype=np.int64, count=n)
+    completion = np.fromiter((p.completion_time for p in processes), dtype=np.int64, count=n)
+    weight = np.fromiter((p.weight for p in processes), dtype=np.float64, count=n)
+    times = np.array([[p.turnaround_time for p in processes],
+                      [p.response_time for p in processes],
+                      [p.waiting_time for p in processes]], dtype=np.int64).reshape(3, n)
+    return arrival, completion, weight, times
+
+def compute_metrics(processes: Union[List[Process], ProcessTable]) -> Dict:
+    """
+    Summary of a finished run: count, makespan (ms from first arrival to last completion),
+    throughput (jobs per second) and, for turnaround, response and waiting time,
+    mean / p50 / p95 / p99 / max plus two fairness numbers:
+      jain         Jain's index (sum x)^2 / (n * sum x^2), 1.0 when every process sees the same time
+      share_error  total variation distance between each process' share of the total time and
+                   its weighted entitlement (1/weight normalized), 0.0 is perfectly weighted fair
+    """
+    arrival, completion, weight, times = _columns(processes)
+    n = len(arrival)
+    if n == 0:
+        empty = {"mean": 0.0, "max": 0, "jain": 1.0, "share_error": 0.0}
+        empty.update({f"p{q}": 0.0 for q in PERCENTILES})
+        result = {"count": 0, "makespan": 0, "throughput": 0.0}
+        result.update({name: dict(empty) for name in TIME_METRICS})
+        return result
+
+    makespan = int(completion.max() - arrival.min())
+    # 1000 since time in milliseconds
+    throughput = 1000 * n / makespan if makespan > 0 else 0.0
+
+    values = times.astype(np.float64)
+    totals = values.sum(axis=1)
+    squares = np.einsum("ij,ij->i", values, values)
+    percentiles = np.percentile(values, PERCENTILES, axis=1)
+    maxima = times.max(axis=1)
+
+    entitlement = 1.0 / weight
+    entitlement /= entitlement.sum()
+
+    result = {"count": n, "makespan": makespan, "throughput": throughput}
+    for row, name in enumerate(TIME_METRICS):
+        total = totals[row]
+        if total > 0:
+            jain = total * total / (n * squares[row])
+            share_error = 0.5 * np.abs(values[row] / total - entitlement).sum()
+        else:
+            jain = 1.0
+            share_error = 0.0
+        summary = {"mean": float(total / n), "max": int(maxima[row]), "jain": float(jain), "share_error": float(share_error)}
+        for i, q in enumerate(PERCENTILES):
+            summary[f"p{q}"] = float(percentiles[i, row])
+        result[name] = summary
+    return result
+
+def flatten(metrics: Dict) -> Dict[str, float]:
+    """
+    one level dict with avg_turnaround, p95_turnaround, jain_waiting, ... keys
+    """
+    flat = {"count": metrics["count"], "makespan": metrics["makespan"], "throughput": metrics["throughput"]}
+    for name in TIME_METRICS:
+        for key, value in metrics[name].items():
+            flat[f"{'avg' if key == 'mean' else key}_{name}"] = value
+    return flat
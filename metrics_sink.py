@@ -0,0 +1,212 @@
+import math
+from typing import Dict
+
+import numpy as np
+
+from metrics import PERCENTILES, TIME_METRICS
+from process_table import ProcessTable
+
+# Online metrics: a sink receives completions while a scheduler runs and keeps only
+# mergeable aggregates, so memory does not grow with the number of jobs.
+# Sinks from separate runs (e.g. shards of a trace on a process pool) combine with merge().
+
+class RunningStats:
+    """
+    count / mean / variance / min / max with Welford updates and Chan's parallel merge
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x: float):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+
+    def add_many(self, values: np.ndarray):
+        if len(values) == 0:
+            return
+        batch = RunningStats()
+        batch.count = len(values)
+        batch.mean = float(values.mean())
+        batch.m2 = float(((values - batch.mean) ** 2).sum())
+        batch.min = float(values.min())
+        batch.max = float(values.max())
+        self.merge(batch)
+
+    def merge(self, other: "RunningStats"):
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2, self.min, self.max = other.count, other.mean, other.m2, other.min, other.max
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / self.count if self.count else 0.0
+
+    @property
+    def sum_of_squares(self) -> float:
+        return self.m2 + self.count * self.mean * self.mean
+
+class QuantileSketch:
+    """
+    mergeable quantile sketch with relative error (DDSketch style log buckets).
+    every quantile is within relative_accuracy of a value that was actually recorded at that rank,
+    memory is one counter per bucket, ~1000 buckets for values up to 10^9 at 1% accuracy.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.positive = {}
+        self.negative = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def _index(self, magnitude: float) -> int:
+        return math.ceil(math.log(magnitude) / self.log_gamma)
+
+    def _value(self, index: int) -> float:
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def add(self, x: float):
+        self.count += 1
+        if x > 0:
+            index = self._index(x)
+            self.positive[index] = self.positive.get(index, 0) + 1
+        elif x < 0:
+            index = self._index(-x)
+            self.negative[index] = self.negative.get(index, 0) + 1
+        else:
+            self.zero_count += 1
+
+    def add_many(self, values: np.ndarray):
+        self.count += len(values)
+        self.zero_count += int(np.count_nonzero(values == 0))
+        for store, magnitudes in ((self.positive, values[values > 0]), (self.negative, -values[values < 0])):
+            if len(magnitudes):
+                indexes, counts = np.unique(np.ceil(np.log(magnitudes) / self.log_gamma).astype(np.int64),
+                                            return_counts=True)
+                for index, count in zip(indexes.tolist(), counts.tolist()):
+                    store[index] = store.get(index, 0) + count
+
+    def merge(self, other: "QuantileSketch"):
+        if other.gamma != self.gamma:
+            raise ValueError("cannot merge sketches with different relative accuracy")
+        for store, other_store in ((self.positive, other.positive), (self.negative, other.negative)):
+            for index, count in other_store.items():
+                store[index] = store.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self.negative, reverse=True):
+            seen += self.negative[index]
+            if seen > rank:
+                return -self._value(index)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for index in sorted(self.positive):
+            seen += self.positive[index]
+            if seen > rank:
+                return self._value(index)
+        return self._value(max(self.positive))
+
+class MetricsSink:
+    """
+    streaming counterpart of metrics.compute_metrics.
+    pass it to Scheduler.schedule / schedule_stream and read summary() at the end: count, makespan,
+    throughput and, for turnaround / response / waiting time, mean, std, variance, min, max,
+    p50 / p95 / p99 (from the sketch) and Jain's index. The weighted share error needs every
+    value and is only available from compute_metrics.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.stats = {name: RunningStats() for name in TIME_METRICS}
+        self.sketches = {name: QuantileSketch(relative_accuracy) for name in TIME_METRICS}
+        self.first_arrival = math.inf
+        self.last_completion = -math.inf
+
+    @property
+    def count(self) -> int:
+        return self.stats["turnaround"].count
+
+    def record(self, arrival_time: int, completion_time: int, turnaround_time: int, response_time: int,
+               waiting_time: int):
+        if arrival_time < self.first_arrival:
+            self.first_arrival = arrival_time
+        if completion_time > self.last_completion:
+            self.last_completion = completion_time
+        for name, value in (("turnaround", turnaround_time), ("response", response_time), ("waiting", waiting_time)):
+            self.stats[name].add(value)
+            self.sketches[name].add(value)
+
+    # one finished row of a (streamed) table
+    def record_row(self, table: ProcessTable, pid: int):
+        self.record(table.arrival_time[pid], table.completion_time[pid], table.turnaround_time[pid],
+                    table.response_time[pid], table.waiting_time[pid])
+
+    # every row of a finished table in one vectorized update
+    def record_table(self, table: ProcessTable):
+        if len(table) == 0:
+            return
+        self.first_arrival = min(self.first_arrival, int(table.numpy_column("arrival_time").min()))
+        self.last_completion = max(self.last_completion, int(table.numpy_column("completion_time").max()))
+        for name in TIME_METRICS:
+            values = table.numpy_column(f"{name}_time").astype(np.float64)
+            self.stats[name].add_many(values)
+            self.sketches[name].add_many(values)
+
+    def merge(self, other: "MetricsSink"):
+        for name in TIME_METRICS:
+            self.stats[name].merge(other.stats[name])
+            self.sketches[name].merge(other.sketches[name])
+        self.first_arrival = min(self.first_arrival, other.first_arrival)
+        self.last_completion = max(self.last_completion, other.last_completion)
+
+    def summary(self) -> Dict:
+        n = self.count
+        makespan = int(self.last_completion - self.first_arrival) if n else 0
+        # 1000 since time in milliseconds
+        result = {"count": n, "makespan": makespan, "throughput": 1000 * n / makespan if makespan > 0 else 0.0}
+        for name in TIME_METRICS:
+            stats = self.stats[name]
+            squares = stats.sum_of_squares
+            total = stats.mean * n
+            summary = {
+                "mean": stats.mean,
+                "std": math.sqrt(stats.variance),
+                "variance": stats.variance,
+                "min": stats.min if n else 0,
+                "max": stats.max if n else 0,
+                "jain": total * total / (n * squares) if n and squares > 0 else 1.0,
+            }
+            for q in PERCENTILES:
+                summary[f"p{q}"] = self.sketches[name].quantile(q / 100)
+            result[name] = summary
+        return result
@@ -1,106 +1,102 @@
-import random
-import copy
-import math
-from typing import List, Dict
+import sys
+from typing import Any, List, Dict
+import numpy as np
+import matplotlib
 import matplotlib.pyplot as plt
 
 from process import Process
+from experiment import ExperimentResult, run_experiments, group_by_workload, scheduler_label
+from results_store import load_results
+from result_cache import ResultCache
+from workload_generator import WorkloadGenerator
 from scheduler.fcfs import FCFS
 from scheduler.sjf import SJF
 from scheduler.priority_scheduler import PriorityScheduler
 from scheduler.round_robin import RoundRobin
 from scheduler.cfs import CFS
+from scheduler.o1 import O1Scheduler
+
+COLORS = [
+    "#1f77b4",
+    "#ff7f0e",
+    "#2ca02c",
+    "#d62728",
+    "#9467bd",
+    "#8c564b",
+    "#e377c2",
+]
+
+def scheduler_colors(count: int) -> List[str]:
+    # COLORS while they last, then evenly spaced colormap colors so no two schedulers share one
+    if count <= len(COLORS):
+        return COLORS[:count]
+    cmap = plt.get_cmap("tab20" if count <= 20 else "turbo", count)
+    return [matplotlib.colors.to_hex(cmap(i)) for i in range(count)]
 
 def generate_random_processes(n: int, seed: int = 42) -> List[Process]:
-    random.seed(seed)
-    processes = []
-    for i in range(n):
-        pid = f"P{i+1}"
-        arrival = random.randint(0, 5000)
-        duration = random.randint(10, 2000)
-        weight = random.randint(1, 3)
-        processes.append(Process(pid, arrival, duration, weight))
-    return processes
-
-def cumulative_completion_over_time(processes: List[Process], scheduler) -> Dict[str, List[int]]:
-    test_processes = [copy.deepcopy(p) for p in processes]
-    scheduler.schedule(test_processes)
-
-    completion_times = sorted([p.completion_time for p in test_processes])
-    if not completion_times:
-        return {"times": [], "counts": [], "max_time": 0}
-
-    max_time = completion_times[-1]
-    times = list(range(0, max_time + 1))
-    counts = []
-    idx = 0
-    completed = 0
-    for t in times:
-        while idx < len(completion_times) and completion_times[idx] <= t:
-            completed += 1
-            idx += 1
-        counts.append(completed)
+    # uniform arrivals over 5 s, durations of 10-2000 ms and weights 1-3, drawn from the seed's own
+    # streams (see workload_generator), the global random state is left alone
+    generator = WorkloadGenerator(arrivals="uniform", span=5000, durations="uniform", min_duration=10,
+                                  max_duration=2000, weights=(1, 2, 3), seed=seed)
+    return generator.processes(n)
+
+def cumulative_completion_over_time(result: ExperimentResult) -> Dict[str, Any]:
+    # step points only where the count changes: times[i] is a completion time (or 0) and counts[i]
+    # the number of tasks completed by then, so the size follows the job count, not the simulated time
+    completion_times = np.sort(result.table.numpy_column("completion_time"))
+    times = np.unique(np.concatenate(([0], completion_times)))
+    counts = np.searchsorted(completion_times, times, side="right")
+    max_time = int(completion_times[-1]) if len(completion_times) else 0
     return {"times": times, "counts": counts, "max_time": max_time}
 
-def pad_to_global_max(series_times, series_counts, global_max):
-    if not series_times:
-        return list(range(0, global_max + 1)), [0] * (global_max + 1)
-    last_count = series_counts[-1] if series_counts else 0
-    if series_times[-1] < global_max:
-        # Extend to global max, holding the last count constant
-        extra_times = list(range(series_times[-1] + 1, global_max + 1))
-        series_times = series_times + extra_times
-        series_counts = series_counts + [last_count] * len(extra_times)
-    return series_times, series_counts
-
-def collect_metrics(processes: List[Process], scheduler):
-    test_processes = [copy.deepcopy(p) for p in processes]
-    scheduler.schedule(test_processes)
-    waiting = [p.waiting_time for p in test_processes]
-    response = [p.response_time for p in test_processes]
-
-    runs = []
-    if isinstance(scheduler, RoundRobin):
-        ts = getattr(scheduler, "time_slice", 1)
-        runs = [math.ceil(max(0, p.duration) / max(1, ts)) for p in test_processes]
-    elif isinstance(scheduler, (FCFS, SJF, PriorityScheduler)):
-        runs = [1 for _ in test_processes]
-    elif isinstance(scheduler, CFS):
-        lb = getattr(scheduler, "latency_buffer", 1)
-        runs = [max(1, math.ceil(max(0, p.duration) / max(1, lb))) for p in test_processes]
-    else:
-        runs = [1 for _ in test_processes]
-
+def align_completion_curves(curves: List[Dict[str, Any]]):
+    # put every curve on the merged event times of all of them (plus the global max),
+    # holding each count constant between its own events
+    global_max = max((curve["max_time"] for curve in curves), default=0)
+    times = np.union1d(np.concatenate([curve["times"] for curve in curves] + [np.zeros(1, dtype=np.int64)]),
+                       [global_max])
+    aligned = []
+    for curve in curves:
+        index = np.searchsorted(curve["times"], times, side="right") - 1
+        aligned.append(np.asarray(curve["counts"])[index])
+    return times, aligned, global_max
+
+def collect_metrics(result: ExperimentResult):
+    # run counts are measured, the result must come from run_experiments(..., collect_stats=True)
+    table = result.table
+    waiting = list(table.waiting_time)
+    response = list(table.response_time)
+    runs = result.stats.runs_per_process(len(table))
     return waiting, response, runs
 
-def average_metrics_over_sizes(sizes: List[int], schedulers):
+def size_workload_name(size: int) -> str:
+    return f"random-{size}"
+
+def size_workloads(sizes: List[int]):
+    # vary seed by size
+    return [(size_workload_name(sz), generate_random_processes(sz, seed=123 + sz)) for sz in sizes]
+
+def average_metrics_over_sizes(sizes: List[int], schedulers, experiments: Dict[str, List[ExperimentResult]]):
     results = {
-        "labels": [sched.name if hasattr(sched, "name") else sched.__class__.__name__ for sched in schedulers],
+        "labels": [scheduler_label(sched) for sched in schedulers],
         "sizes": sizes,
         "avg_response": { },
         "avg_waiting": { },
         "avg_throughput": { },
     }
 
-    for sched in schedulers:
-        label = sched.name if hasattr(sched, "name") else sched.__class__.__name__
+    for i, sched in enumerate(schedulers):
+        label = scheduler_label(sched)
         results["avg_response"][label] = []
         results["avg_waiting"][label] = []
         results["avg_throughput"][label] = []
 
         for sz in sizes:
-            procs = generate_random_processes(sz, seed=123 + sz)  # vary seed by size
-            test_procs = [copy.deepcopy(p) for p in procs]
-            sched_inst = sched  # reuse is fine if schedulers hold no state across runs
-            sched_inst.schedule(test_procs)
-
-            # averages
-            avg_resp = sum(p.response_time for p in test_procs) / max(1, len(test_procs))
-            avg_wait = sum(p.waiting_time for p in test_procs) / max(1, len(test_procs))
-
-            # throughput: completed tasks per unit time (makespan)
-            makespan = max((p.completion_time for p in test_procs), default=0)
-            throughput = (len(test_procs) / makespan) if makespan > 0 else 0.0
+            # same numbers as simulation.py, throughput in tasks per second
+            metrics = experiments[size_workload_name(sz)][i].metrics
+            avg_resp = metrics["response"]["mean"]
+            avg_wait = metrics["waiting"]["mean"]
+            throughput = metrics["throughput"]
 
             results["avg_response"][label].append(avg_resp)
             results["avg_waiting"][label].append(avg_wait)
@@ -121,108 +117,125 @@ def plot_metric_lines(results, metric_key, title, ylabel, colors):
     plt.legend()
     plt.tight_layout()
 
-def main():
-    n = 100
-    processes = generate_random_processes(n, seed=123)
-
-    schedulers = [
-        FCFS(),
-        SJF(),
-        PriorityScheduler(),
-        RoundRobin(time_slice=10),
-        CFS("CFS", latency_buffer=10),
-        CFS("CFS_NoBuffer", latency_buffer=-1)
-    ]
-
-    colors = [
-        "#1f77b4",
-        "#ff7f0e",
-        "#2ca02c",
-        "#d62728",
-        "#9467bd",
-        "#8c564b",
-    ]
-
-    series = []
-    global_max = 0
-    for sched in schedulers:
-        data = cumulative_completion_over_time(processes, sched)
-        series.append((sched, data["times"], data["counts"]))
-        global_max = max(global_max, data["max_time"])
+def plot_cumulative_completion(results: List[ExperimentResult], colors,
+                               title: str = "Cumulative Tasks Completed Over Time (shared time scale)"):
+    times, aligned, global_max = align_completion_curves([cumulative_completion_over_time(result) for result in results])
 
     plt.figure(figsize=(12, 7))
-    for i, (sched, times, counts) in enumerate(series):
-        times, counts = pad_to_global_max(times, counts, global_max)
-        label = sched.name if hasattr(sched, "name") else sched.__class__.__name__
+    for i, (result, counts) in enumerate(zip(results, aligned)):
         plt.step(
             times,
             counts,
             where="post",
-            label=label,
+            label=result.scheduler,
             color=colors[i % len(colors)],
             linewidth=2,
         )
-    plt.title("Cumulative Tasks Completed Over Time (shared time scale)")
+    plt.title(title)
     plt.xlabel("Time (ms)")
     plt.ylabel("Completed Tasks")
-    plt.ylim(0, n)
+    plt.ylim(0, max((len(result.table) for result in results), default=0))
     plt.xlim(0, global_max)
     plt.legend()
     plt.grid(True, which="both", linestyle="--", alpha=0.3)
     plt.tight_layout()
 
-    labels = [sched.name if hasattr(sched, "name") else sched.__class__.__name__ for sched in schedulers]
+def colorful_boxplot(ax, data, labels, colors, title, ylabel):
+    bp = ax.boxplot(
+        data,
+        labels=labels,
+        showfliers=False,
+        patch_artist=True,
+        medianprops=dict(color="#000000", linewidth=1.5),
+        whiskerprops=dict(color="#555555"),
+        capprops=dict(color="#555555"),
+    )
+
+    for i, box in enumerate(bp["boxes"]):
+        box.set(facecolor=colors[i % len(colors)], alpha=0.5, edgecolor=colors[i % len(colors)])
+
+    for i, whisk in enumerate(bp["whiskers"]):
+        whisk.set(color=colors[(i // 2) % len(colors)])
+    for i, cap in enumerate(bp["caps"]):
+        cap.set(color=colors[(i // 2) % len(colors)])
+
+    for med in bp["medians"]:
+        med.set(color="#222222")
+    ax.set_title(title)
+    ax.set_ylabel(ylabel)
+    ax.tick_params(axis='x', rotation=25)
+
+def main():
+    n = 100
+    processes = generate_random_processes(n, seed=123)
+
+    schedulers = [
+        FCFS(),
+        SJF(),
+        PriorityScheduler(),
+        RoundRobin(time_slice=10),
+        CFS("CFS", latency_buffer=10),
+        CFS("CFS_NoBuffer", latency_buffer=-1),
+        O1Scheduler()
+    ]
+
+    colors = scheduler_colors(len(schedulers))
+
+    sizes = [10, 50, 100, 500, 1000]
+
+    # every (workload, scheduler) pair is simulated once, in parallel, and shared by all plots below
+    # (cached on disk, see result_cache, so only the first run pays for the simulations)
+    experiments = group_by_workload(run_experiments([("main", processes)] + size_workloads(sizes), schedulers,
+                                                    collect_stats=True, cache=ResultCache()))
+
+    plot_cumulative_completion(experiments["main"], colors)
+
+    labels = [scheduler_label(sched) for sched in schedulers]
     waiting_data = []
     response_data = []
     runs_data = []
 
-    for sched in schedulers:
-        waiting, response, runs = collect_metrics(processes, sched)
+    for result in experiments["main"]:
+        waiting, response, runs = collect_metrics(result)
         waiting_data.append(waiting)
         response_data.append(response)
         runs_data.append(runs)
 
     fig, axes = plt.subplots(1, 3, figsize=(18, 6), sharex=False)
 
-    def colorful_boxplot(ax, data, title, ylabel):
-        bp = ax.boxplot(
-            data,
-            labels=labels,
-            showfliers=False,
-            patch_artist=True,
-            medianprops=dict(color="#000000", linewidth=1.5),
-            whiskerprops=dict(color="#555555"),
-            capprops=dict(color="#555555"),
-        )
-
-        for i, box in enumerate(bp["boxes"]):
-            box.set(facecolor=colors[i % len(colors)], alpha=0.5, edgecolor=colors[i % len(colors)])
-
-        for i, whisk in enumerate(bp["whiskers"]):
-            whisk.set(color=colors[(i // 2) % len(colors)])
-        for i, cap in enumerate(bp["caps"]):
-            cap.set(color=colors[(i // 2) % len(colors)])
-
-        for med in bp["medians"]:
-            med.set(color="#222222")
-        ax.set_title(title)
-        ax.set_ylabel(ylabel)
-        ax.tick_params(axis='x', rotation=25)
-
-    colorful_boxplot(axes[0], waiting_data, "Waiting Time per Scheduler", "Time (unit)")
-    colorful_boxplot(axes[1], response_data, "Response Time per Scheduler", "Time (unit)")
-    colorful_boxplot(axes[2], runs_data, "Times a Process Runs (approx.)", "Run count")
+    colorful_boxplot(axes[0], waiting_data, labels, colors, "Waiting Time per Scheduler", "Time (unit)")
+    colorful_boxplot(axes[1], response_data, labels, colors, "Response Time per Scheduler", "Time (unit)")
+    colorful_boxplot(axes[2], runs_data, labels, colors, "Times a Process Runs", "Run count")
 
     plt.tight_layout()
 
-    sizes = [10, 50, 100, 500, 1000]
-    results = average_metrics_over_sizes(sizes, schedulers)
+    results = average_metrics_over_sizes(sizes, schedulers, experiments)
 
     plot_metric_lines(results, "avg_response", "Average Response Time vs Task Count", "Response Time (unit)", colors)
     plot_metric_lines(results, "avg_waiting", "Average Waiting Time vs Task Count", "Waiting Time (unit)", colors)
-    plot_metric_lines(results, "avg_throughput", "Average Throughput vs Task Count", "Throughput (tasks/unit)", colors)
+    plot_metric_lines(results, "avg_throughput", "Average Throughput vs Task Count", "Throughput (tasks/s)", colors)
+
+    plt.show()
+
+def plot_saved_results(path: str):
+    # post-hoc plots of a results directory written by simulation.py, nothing is simulated again
+    for name, results in group_by_workload(load_results(path)).items():
+        colors = scheduler_colors(len(results))
+        plot_cumulative_completion(results, colors, title=name)
+
+        labels = [result.scheduler for result in results]
+        fig, axes = plt.subplots(1, 2, figsize=(14, 6))
+        colorful_boxplot(axes[0], [result.table.numpy_column("waiting_time") for result in results], labels, colors,
+                         f"Waiting Time per Scheduler: {name}", "Time (unit)")
+        colorful_boxplot(axes[1], [result.table.numpy_column("response_time") for result in results], labels, colors,
+                         f"Response Time per Scheduler: {name}", "Time (unit)")
+        plt.tight_layout()
 
     plt.show()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # python plot.py [results directory]
+    if len(sys.argv) > 1:
+        plot_saved_results(sys.argv[1])
+    else:
+        main()
\ No newline at end of file
@@ -1,4 +1,9 @@
 class Process:
+    # fixed attribute set, no per-instance __dict__. bulk workloads should use process_table.ProcessTable
+    __slots__ = ("pid", "arrival_time", "duration", "remaining_time", "weight",
+                 "start_time", "completion_time", "waiting_time", "turnaround_time", "response_time",
+                 "vruntime")
+
     def __init__(self, pid: str, arrival_time: int, duration: int, weight: int = 1):
         self.pid = pid
         self.arrival_time = arrival_time
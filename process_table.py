@@ -0,0 +1,229 @@
+from array import array
+from typing import Iterable, List, Optional
+from process import Process
+
+def _to_array(typecode: str, values) -> array:
+    # NumPy arrays are copied as raw bytes, iterating them element by element is ~10x slower
+    if hasattr(values, "tobytes") and hasattr(values, "astype"):
+        column = array(typecode)
+        column.frombytes(values.astype('f8' if typecode == 'd' else 'i8').tobytes())
+        return column
+    return array(typecode, values)
+
+# columns are arrays, or read-only memoryviews over arrays for tables of a compiled workload.Workload
+def _copy_column(column) -> array:
+    if isinstance(column, array):
+        return array(column.typecode, column)
+    copy = array(column.format)
+    copy.frombytes(column.cast('B'))
+    return copy
+
+class ProcessTable:
+    """
+    Struct-of-arrays process table.
+    Row i is the process with integer pid i. Every attribute of Process is a column
+    (array('q') for times, array('d') for weight and vruntime), and the string pids live
+    in the names side table.
+    """
+    INPUT_COLUMNS = ("arrival_time", "duration", "weight")
+    STATE_COLUMNS = ("remaining_time", "start_time", "completion_time", "waiting_time",
+                     "turnaround_time", "response_time", "vruntime")
+
+    def __init__(self, names: Optional[List[str]] = None):
+        # names is None for anonymous tables, pid_name then falls back to the integer pid
+        self.names = names
+        self.arrival_time = array('q')
+        self.duration = array('q')
+        self.weight = array('d')
+
+        self.remaining_time = array('q')
+        self.start_time = array('q')
+        self.completion_time = array('q')
+        self.waiting_time = array('q')
+        self.turnaround_time = array('q')
+        self.response_time = array('q')
+        self.vruntime = array('d')
+
+        # precomputed arrival orders shared with a compiled workload, None for plain tables
+        self.orders = None
+        # rows of finished processes that admit() may reuse when streaming
+        self.free_pids = []
+
+    def __len__(self) -> int:
+        return len(self.arrival_time)
+
+    def __repr__(self):
+        return f"ProcessTable(n={len(self)})"
+
+    def __getstate__(self):
+        # memoryviews cannot be pickled, send the shared read-only columns as plain arrays
+        state = dict(self.__dict__)
+        for name in self.INPUT_COLUMNS + self.STATE_COLUMNS:
+            if not isinstance(state[name], array):
+                state[name] = _copy_column(state[name])
+        return state
+
+    @classmethod
+    def from_processes(cls, processes: Iterable[Process]) -> "ProcessTable":
+        # copies the full state, so half-run or reused Process objects behave as before
+        table = cls(names=[])
+        for p in processes:
+            table.names.append(p.pid)
+            table.arrival_time.append(p.arrival_time)
+            table.duration.append(p.duration)
+            table.weight.append(p.weight)
+            table.remaining_time.append(p.remaining_time)
+            table.start_time.append(p.start_time)
+            table.completion_time.append(p.completion_time)
+            table.waiting_time.append(p.waiting_time)
+            table.turnaround_time.append(p.turnaround_time)
+            table.response_time.append(p.response_time)
+            table.vruntime.append(p.vruntime)
+        return table
+
+    @classmethod
+    def from_columns(cls, arrival_time: Iterable[int], duration: Iterable[int], weight: Iterable[float],
+                     names: Optional[List[str]] = None) -> "ProcessTable":
+        table = cls(names=names)
+        table.arrival_time = _to_array('q', arrival_time)
+        table.duration = _to_array('q', duration)
+        table.weight = _to_array('d', weight)
+        if len(table.duration) != len(table.arrival_time) or len(table.weight) != len(table.arrival_time):
+            raise ValueError("arrival_time, duration and weight must have the same length")
+        if names is not None and len(names) != len(table.arrival_time):
+            raise ValueError("names must have one entry per process")
+        table.reset()
+        return table
+
+    def copy(self) -> "ProcessTable":
+        table = ProcessTable(names=self.names)
+        for name in self.INPUT_COLUMNS + self.STATE_COLUMNS:
+            setattr(table, name, _copy_column(getattr(self, name)))
+        return table
+
+    # add one fresh process, return its pid
+    def append(self, name: Optional[str], arrival_time: int, duration: int, weight: float = 1) -> int:
+        pid = len(self.arrival_time)
+        if self.names is not None:
+            self.names.append(name)
+        self.arrival_time.append(arrival_time)
+        self.duration.append(duration)
+        self.weight.append(weight)
+        self.remaining_time.append(duration)
+        self.start_time.append(-1)
+        self.completion_time.append(0)
+        self.waiting_time.append(0)
+        self.turnaround_time.append(0)
+        self.response_time.append(-1)
+        self.vruntime.append(0.0)
+        return pid
+
+    # streaming: like append, but reuses the row of a released process, so the table
+    # only grows to the peak number of live processes
+    def admit(self, name: Optional[str], arrival_time: int, duration: int, weight: float = 1) -> int:
+        if not self.free_pids:
+            return self.append(name, arrival_time, duration, weight)
+        pid = self.free_pids.pop()
+        if self.names is not None:
+            self.names[pid] = name
+        self.arrival_time[pid] = arrival_time
+        self.duration[pid] = duration
+        self.weight[pid] = weight
+        self.remaining_time[pid] = duration
+        self.start_time[pid] = -1
+        self.completion_time[pid] = 0
+        self.waiting_time[pid] = 0
+        self.turnaround_time[pid] = 0
+        self.response_time[pid] = -1
+        self.vruntime[pid] = 0.0
+        return pid
+
+    # the process is finished and its row may be handed out again by admit()
+    def release(self, pid: int):
+        self.free_pids.append(pid)
+
+    # same as Process.reset for every row
+    def reset(self):
+        n = len(self.arrival_time)
+        self.remaining_time = _copy_column(self.duration)
+        self.start_time = array('q', [-1]) * n
+        self.completion_time = array('q', [0]) * n
+        self.waiting_time = array('q', [0]) * n
+        self.turnaround_time = array('q', [0]) * n
+        self.response_time = array('q', [-1]) * n
+        self.vruntime = array('d', [0.0]) * n
+
+    def pid_name(self, pid: int) -> str:
+        return self.names[pid] if self.names is not None else str(pid)
+
+    # pids sorted by arrival time, ties broken by the string pid when by_name is set
+    # and by table order otherwise (what a stable sort of the process list gives).
+    # tables of a compiled workload share one cache, so the sort happens once per workload
+    def arrival_order(self, by_name: bool = False) -> List[int]:
+        if self.orders is None:
+            return self._sort_arrivals(by_name)
+        if by_name not in self.orders:
+            self.orders[by_name] = self._sort_arrivals(by_name)
+        return self.orders[by_name]
+
+    def _sort_arrivals(self, by_name: bool) -> List[int]:
+        arrival = self.arrival_time
+        if by_name and self.names is not None:
+            names = self.names
+            return sorted(range(len(arrival)), key=lambda i: (arrival[i], names[i]))
+        if len(arrival) > 10000:
+            # same stable order, NumPy sorts large generated tables much faster
+            order = self._sort_arrivals_numpy(False)
+            return list(range(len(arrival))) if order is None else order.tolist()
+        return sorted(range(len(arrival)), key=arrival.__getitem__)
+
+    # same order as arrival_order as a NumPy index array, or None when the table is already in that order
+    def arrival_order_numpy(self, by_name: bool = False):
+        if self.orders is None:
+            return self._sort_arrivals_numpy(by_name)
+        key = ("numpy", by_name)
+        if key not in self.orders:
+            self.orders[key] = self._sort_arrivals_numpy(by_name)
+        return self.orders[key]
+
+    def _sort_arrivals_numpy(self, by_name: bool):
+        import numpy as np
+        arrival = self.numpy_column("arrival_time")
+        if len(arrival) < 2 or np.all(arrival[1:] > arrival[:-1]):
+            return None
+        if by_name and self.names is not None:
+            return np.lexsort((np.array(self.names), arrival))
+        if np.all(arrival[1:] >= arrival[:-1]):
+            return None
+        return np.argsort(arrival, kind="stable")
+
+    # zero-copy NumPy view of a column, writes go straight into the table
+    def numpy_column(self, name: str):
+        import numpy as np
+        column = getattr(self, name)
+        typecode = column.typecode if isinstance(column, array) else column.format
+        return np.frombuffer(column, dtype=np.float64 if typecode == 'd' else np.int64)
+
+    # Process view of a single row
+    def process(self, pid: int) -> Process:
+        p = Process(self.pid_name(pid), self.arrival_time[pid], self.duration[pid], self.weight[pid])
+        self.load(pid, p)
+        return p
+
+    def to_processes(self) -> List[Process]:
+        return [self.process(pid) for pid in range(len(self))]
+
+    # copy the state columns of a row onto a Process
+    def load(self, pid: int, process: Process):
+        process.remaining_time = self.remaining_time[pid]
+        process.start_time = self.start_time[pid]
+        process.completion_time = self.completion_time[pid]
+        process.waiting_time = self.waiting_time[pid]
+        process.turnaround_time = self.turnaround_time[pid]
+        process.response_time = self.response_time[pid]
+        process.vruntime = self.vruntime[pid]
+
+    # write the state columns back onto the processes the table was built from
+    def store(self, processes: List[Process]):
+        for pid, process in enumerate(processes):
+            self.load(pid, process)
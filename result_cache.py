@@ -0,0 +1,189 @@
+import hashlib
+import io
+import json
+import os
+import tempfile
+import time
+from array import array
+from typing import Dict, Optional
+
+import numpy as np
+
+from execution_trace import ExecutionTrace
+from process_table import ProcessTable
+from scheduler_stats import SchedulerStats
+from scheduler.scheduler_base import Scheduler
+from workload import Workload
+
+# Content-addressed disk cache of simulation results.
+# An entry is keyed by the sha256 of the workload inputs, the scheduler class and its parameters
+# and the source of the simulator code, so editing a scheduler invalidates its entries on its own.
+# Each entry is one .npz file holding the per-process state columns, the execution trace, the
+# metrics and the scheduler counters when they were collected. Hits refresh the file time, and
+# once the directory grows past max_bytes the least recently used entries are deleted.
+# Used through experiment.run_experiments(..., cache=ResultCache()).
+
+CACHE_PATH = ".scheduler_cache"
+
+# modules whose source decides the results, relative to the repository root
+CODE_FILES = ("process.py", "process_table.py", "workload.py", "RBTree.py", "execution_trace.py", "scheduler_stats.py",
+              "metrics.py")
+CODE_DIRS = ("scheduler",)
+# a temp file this old is left over from a writer that crashed between mkstemp and the rename
+STALE_TMP_SECONDS = 3600
+
+_code_version = None
+
+def code_version() -> str:
+    global _code_version
+    if _code_version is None:
+        root = os.path.dirname(os.path.abspath(__file__))
+        paths = [os.path.join(root, name) for name in CODE_FILES]
+        for directory in CODE_DIRS:
+            directory = os.path.join(root, directory)
+            paths += [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".py")]
+        h = hashlib.sha256()
+        for path in sorted(paths):
+            h.update(os.path.relpath(path, root).encode())
+            with open(path, "rb") as f:
+                h.update(f.read())
+        _code_version = h.hexdigest()
+    return _code_version
+
+def scheduler_key(scheduler: Scheduler) -> str:
+    # class plus every constructor parameter, the schedulers keep them all as attributes
+    params = {name: value for name, value in sorted(vars(scheduler).items()) if not name.startswith("_")}
+    return f"{type(scheduler).__module__}.{type(scheduler).__qualname__}{params!r}"
+
+class CachedResult:
+    def __init__(self, table: ProcessTable, metrics: Dict, trace: ExecutionTrace,
+                 stats: Optional[SchedulerStats] = None):
+        self.table = table
+        self.metrics = metrics
+        self.trace = trace
+        self.stats = stats
+
+class ResultCache:
+    def __init__(self, path: str = CACHE_PATH, max_bytes: int = 256 * 2**20):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return f"ResultCache({self.path!r}, hits={self.hits}, misses={self.misses})"
+
+    def key(self, workload: Workload, scheduler: Scheduler) -> str:
+        h = hashlib.sha256()
+        for part in (workload.digest(), scheduler_key(scheduler), code_version()):
+            h.update(part.encode())
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}.npz")
+
+    def get(self, workload: Workload, scheduler: Scheduler, stats: bool = False) -> Optional[CachedResult]:
+        """
+        the stored result of scheduler on workload, None when it is not cached (or, with stats,
+        cached without the scheduler counters). the table is a fresh workload.new_table().
+        """
+        file = self._file(self.key(workload, scheduler))
+        try:
+            with np.load(file) as entry:
+                if stats and "stats" not in entry:
+                    self.misses += 1
+                    return None
+                columns = {name: entry[name] for name in entry.files}
+            os.utime(file)
+        except (OSError, ValueError, KeyError):
+            # missing, evicted meanwhile or half written by a crashed run
+            self.misses += 1
+            return None
+
+        table = workload.new_table()
+        for name in ProcessTable.STATE_COLUMNS:
+            column = array(getattr(table, name).typecode)
+            column.frombytes(columns[name].tobytes())
+            setattr(table, name, column)
+
+        trace = ExecutionTrace()
+        for name in ("pid", "start", "length", "cpu"):
+            getattr(trace, name).frombytes(columns[f"trace_{name}"].tobytes())
+
+        restored = None
+        if "stats" in columns:
+            restored = SchedulerStats()
+            for name, value in json.loads(columns["stats"].item()).items():
+                setattr(restored, name, value)
+            restored.runs = array('q', columns["stats_runs"].tobytes())
+            restored.cpu_busy = array('q', columns["stats_cpu_busy"].tobytes())
+            restored.add_cpus(len(restored.cpu_busy))
+
+        self.hits += 1
+        return CachedResult(table, json.loads(columns["metrics"].item()), trace, restored)
+
+    def put(self, workload: Workload, scheduler: Scheduler, result: CachedResult):
+        # result is anything with table, metrics, trace and stats, e.g. an experiment.ExperimentResult
+        columns = {name: np.frombuffer(getattr(result.table, name), dtype=np.float64 if name == "vruntime" else np.int64)
+                   for name in ProcessTable.STATE_COLUMNS}
+        for name in ("pid", "start", "length", "cpu"):
+            columns[f"trace_{name}"] = np.frombuffer(getattr(result.trace, name), dtype=np.int64)
+        columns["metrics"] = np.array(json.dumps(result.metrics))
+        if result.stats is not None:
+            columns["stats"] = np.array(json.dumps(result.stats.as_dict()))
+            columns["stats_runs"] = np.frombuffer(result.stats.runs, dtype=np.int64)
+            columns["stats_cpu_busy"] = np.frombuffer(result.stats.cpu_busy, dtype=np.int64)
+
+        os.makedirs(self.path, exist_ok=True)
+        buffer = io.BytesIO()
+        np.savez(buffer, **columns)
+        # written next to the entry and renamed, readers never see a partial file
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(buffer.getbuffer())
+            os.replace(tmp, self._file(self.key(workload, scheduler)))
+        except BaseException:
+            os.remove(tmp)
+            raise
+        self.evict()
+
+    def evict(self):
+        # delete least recently used entries until the cache fits in max_bytes, and the temp files
+        # of writers that died before renaming them (recent ones may still be being written)
+        entries = []
+        stale = time.time() - STALE_TMP_SECONDS
+        for entry in os.scandir(self.path):
+            if entry.name.endswith(".tmp"):
+                try:
+                    if entry.stat().st_mtime < stale:
+                        os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
+            elif entry.name.endswith(".npz"):
+                try:
+                    info = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((info.st_mtime_ns, info.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def size(self) -> int:
+        if not os.path.isdir(self.path):
+            return 0
+        return sum(entry.stat().st_size for entry in os.scandir(self.path) if entry.name.endswith(".npz"))
+
+    def clear(self):
+        if os.path.isdir(self.path):
+            for entry in os.scandir(self.path):
+                if entry.name.endswith((".npz", ".tmp")):
+                    os.remove(entry.path)
@@ -0,0 +1,66 @@
+import json
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from experiment import ExperimentResult
+from process_table import ProcessTable
+
+# Columnar results on disk: a directory holding
+#   <column>.npy  one file per ProcessTable column, the rows of every run back to back
+#   offsets.npy   run i owns rows offsets[i]:offsets[i + 1]
+#   runs.json     format version plus workload, scheduler and aggregate metrics of each run
+# everything is written in bulk, and loading memory-maps the .npy files, so the per-process
+# columns of a large run are only read from disk when they are actually touched.
+
+FORMAT_VERSION = 1
+COLUMNS = ProcessTable.INPUT_COLUMNS + ProcessTable.STATE_COLUMNS
+
+def save_results(path: str, results: List[ExperimentResult], metadata: Optional[Dict] = None):
+    """
+    write the per-process columns and metrics of every result to the directory path
+    """
+    os.makedirs(path, exist_ok=True)
+    lengths = [len(result.table) for result in results]
+    offsets = np.zeros(len(results) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    np.save(os.path.join(path, "offsets.npy"), offsets)
+
+    for name in COLUMNS:
+        dtype = np.float64 if name in ("weight", "vruntime") else np.int64
+        parts = [result.table.numpy_column(name) for result in results]
+        column = np.concatenate(parts) if parts else np.zeros(0, dtype=dtype)
+        np.save(os.path.join(path, f"{name}.npy"), column)
+
+    runs = [{"workload": result.workload, "scheduler": result.scheduler, "metrics": result.metrics}
+            for result in results]
+    with open(os.path.join(path, "runs.json"), "w") as f:
+        json.dump({"version": FORMAT_VERSION, "metadata": metadata or {}, "runs": runs}, f, indent=1)
+
+def load_results(path: str, mmap: bool = True) -> List[ExperimentResult]:
+    """
+    read results written by save_results. the tables are read-only views over the memory-mapped
+    columns (or over arrays in memory when mmap is False), pid names are not stored.
+    """
+    with open(os.path.join(path, "runs.json")) as f:
+        header = json.load(f)
+    if header.get("version") != FORMAT_VERSION:
+        raise ValueError(f"{path} has results format version {header.get('version')}, expected {FORMAT_VERSION}")
+
+    mmap_mode = "r" if mmap else None
+    offsets = np.load(os.path.join(path, "offsets.npy"))
+    columns = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode) for name in COLUMNS}
+
+    results = []
+    for i, run in enumerate(header["runs"]):
+        table = ProcessTable(names=None)
+        for name, column in columns.items():
+            view = memoryview(column[offsets[i]:offsets[i + 1]])
+            setattr(table, name, view.toreadonly())
+        results.append(ExperimentResult(run["workload"], run["scheduler"], table, run["metrics"]))
+    return results
+
+def load_metadata(path: str) -> Dict:
+    with open(os.path.join(path, "runs.json")) as f:
+        return json.load(f)["metadata"]
@@ -1,90 +1,396 @@
-from typing import List, Any
-from process import Process
+import heapq
+from typing import Any, Callable, Iterator, List, Optional
+from process_table import ProcessTable
+from execution_trace import ExecutionTrace
+from scheduler_stats import SchedulerStats
 from scheduler.scheduler_base import Scheduler
+from scheduler.smp import CPU, CPUSet, EventLoop
 from RBTree import RedBlackTree
 
 class CFS(Scheduler):
+    MODES = ("tick", "event", "fluid")
+
     # latency_buffer = target_latency / 2
-    def __init__(self, name="CFS", latency_buffer: float = 10, target_latency: float = 20, min_time_slice: float = 4):
+    # mode "tick" advances the clock 1 ms per loop iteration, mode "event" jumps straight to the
+    # next slice expiry, completion or arrival. both produce identical schedules.
+    # two deliberate departures from the original per-ms Process loop, so an event costs the same
+    # whatever the slice length or the number of equal keys:
+    #   - vruntime is vruntime at dispatch + ms run / weight, not 1 / weight added every ms. with
+    #     weights like 3 or 7 the floats round differently, and a later tie or min_vruntime
+    #     comparison can then go the other way, so some schedules differ from the original ones
+    #   - equal vruntimes are queued in insertion order (see RBTree.py) instead of nudging the
+    #     newcomer by 1e-5 until its key is unique, which is quadratic when a burst arrives with
+    #     the same sleeper credit
+    # mode "fluid" is the approximation CFS converges to: generalized processor sharing, every
+    # runnable process progresses at weight / total weight, with events at arrivals and completions
+    # only. no slices, so no trace or dispatch counters, and every process starts on arrival.
+    # benchmarks/fluid_validation.py reports how far it lands from the exact engines.
+    # cpus > 1 runs the SMP mode on the event engine: one tree and min_vruntime per CPU, processes
+    # moved between CPUs keep their lag against the min_vruntime (see scheduler/smp.py).
+    # balance_interval is the ms between periodic load balancing passes, 0 leaves it to idle CPUs.
+    def __init__(self, name="CFS", latency_buffer: float = 10, target_latency: float = 20, min_time_slice: float = 4,
+                 mode: str = "event", cpus: int = 1, balance_interval: int = 50):
+        if mode not in self.MODES:
+            raise ValueError(f"unknown CFS mode {mode!r}, expected one of {self.MODES}")
+        if mode == "fluid" and cpus > 1:
+            raise ValueError("the fluid CFS mode simulates a single CPU")
+        if latency_buffer < 0 and latency_buffer != -1:
+            raise ValueError(f"latency_buffer must be >= 0 (or -1 for no sleeper credit), got {latency_buffer}")
+        if target_latency < 0 or min_time_slice < 0:
+            raise ValueError(f"target_latency and min_time_slice must be >= 0, got {target_latency}, {min_time_slice}")
+        if cpus < 1 or balance_interval < 0:
+            raise ValueError(f"need cpus >= 1 and balance_interval >= 0, got {cpus}, {balance_interval}")
         self.name = name
         self.latency_buffer = latency_buffer
         self.target_latency = target_latency
         self.min_time_slice = min_time_slice
+        self.mode = mode
+        self.cpus = cpus
+        self.balance_interval = balance_interval
+
+    def run(self, table: ProcessTable, arrivals: Iterator[int], on_complete: Optional[Callable[[int], Any]] = None,
+            trace: Optional[ExecutionTrace] = None, stats: Optional[SchedulerStats] = None):
+        if self.cpus > 1:
+            return self.run_smp(table, arrivals, on_complete, trace, stats)
+        if self.mode == "tick":
+            return self.run_ticks(table, arrivals, on_complete, trace, stats)
+        if self.mode == "fluid":
+            return self.run_fluid(table, arrivals, on_complete)
+        return self.run_events(table, arrivals, on_complete, trace, stats)
+
+    def run_ticks(self, table: ProcessTable, arrivals: Iterator[int], on_complete: Optional[Callable[[int], Any]] = None,
+            trace: Optional[ExecutionTrace] = None, stats: Optional[SchedulerStats] = None):
+        arrival_time = table.arrival_time
+        remaining_time = table.remaining_time
+        weight = table.weight
+        vruntime = table.vruntime
+        start_time = table.start_time
+        response_time = table.response_time
 
-    def schedule(self, processes: List[Process]):
         current_time = 0
-        completed = set()
         ready_queue = RedBlackTree()
-        incoming = sorted(processes, key=lambda p: p.arrival_time)
+        # next process to arrive, processes come sorted by arrival time
+        next_pid = next(arrivals, None)
         min_vruntime = 0.0
-        
+
         current_process = None
         time_slice_remaining = 0
-        
-        while len(completed) < len(processes):
-            while incoming and incoming[0].arrival_time <= current_time:
-                p = incoming.pop(0)
-                
-                if self.latency_buffer != -1:
-                    if p.arrival_time > 0:
-                        p.vruntime = max(0.0, min_vruntime - self.latency_buffer)
-                    else:
-                        p.vruntime = 0.0
-                
-                self.add_to_tree(ready_queue, p)
-                
+        # vruntime is recomputed from the value at dispatch so both engines round the same way
+        slice_vruntime = 0.0
+        slice_ran = 0
+
+        while next_pid is not None or current_process is not None or ready_queue:
+            while next_pid is not None and arrival_time[next_pid] <= current_time:
+                self.admit(table, ready_queue, next_pid, min_vruntime, stats)
+                next_pid = next(arrivals, None)
 
             if current_process is None or time_slice_remaining <= 0:
-                if current_process and current_process.remaining_time > 0:
-                    self.add_to_tree(ready_queue, current_process)
-                    current_process = None
+                current_process, time_slice_remaining = self.dispatch(table, ready_queue, current_process, stats)
+                if current_process is not None:
+                    slice_vruntime = vruntime[current_process]
+                    slice_ran = 0
 
-                if ready_queue.pids:
-                    current_process = ready_queue.get_min()
-                    ready_queue.remove(current_process.vruntime)
-                    
-                    num_runnable = len(ready_queue.pids) + 1 
-                    
-                    if num_runnable * self.min_time_slice > self.target_latency:
-                        period = num_runnable * self.min_time_slice
-                    else:
-                        period = self.target_latency
-                        
-                    time_slice = period / num_runnable
-                    
-                    time_slice = max(time_slice, self.min_time_slice)
-                    
-                    time_slice_remaining = int(time_slice)
-                else:
-                    current_process = None
+            if current_process is not None:
+                if start_time[current_process] == -1:
+                    start_time[current_process] = current_time
+                    response_time[current_process] = current_time - arrival_time[current_process]
 
-            if current_process:
-                if current_process.start_time == -1:
-                    current_process.start_time = current_time
-                    current_process.response_time = current_time - current_process.arrival_time
-                
-                current_process.remaining_time -= 1
+                if trace is not None:
+                    trace.record(current_process, current_time, 1)
+                remaining_time[current_process] -= 1
                 time_slice_remaining -= 1
-                
-                current_process.vruntime += 1.0 / current_process.weight
-                
-                if current_process.remaining_time <= 0:
-                    current_process.completion_time = current_time + 1
-                    current_process.turnaround_time = current_process.completion_time - current_process.arrival_time
-                    current_process.waiting_time = current_process.turnaround_time - current_process.duration
-                    completed.add(current_process.pid)
+
+                slice_ran += 1
+                vruntime[current_process] = slice_vruntime + slice_ran / weight[current_process]
+
+                if remaining_time[current_process] <= 0:
+                    self.complete(table, current_process, current_time + 1, on_complete, stats)
                     current_process = None
                     time_slice_remaining = 0
-                
-                if ready_queue.pids:
-                    min_vruntime = max(min_vruntime, ready_queue.get_min().vruntime)
-                elif current_process:
-                     min_vruntime = max(min_vruntime, current_process.vruntime)
+
+                if ready_queue:
+                    min_vruntime = max(min_vruntime, ready_queue.min_vruntime())
+                elif current_process is not None:
+                     min_vruntime = max(min_vruntime, vruntime[current_process])
+            elif stats is not None:
+                stats.idle(1)
 
             current_time += 1
-            
 
-    def add_to_tree(self, tree, process):
-        # dbtree should expect deterministic, so add a small value
-        while not tree.add(process):
-            process.vruntime += 1e-5
+        if stats is not None:
+            stats.vruntime_ties += ready_queue.ties
+
+    def run_events(self, table: ProcessTable, arrivals: Iterator[int], on_complete: Optional[Callable[[int], Any]] = None,
+            trace: Optional[ExecutionTrace] = None, stats: Optional[SchedulerStats] = None):
+        arrival_time = table.arrival_time
+        remaining_time = table.remaining_time
+        weight = table.weight
+        vruntime = table.vruntime
+        start_time = table.start_time
+        response_time = table.response_time
+
+        current_time = 0
+        ready_queue = RedBlackTree()
+        # next process to arrive, processes come sorted by arrival time
+        next_pid = next(arrivals, None)
+        min_vruntime = 0.0
+
+        current_process = None
+        time_slice_remaining = 0
+        slice_vruntime = 0.0
+        slice_ran = 0
+
+        while next_pid is not None or current_process is not None or ready_queue:
+            while next_pid is not None and arrival_time[next_pid] <= current_time:
+                self.admit(table, ready_queue, next_pid, min_vruntime, stats)
+                next_pid = next(arrivals, None)
+
+            if current_process is None or time_slice_remaining <= 0:
+                current_process, time_slice_remaining = self.dispatch(table, ready_queue, current_process, stats)
+                if current_process is None:
+                    # nothing runnable, the CPU idles until the next arrival
+                    if stats is not None:
+                        stats.idle(arrival_time[next_pid] - current_time)
+                    current_time = arrival_time[next_pid]
+                    continue
+                slice_vruntime = vruntime[current_process]
+                slice_ran = 0
+
+            if start_time[current_process] == -1:
+                start_time[current_process] = current_time
+                response_time[current_process] = current_time - arrival_time[current_process]
+
+            # run until the next event: slice expiry, completion or arrival (each takes at least 1 ms)
+            run = min(max(time_slice_remaining, 1), max(remaining_time[current_process], 1))
+            if next_pid is not None:
+                run = min(run, arrival_time[next_pid] - current_time)
+
+            if trace is not None:
+                trace.record(current_process, current_time, run)
+            remaining_time[current_process] -= run
+            time_slice_remaining -= run
+            slice_ran += run
+            vruntime[current_process] = slice_vruntime + slice_ran / weight[current_process]
+
+            if remaining_time[current_process] <= 0:
+                # the tick engine last saw the finished process one ms before completion
+                last_seen_vruntime = slice_vruntime + (slice_ran - 1) / weight[current_process]
+                self.complete(table, current_process, current_time + run, on_complete, stats)
+                current_process = None
+                time_slice_remaining = 0
+
+                if ready_queue:
+                    min_vruntime = max(min_vruntime, ready_queue.min_vruntime())
+                elif run > 1:
+                    min_vruntime = max(min_vruntime, last_seen_vruntime)
+            elif ready_queue:
+                min_vruntime = max(min_vruntime, ready_queue.min_vruntime())
+            else:
+                min_vruntime = max(min_vruntime, vruntime[current_process])
+
+            current_time += run
+
+        if stats is not None:
+            stats.vruntime_ties += ready_queue.ties
+
+    def run_fluid(self, table: ProcessTable, arrivals: Iterator[int], on_complete: Optional[Callable[[int], Any]] = None):
+        arrival_time = table.arrival_time
+        duration = table.duration
+        weight = table.weight
+        remaining_time = table.remaining_time
+        vruntime = table.vruntime
+        start_time = table.start_time
+        response_time = table.response_time
+
+        # GPS virtual time advances at 1 / total weight of the runnable processes, a process with
+        # duration d arriving at virtual time v finishes when it reaches v + d / weight.
+        # min-heap of (finish virtual time, pid), O(log n) per arrival and completion
+        finishing = []
+        total_weight = 0.0
+        virtual_time = 0.0
+        now = 0.0
+        next_pid = next(arrivals, None)
+
+        while next_pid is not None or finishing:
+            if finishing:
+                finish, pid = finishing[0]
+                completion = now + (finish - virtual_time) * total_weight
+                if next_pid is None or completion <= arrival_time[next_pid]:
+                    heapq.heappop(finishing)
+                    now = completion
+                    virtual_time = finish
+                    total_weight = total_weight - weight[pid] if finishing else 0.0
+                    remaining_time[pid] = 0
+                    self.complete(table, pid, int(completion + 0.5), on_complete)
+                    continue
+                virtual_time += (arrival_time[next_pid] - now) / total_weight
+            now = arrival_time[next_pid]
+
+            while next_pid is not None and arrival_time[next_pid] <= now:
+                start_time[next_pid] = arrival_time[next_pid]
+                response_time[next_pid] = 0
+                # service in virtual time, what the exact engines accumulate as vruntime
+                vruntime[next_pid] = duration[next_pid] / weight[next_pid]
+                heapq.heappush(finishing, (virtual_time + vruntime[next_pid], next_pid))
+                total_weight += weight[next_pid]
+                next_pid = next(arrivals, None)
+
+    def run_smp(self, table: ProcessTable, arrivals: Iterator[int], on_complete: Optional[Callable[[int], Any]] = None,
+            trace: Optional[ExecutionTrace] = None, stats: Optional[SchedulerStats] = None):
+        loop = self.event_loop(table, arrivals, on_complete, trace, stats)
+        loop.run()
+        if stats is not None:
+            stats.vruntime_ties += sum(cpu.queue.ties for cpu in loop.cpus.cpus)
+
+    def event_loop(self, table: ProcessTable, arrivals: Iterator[int], on_complete: Optional[Callable[[int], Any]] = None,
+                   trace: Optional[ExecutionTrace] = None, stats: Optional[SchedulerStats] = None) -> EventLoop:
+        # the SMP engine, with one CPU it gives the same schedule as run_events (and run_ticks)
+        if self.mode == "fluid":
+            raise ValueError("the fluid CFS mode has no event loop, it only runs whole workloads")
+        arrival_time = table.arrival_time
+        remaining_time = table.remaining_time
+        weight = table.weight
+        vruntime = table.vruntime
+        start_time = table.start_time
+        response_time = table.response_time
+
+        cpus = CPUSet(self.cpus, RedBlackTree)
+        if stats is not None:
+            stats.add_cpus(len(cpus))
+
+        # account the current process of cpu up to t, same min_vruntime rules as run_events
+        def advance(cpu: CPU, t: int):
+            pid = cpu.current
+            run = t - cpu.clock
+            if trace is not None:
+                trace.record(pid, cpu.clock, run, cpu.index)
+            if stats is not None:
+                stats.cpu_busy[cpu.index] += run
+            remaining_time[pid] -= run
+            cpu.slice_remaining -= run
+            cpu.slice_ran += run
+            cpu.clock = t
+            vruntime[pid] = cpu.slice_vruntime + cpu.slice_ran / weight[pid]
+
+            tree = cpu.queue
+            if remaining_time[pid] <= 0:
+                last_seen_vruntime = cpu.slice_vruntime + (cpu.slice_ran - 1) / weight[pid]
+                self.complete(table, pid, t, on_complete, stats, cpu.index)
+                cpu.current = None
+                cpu.slice_remaining = 0
+                cpu.idle_since = t
+                cpus.updated(cpu)
+
+                if tree:
+                    cpu.min_vruntime = max(cpu.min_vruntime, tree.min_vruntime())
+                elif run > 1:
+                    cpu.min_vruntime = max(cpu.min_vruntime, last_seen_vruntime)
+            elif tree:
+                cpu.min_vruntime = max(cpu.min_vruntime, tree.min_vruntime())
+            else:
+                cpu.min_vruntime = max(cpu.min_vruntime, vruntime[pid])
+
+        def arrive(pid: int, t: int) -> CPU:
+            cpu = cpus.place()
+            if cpu.current is not None and t > cpu.clock:
+                # an arrival ends the running step like in run_events
+                advance(cpu, t)
+            self.admit(table, cpu.queue, pid, cpu.min_vruntime, stats)
+            cpus.updated(cpu)
+            return cpu
+
+        def migrate(src: CPU, dst: CPU):
+            # keep the lag against the source min_vruntime
+            pid = src.queue.pop_min()
+            vruntime[pid] = max(0.0, vruntime[pid] - src.min_vruntime + dst.min_vruntime)
+            self.add_to_tree(table, dst.queue, pid, stats)
+            cpus.updated(src)
+            cpus.updated(dst)
+            if stats is not None:
+                stats.migrations += 1
+                stats.dequeue()
+
+        def dispatch(cpu: CPU, t: int):
+            if cpu.current is None and not cpu.queue:
+                src = cpus.busiest(exclude=cpu)
+                if src is None:
+                    cpus.updated(cpu)
+                    return
+                migrate(src, cpu)
+            if stats is not None and cpu.idle_since is not None and t > cpu.idle_since:
+                stats.idle(t - cpu.idle_since, cpu.index)
+            cpu.idle_since = None
+
+            pid, time_slice = self.dispatch(table, cpu.queue, cpu.current, stats, cpu.index)
+            cpu.current = pid
+            cpu.slice_remaining = time_slice
+            cpu.slice_vruntime = vruntime[pid]
+            cpu.slice_ran = 0
+            cpu.clock = t
+            if start_time[pid] == -1:
+                start_time[pid] = t
+                response_time[pid] = t - arrival_time[pid]
+            cpus.schedule_event(cpu, t + min(max(time_slice, 1), max(remaining_time[pid], 1)))
+            cpus.updated(cpu)
+
+        def end_step(cpu: CPU, t: int):
+            advance(cpu, t)
+
+        balance_interval = self.balance_interval if len(cpus) > 1 else 0
+        return EventLoop(cpus, arrival_time, arrivals, balance_interval, end_step, arrive, dispatch, migrate)
+
+    # place a newly arrived process in the tree, applying the sleeper credit
+    def admit(self, table, tree, pid, min_vruntime, stats=None):
+        if self.latency_buffer != -1:
+            if table.arrival_time[pid] > 0:
+                table.vruntime[pid] = max(0.0, min_vruntime - self.latency_buffer)
+            else:
+                table.vruntime[pid] = 0.0
+
+        self.add_to_tree(table, tree, pid, stats)
+
+    # put the preempted process back and pick the next one, return (pid, time slice)
+    def dispatch(self, table, tree, current_process, stats=None, cpu=0):
+        preempted = None
+        if current_process is not None and table.remaining_time[current_process] > 0:
+            self.add_to_tree(table, tree, current_process, stats)
+            preempted = current_process
+
+        if not tree:
+            return None, 0
+
+        current_process = tree.pop_min()
+        if stats is not None:
+            stats.dequeue()
+            if preempted is not None and preempted != current_process:
+                stats.preemptions += 1
+            stats.dispatch(current_process, cpu)
+
+        num_runnable = len(tree) + 1
+
+        if num_runnable * self.min_time_slice > self.target_latency:
+            period = num_runnable * self.min_time_slice
+        else:
+            period = self.target_latency
+
+        time_slice = period / num_runnable
+
+        time_slice = max(time_slice, self.min_time_slice)
+
+        return current_process, int(time_slice)
+
+    def complete(self, table, pid, completion_time, on_complete=None, stats=None, cpu=0):
+        table.completion_time[pid] = completion_time
+        table.turnaround_time[pid] = completion_time - table.arrival_time[pid]
+        table.waiting_time[pid] = table.turnaround_time[pid] - table.duration[pid]
+        if stats is not None:
+            stats.complete(pid, cpu)
+        if on_complete is not None:
+            on_complete(pid)
+
+    def add_to_tree(self, table, tree, pid, stats=None):
+        # equal vruntimes are ordered by insertion in the tree, no need to make the key unique
+        # (the tree counts those ties, see SchedulerStats.vruntime_ties)
+        tree.add(pid, table.vruntime[pid])
+        if stats is not None:
+            stats.enqueue(len(tree))
@@ -1,43 +1,154 @@
-from typing import List, Any
-from process import Process
+from array import array
+from typing import TYPE_CHECKING, Any, Callable, Iterator, List, Optional
+from process_table import ProcessTable
+from execution_trace import ExecutionTrace
+from scheduler_stats import SchedulerStats
 from scheduler.scheduler_base import Scheduler
+from scheduler.online import non_preemptive_loop
+from scheduler.smp import EventLoop
+
+if TYPE_CHECKING:
+    from metrics_sink import MetricsSink
 
 class FCFS(Scheduler):
-    def schedule(self, processes: List[Process]):
+    ARRIVAL_BY_NAME = True
+    RETURNS_SCHEDULE = True
+
+    # vectorized runs the closed form over NumPy arrays instead of the per-process loop,
+    # it fills the same columns and trace
+    def __init__(self, vectorized: bool = False):
+        self.vectorized = vectorized
+
+    def schedule_table(self, table: ProcessTable, sink: Optional["MetricsSink"] = None,
+                       trace: Optional[ExecutionTrace] = None,
+                       stats: Optional[SchedulerStats] = None) -> Optional[ExecutionTrace]:
+        if not self.vectorized:
+            return super().schedule_table(table, sink, trace, stats)
+        self.schedule_vectorized(table, trace, stats)
+        if sink is not None:
+            sink.record_table(table)
+        return trace
+
+    def run(self, table: ProcessTable, arrivals: Iterator[int], on_complete: Optional[Callable[[int], Any]] = None,
+            trace: Optional[ExecutionTrace] = None, stats: Optional[SchedulerStats] = None):
         """
         First-Come-First-Served (FCFS) scheduling algorithm.
         Non-preemptive: processes are executed in order of arrival time.
         """
-        # Sort processes by arrival time (pid for tie-breaking)
-        sorted_processes = sorted(processes, key=lambda p: (p.arrival_time, p.pid))
-        
-        execution_schedule = []
+        arrival_time = table.arrival_time
+        duration = table.duration
+        start_time = table.start_time
+        response_time = table.response_time
+        completion_time = table.completion_time
+        turnaround_time = table.turnaround_time
+        waiting_time = table.waiting_time
+        remaining_time = table.remaining_time
+
         current_time = 0
         
-        for process in sorted_processes:
+        # processes come sorted by arrival time (pid for tie-breaking)
+        for pid in arrivals:
             # CPU is idle, jump to the next process arrival time
-            if current_time < process.arrival_time:
-                current_time = process.arrival_time
+            if current_time < arrival_time[pid]:
+                if stats is not None:
+                    stats.idle(arrival_time[pid] - current_time)
+                current_time = arrival_time[pid]
+
+            if stats is not None:
+                stats.dispatch(pid)
             
             # Set start time (first time process gets CPU)
-            if process.start_time == -1:
-                process.start_time = current_time
-                process.response_time = current_time - process.arrival_time
+            if start_time[pid] == -1:
+                start_time[pid] = current_time
+                response_time[pid] = current_time - arrival_time[pid]
             
             # Execute the entire process
-            execution_schedule.append({
-                'process': process.pid,
-                'start_time': current_time,
-                'duration': process.duration
-            })
+            if trace is not None:
+                trace.record(pid, current_time, duration[pid])
             
             # Update current time
-            current_time += process.duration
+            current_time += duration[pid]
             
             # Update process metrics
-            process.completion_time = current_time
-            process.turnaround_time = process.completion_time - process.arrival_time
-            process.waiting_time = process.turnaround_time - process.duration
-            process.remaining_time = 0
-        
-        return execution_schedule
+            completion_time[pid] = current_time
+            turnaround_time[pid] = current_time - arrival_time[pid]
+            waiting_time[pid] = turnaround_time[pid] - duration[pid]
+            remaining_time[pid] = 0
+
+            if stats is not None:
+                stats.complete(pid)
+            if on_complete is not None:
+                on_complete(pid)
+
+    def schedule_vectorized(self, table: ProcessTable, trace: Optional[ExecutionTrace] = None,
+                            stats: Optional[SchedulerStats] = None):
+        """
+        FCFS in closed form. With the processes in arrival order and busy the running sum of durations,
+        completion[i] = max(completion[i-1], arrival[i]) + duration[i]
+                      = busy[i] + max(0, max over j <= i of (arrival[j] - busy[j-1]))
+        so the whole schedule is a cumsum and a running maximum.
+        """
+        import numpy as np
+
+        # None when the table is already in arrival order, then no gather / scatter is needed
+        order = table.arrival_order_numpy(by_name=True)
+
+        def in_arrival_order(name):
+            column = table.numpy_column(name)
+            return column if order is None else column[order]
+
+        arrival = in_arrival_order("arrival_time")
+        duration = in_arrival_order("duration")
+
+        # in-place arithmetic keeps 10^7 jobs to a handful of temporaries
+        busy = np.cumsum(duration)
+        completion = arrival - busy
+        completion += duration
+        np.maximum(completion, 0, out=completion)
+        np.maximum.accumulate(completion, out=completion)
+        completion += busy
+        # busy is not needed anymore, reuse its buffer for the start times
+        start = np.subtract(completion, duration, out=busy)
+        turnaround = completion - arrival
+        response = start - arrival
+
+        if trace is not None:
+            # one segment per process, in the order they ran
+            pids = np.arange(len(table)) if order is None else order
+            trace.extend(pids, start, duration)
+
+        if stats is not None and len(start):
+            # every process runs once, the CPU idles wherever a start is later than the previous completion
+            gaps = start[1:] - completion[:-1]
+            idle_gaps = int(np.count_nonzero(gaps > 0))
+            stats.dispatches += len(start)
+            stats.context_switches += len(start) - 1 - idle_gaps
+            stats.idle_time += int(gaps[gaps > 0].sum())
+            stats.runs = array('q', [1]) * len(start)
+
+        # processes that already ran keep their first start time
+        previous_start = in_arrival_order("start_time")
+        started = previous_start != -1
+        if started.any():
+            start = np.where(started, previous_start, start)
+            response = np.where(started, in_arrival_order("response_time"), response)
+
+        columns = {
+            "start_time": start,
+            "response_time": response,
+            "completion_time": completion,
+            "turnaround_time": turnaround,
+            "waiting_time": turnaround - duration,
+            "remaining_time": 0,
+        }
+        for name, values in columns.items():
+            if order is None:
+                table.numpy_column(name)[:] = values
+            else:
+                table.numpy_column(name)[order] = values
+
+    def event_loop(self, table: ProcessTable, arrivals: Iterator[int], on_complete: Optional[Callable[[int], Any]] = None,
+                   trace: Optional[ExecutionTrace] = None, stats: Optional[SchedulerStats] = None) -> EventLoop:
+        # in arrival order
+        return non_preemptive_loop(table, arrivals, lambda table, pid, index: (index,),
+                                   on_complete, trace, stats, queue_stats=False)
@@ -0,0 +1,196 @@
+import math
+from collections import deque
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+from process_table import ProcessTable
+from execution_trace import ExecutionTrace
+from scheduler_stats import SchedulerStats
+from scheduler.scheduler_base import Scheduler
+from scheduler.smp import CPU, CPUSet, EventLoop
+
+# The Linux 2.6 O(1) scheduler, the design CFS replaced, for comparing pick-next cost.
+# Every priority level has a FIFO list in each of two arrays, active and expired, and a bitmap
+# of the non-empty levels, so picking the next process is a find-first-set plus a popleft
+# whatever the number of runnable processes:
+#   - a process runs its whole timeslice (or until it completes), then gets a fresh one and
+#     moves to the expired array
+#   - when the active array runs empty the two arrays swap
+#   - an arriving process goes to the active array and preempts a lower priority one, which
+#     keeps the rest of its slice at the head of its list
+# Only the 40 nice levels exist (no real-time range), and since the processes never sleep there
+# is no interactivity bonus: priorities are static. Weights map to nice levels the way CFS
+# weights do (1.25x per level, weight 1 is nice 0), nice levels to timeslices with the 2.6
+# formula scaled by base_time_slice: nice 0 gets base_time_slice, nice 19 5%, nice -20 8x.
+
+NUM_PRIORITIES = 40
+# nice 0
+DEFAULT_PRIORITY = 20
+
+class PriorityArray:
+    __slots__ = ("queues", "bitmap", "count")
+
+    def __init__(self):
+        self.queues = [deque() for _ in range(NUM_PRIORITIES)]
+        # bit p set when the list of priority p is not empty
+        self.bitmap = 0
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def push(self, pid: int, priority: int, front: bool = False):
+        if front:
+            self.queues[priority].appendleft(pid)
+        else:
+            self.queues[priority].append(pid)
+        self.bitmap |= 1 << priority
+        self.count += 1
+
+    def highest(self) -> int:
+        # lowest set bit, the best priority queued, -1 when empty
+        bitmap = self.bitmap
+        return (bitmap & -bitmap).bit_length() - 1
+
+    def pop(self) -> int:
+        priority = self.highest()
+        queue = self.queues[priority]
+        pid = queue.popleft()
+        if not queue:
+            self.bitmap &= ~(1 << priority)
+        self.count -= 1
+        return pid
+
+class RunQueue:
+    __slots__ = ("active", "expired", "swaps")
+
+    def __init__(self):
+        self.active = PriorityArray()
+        self.expired = PriorityArray()
+        self.swaps = 0
+
+    def __len__(self) -> int:
+        return len(self.active) + len(self.expired)
+
+    def pop(self) -> int:
+        if not self.active.count:
+            # every queued process has used its slice, a new round starts
+            self.active, self.expired = self.expired, self.active
+            self.swaps += 1
+        return self.active.pop()
+
+class O1Scheduler(Scheduler):
+    def __init__(self, base_time_slice: int = 100, preempt: bool = True):
+        if base_time_slice <= 0:
+            raise ValueError(f"base_time_slice must be > 0, got {base_time_slice}")
+        self.base_time_slice = base_time_slice
+        # an arrival with a better priority than the running process takes the CPU at once
+        self.preempt = preempt
+        # weight -> (priority, timeslice)
+        self._levels: Dict[float, Tuple[int, int]] = {}
+
+    def level(self, weight: float) -> Tuple[int, int]:
+        levels = self._levels
+        if weight not in levels:
+            nice = -round(math.log(weight) / math.log(1.25)) if weight > 0 else NUM_PRIORITIES
+            priority = min(max(DEFAULT_PRIORITY + nice, 0), NUM_PRIORITIES - 1)
+            # MAX_PRIO - static_prio, with static prio 120 being nice 0
+            steps = NUM_PRIORITIES - priority
+            if priority < DEFAULT_PRIORITY:
+                time_slice = 4 * self.base_time_slice * steps // (NUM_PRIORITIES // 2)
+            else:
+                time_slice = self.base_time_slice * steps // (NUM_PRIORITIES // 2)
+            levels[weight] = (priority, max(time_slice, 1))
+        return levels[weight]
+
+    def run(self, table: ProcessTable, arrivals: Iterator[int], on_complete: Optional[Callable[[int], Any]] = None,
+            trace: Optional[ExecutionTrace] = None, stats: Optional[SchedulerStats] = None):
+        self.event_loop(table, arrivals, on_complete, trace, stats).run()
+
+    def event_loop(self, table: ProcessTable, arrivals: Iterator[int], on_complete: Optional[Callable[[int], Any]] = None,
+                   trace: Optional[ExecutionTrace] = None, stats: Optional[SchedulerStats] = None) -> EventLoop:
+        arrival_time = table.arrival_time
+        remaining_time = table.remaining_time
+        start_time = table.start_time
+        response_time = table.response_time
+        completion_time = table.completion_time
+        turnaround_time = table.turnaround_time
+        waiting_time = table.waiting_time
+        duration = table.duration
+        weight = table.weight
+        level = self.level
+        preempt = self.preempt
+
+        cpus = CPUSet(1, RunQueue)
+        cpu = cpus.cpus[0]
+        rq = cpu.queue
+        # slice left of every runnable process, kept across preemptions
+        slice_left = {}
+
+        # account the current process up to t, returns it if it has work left
+        def account(t: int) -> Optional[int]:
+            pid = cpu.current
+            run = t - cpu.clock
+            if trace is not None and run > 0:
+                trace.record(pid, cpu.clock, run)
+            remaining_time[pid] -= run
+            slice_left[pid] -= run
+            cpu.clock = t
+            cpu.current = None
+            cpu.event_time = None
+            if remaining_time[pid] > 0:
+                return pid
+            completion_time[pid] = t
+            turnaround_time[pid] = t - arrival_time[pid]
+            waiting_time[pid] = turnaround_time[pid] - duration[pid]
+            del slice_left[pid]
+            cpu.idle_since = t
+            if stats is not None:
+                stats.complete(pid)
+            if on_complete is not None:
+                on_complete(pid)
+            return None
+
+        def end_step(cpu: CPU, t: int):
+            pid = account(t)
+            if pid is None:
+                return
+            # slice used up: a fresh one, and wait in the expired array for the next round
+            priority, slice_left[pid] = level(weight[pid])
+            rq.expired.push(pid, priority)
+            if stats is not None:
+                if len(rq) > 1:
+                    stats.preemptions += 1
+                stats.enqueue(len(rq))
+
+        def arrive(pid: int, t: int) -> CPU:
+            priority, slice_left[pid] = level(weight[pid])
+            rq.active.push(pid, priority)
+            if stats is not None:
+                stats.enqueue(len(rq))
+            current = cpu.current
+            if preempt and current is not None and priority < level(weight[current])[0]:
+                current = account(t)
+                if current is not None:
+                    rq.active.push(current, level(weight[current])[0], front=True)
+                    if stats is not None:
+                        stats.preemptions += 1
+                        stats.enqueue(len(rq))
+            return cpu
+
+        def dispatch(cpu: CPU, t: int):
+            if not rq:
+                return
+            pid = rq.pop()
+            if stats is not None:
+                if cpu.idle_since is not None and t > cpu.idle_since:
+                    stats.idle(t - cpu.idle_since)
+                stats.dequeue()
+                stats.dispatch(pid)
+            cpu.idle_since = None
+            if start_time[pid] == -1:
+                start_time[pid] = t
+                response_time[pid] = t - arrival_time[pid]
+            cpu.current = pid
+            cpu.clock = t
+            cpus.schedule_event(cpu, t + min(slice_left[pid], remaining_time[pid]))
+
+        return EventLoop(cpus, arrival_time, arrivals, 0, end_step, arrive, dispatch, None)
@@ -0,0 +1,225 @@
+import heapq
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+from process import Process
+from process_table import ProcessTable
+from execution_trace import ExecutionTrace
+from scheduler_stats import SchedulerStats
+from scheduler.smp import CPU, CPUSet, EventLoop, INFINITY
+
+if TYPE_CHECKING:
+    from metrics_sink import MetricsSink
+    from scheduler.scheduler_base import Job, Scheduler
+
+# Online scheduling: jobs are handed to a scheduler one by one as they show up (an admission
+# layer, a live trace) and the schedule is worked out as far as asked, instead of running a
+# whole workload in one call.
+#   online = CFS().online()
+#   online.submit(("P1", 0, 30, 1))
+#   online.pick_next()           -> "P1", the process the CPU runs from now on
+#   online.submit(("P2", 5, 10, 2))
+#   online.advance(40)           -> [Process P2, ...] finished before time 40
+#   online.snapshot()            -> {"time": 40, "running": [...], "queued": [...], ...}
+# Every scheduler builds its engine as an EventLoop (scheduler/smp.py) over its usual ready queue,
+# a deque for RoundRobin, the red-black tree for CFS and a heap for the others, and the loop simply
+# stops at the time asked. Each event costs O(log n): the arrival heap below, the ready queue and
+# the CPU event heap, so a call costs O(log n) per decision it takes. That holds for bursts too:
+# jobs submitted together get the same CFS vruntime, and the tree queues equal keys in
+# insertion order at O(log n) each rather than searching for a free key.
+
+def non_preemptive_loop(table: ProcessTable, arrivals: Iterator[int], ready_key: Callable[[ProcessTable, int, int], Tuple],
+                        on_complete: Optional[Callable[[int], Any]] = None, trace: Optional[ExecutionTrace] = None,
+                        stats: Optional[SchedulerStats] = None, queue_stats: bool = True) -> EventLoop:
+    """
+    event loop of a non-preemptive scheduler on one CPU: the ready process with the smallest
+    ready_key(table, pid, arrival index) runs to completion. gives the same schedule as the
+    FCFS / SJF / Priority loops. queue_stats=False leaves the ready queue out of stats (FCFS).
+    """
+    arrival_time = table.arrival_time
+    duration = table.duration
+    start_time = table.start_time
+    response_time = table.response_time
+    completion_time = table.completion_time
+    turnaround_time = table.turnaround_time
+    waiting_time = table.waiting_time
+    remaining_time = table.remaining_time
+
+    # a heap of (ready_key..., pid) as the ready queue
+    cpus = CPUSet(1, list)
+    arrival_index = 0
+
+    def arrive(pid: int, t: int) -> CPU:
+        nonlocal arrival_index
+        cpu = cpus.cpus[0]
+        heapq.heappush(cpu.queue, ready_key(table, pid, arrival_index) + (pid,))
+        arrival_index += 1
+        if stats is not None and queue_stats:
+            stats.enqueue(len(cpu.queue))
+        cpus.updated(cpu)
+        return cpu
+
+    def end_step(cpu: CPU, t: int):
+        pid = cpu.current
+        completion_time[pid] = t
+        turnaround_time[pid] = t - arrival_time[pid]
+        waiting_time[pid] = turnaround_time[pid] - duration[pid]
+        remaining_time[pid] = 0
+        cpu.current = None
+        cpu.idle_since = t
+        cpus.updated(cpu)
+        if stats is not None:
+            stats.complete(pid)
+        if on_complete is not None:
+            on_complete(pid)
+
+    def dispatch(cpu: CPU, t: int):
+        if not cpu.queue:
+            return
+        pid = heapq.heappop(cpu.queue)[-1]
+        if stats is not None:
+            if cpu.idle_since is not None and t > cpu.idle_since:
+                stats.idle(t - cpu.idle_since)
+            if queue_stats:
+                stats.dequeue()
+            stats.dispatch(pid)
+        cpu.idle_since = None
+        if start_time[pid] == -1:
+            start_time[pid] = t
+            response_time[pid] = t - arrival_time[pid]
+        if trace is not None:
+            trace.record(pid, t, duration[pid])
+        cpu.current = pid
+        cpu.clock = t
+        cpus.schedule_event(cpu, t + duration[pid])
+        cpus.updated(cpu)
+
+    return EventLoop(cpus, arrival_time, arrivals, 0, end_step, arrive, dispatch, None)
+
+Submission = Union["Job", Process]
+
+class _Arrivals:
+    # the submitted jobs in arrival order, as the arrivals iterator of the event loop. it only
+    # hands out jobs arriving before until, so the loop never looks past the time it was asked for
+    # and a job submitted later can still arrive before the ones already waiting here
+    def __init__(self):
+        # min-heap of (arrival_time, name or "", submission number, pid)
+        self.heap = []
+        self.until = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> int:
+        heap = self.heap
+        if heap and heap[0][0] < self.until:
+            return heapq.heappop(heap)[-1]
+        raise StopIteration
+
+class OnlineScheduler:
+    """
+    incremental driver of a scheduler, see the top of this module. create it with Scheduler.online().
+      submit(job)      queue a job (pid, arrival_time, duration, weight) or a Process. jobs may come
+                       in any order but none may arrive before the time already simulated
+      advance(until)   simulate everything that happens before until, returns the processes
+                       that finished meanwhile in completion order
+      pick_next(cpu)   take the decisions due at the current time, returns the pid running on cpu
+                       from now on (None when idle). jobs submitted afterwards must arrive later
+      snapshot()       current time and what every CPU runs and has queued
+      drain()          run until every submitted job has finished
+    the schedule is the one a batch run over all the submitted jobs gives. like
+    Scheduler.schedule_stream, finished processes are recorded into sink, passed to on_complete as
+    a Process and their rows reused, so memory follows the processes that have not finished.
+    """
+
+    def __init__(self, scheduler: "Scheduler", on_complete: Optional[Callable[[Process], Any]] = None,
+                 sink: Optional["MetricsSink"] = None, stats: Optional[SchedulerStats] = None):
+        self.scheduler = scheduler
+        self.table = ProcessTable(names=[])
+        self.on_complete = on_complete
+        self.sink = sink
+        self.stats = stats
+        # time up to which the schedule has been simulated
+        self.time = 0
+        # earliest arrival still accepted, past time once pick_next has settled the decisions at time
+        self.settled = 0
+        self.completed = 0
+        self.submitted = 0
+        self._finished = []
+        self._arrivals = _Arrivals()
+        self._loop = scheduler.event_loop(self.table, self._arrivals, self._finish, stats=stats)
+
+    def __repr__(self):
+        return (f"OnlineScheduler({self.scheduler.__class__.__name__}, time={self.time}, "
+                f"submitted={self.submitted}, completed={self.completed})")
+
+    def _finish(self, pid: int):
+        table = self.table
+        process = table.process(pid)
+        self.completed += 1
+        self._finished.append(process)
+        if self.sink is not None:
+            self.sink.record_row(table, pid)
+        if self.on_complete is not None:
+            self.on_complete(process)
+        table.release(pid)
+
+    def _run(self, until: float):
+        self._arrivals.until = until
+        self._loop.run(until)
+
+    def _take_finished(self) -> List[Process]:
+        finished, self._finished = self._finished, []
+        return finished
+
+    def submit(self, job: Submission) -> int:
+        """
+        queue a job, returns its row in self.table (reused once the process has finished).
+        """
+        if isinstance(job, Process):
+            job = (job.pid, job.arrival_time, job.duration, job.weight)
+        name, arrival_time = job[0], job[1]
+        if arrival_time < self.settled:
+            raise ValueError(f"{name!r} arrives at {arrival_time}, the schedule is already settled up to "
+                             f"{self.settled}")
+        pid = self.table.admit(*job)
+        # same tie breaking as ProcessTable.arrival_order / stream_arrivals
+        tie = (name or "") if self.scheduler.ARRIVAL_BY_NAME else ""
+        heapq.heappush(self._arrivals.heap, (arrival_time, tie, self.submitted, pid))
+        self.submitted += 1
+        return pid
+
+    def advance(self, until: int) -> List[Process]:
+        if until < self.time:
+            raise ValueError(f"cannot go back from time {self.time} to {until}")
+        self._run(until)
+        self.time = until
+        self.settled = max(self.settled, until)
+        return self._take_finished()
+
+    def pick_next(self, cpu: int = 0) -> Optional[str]:
+        # times are whole ms, so the events of the current time are the ones before time + 1
+        self.settled = max(self.settled, self.time + 1)
+        # the processes finishing now are returned by the next advance()
+        self._run(self.settled)
+        pid = self._loop.cpus.cpus[cpu].current
+        return self.table.pid_name(pid) if pid is not None else None
+
+    def drain(self) -> List[Process]:
+        self._run(INFINITY)
+        self.time = max(self.time, self._loop.now)
+        self.settled = max(self.settled, self.time)
+        return self._take_finished()
+
+    def snapshot(self) -> Dict[str, Any]:
+        cpus = self._loop.cpus.cpus
+        table = self.table
+        return {
+            "time": self.time,
+            "running": [table.pid_name(cpu.current) if cpu.current is not None else None for cpu in cpus],
+            "queued": [len(cpu.queue) for cpu in cpus],
+            "pending": len(self._arrivals),
+            "submitted": self.submitted,
+            "completed": self.completed,
+        }
@@ -1,63 +1,93 @@
-from typing import List, Any
-from process import Process
+import heapq
+from typing import Any, Callable, Iterator, List, Optional
+from process_table import ProcessTable
+from execution_trace import ExecutionTrace
+from scheduler_stats import SchedulerStats
 from scheduler.scheduler_base import Scheduler
+from scheduler.online import non_preemptive_loop
+from scheduler.smp import EventLoop
 
 class PriorityScheduler(Scheduler):
-    def schedule(self, processes: List[Process]):
+    ARRIVAL_BY_NAME = True
+    RETURNS_SCHEDULE = True
+
+    def run(self, table: ProcessTable, arrivals: Iterator[int], on_complete: Optional[Callable[[int], Any]] = None,
+            trace: Optional[ExecutionTrace] = None, stats: Optional[SchedulerStats] = None):
         """
         Priority scheduling algorithm (non-preemptive).
         Processes with higher weight have higher priority.
         Similar to SJF but uses weight instead of duration for priority.
         """
-        execution_schedule = []
+        arrival_time = table.arrival_time
+        duration = table.duration
+        start_time = table.start_time
+        response_time = table.response_time
+        completion_time = table.completion_time
+        turnaround_time = table.turnaround_time
+        waiting_time = table.waiting_time
+        remaining_time = table.remaining_time
+        weight = table.weight
+
         current_time = 0
         
-        # processes sorted by arrival time
-        workload = sorted(processes, key=lambda p: (p.arrival_time, p.pid))
+        # next process to arrive, processes come sorted by arrival time
+        next_pid = next(arrivals, None)
+        arrival_index = 0
         
-        # queue will hold processes ready to run
+        # min-heap of (-weight, arrival_time, index, pid) for processes ready to run,
+        # the arrival index keeps ties in arrival order like a stable sort would
         ready_queue = []
         
-        workload_index = 0
-        n = len(workload)
-        
-        while workload_index < n or ready_queue:
+        while next_pid is not None or ready_queue:
             # Add all processes that have arrived by current_time to ready queue
-            while workload_index < n and workload[workload_index].arrival_time <= current_time:
-                ready_queue.append(workload[workload_index])
-                workload_index += 1
+            while next_pid is not None and arrival_time[next_pid] <= current_time:
+                pid = next_pid
+                heapq.heappush(ready_queue, (-weight[pid], arrival_time[pid], arrival_index, pid))
+                if stats is not None:
+                    stats.enqueue(len(ready_queue))
+                arrival_index += 1
+                next_pid = next(arrivals, None)
             
             if ready_queue:
+                # Get highest priority process
                 # higher weight = higher priority
                 # if weights are equal, use arrival time (earlier first)
-                ready_queue.sort(key=lambda p: (-p.weight, p.arrival_time))
-                
-                # Get highest priority process
-                process = ready_queue.pop(0)
+                pid = heapq.heappop(ready_queue)[3]
+                if stats is not None:
+                    stats.dequeue()
+                    stats.dispatch(pid)
                 
                 # Set first_run time
-                if process.start_time == -1:
-                    process.start_time = current_time
-                    process.response_time = current_time - process.arrival_time
+                if start_time[pid] == -1:
+                    start_time[pid] = current_time
+                    response_time[pid] = current_time - arrival_time[pid]
                 
                 # Execute the process completely (non-preemptive)
-                execution_schedule.append({
-                    'process': process.pid,
-                    'start_time': current_time,
-                    'duration': process.duration
-                })
+                if trace is not None:
+                    trace.record(pid, current_time, duration[pid])
                 
-                current_time += process.duration
+                current_time += duration[pid]
                 
                 # Update completion metrics
-                process.completion_time = current_time
-                process.turnaround_time = process.completion_time - process.arrival_time
-                process.waiting_time = process.turnaround_time - process.duration
-                process.remaining_time = 0
+                completion_time[pid] = current_time
+                turnaround_time[pid] = current_time - arrival_time[pid]
+                waiting_time[pid] = turnaround_time[pid] - duration[pid]
+                remaining_time[pid] = 0
+
+                if stats is not None:
+                    stats.complete(pid)
+                if on_complete is not None:
+                    on_complete(pid)
                 
             else:
                 # CPU idle, jump to next process arrival
-                if workload_index < n:
-                    current_time = workload[workload_index].arrival_time
-        
-        return execution_schedule
+                if next_pid is not None:
+                    if stats is not None:
+                        stats.idle(arrival_time[next_pid] - current_time)
+                    current_time = arrival_time[next_pid]
+
+    def event_loop(self, table: ProcessTable, arrivals: Iterator[int], on_complete: Optional[Callable[[int], Any]] = None,
+                   trace: Optional[ExecutionTrace] = None, stats: Optional[SchedulerStats] = None) -> EventLoop:
+        # same order as the ready queue of run()
+        return non_preemptive_loop(table, arrivals, lambda table, pid, index: (-table.weight[pid], table.arrival_time[pid], index),
+                                   on_complete, trace, stats)
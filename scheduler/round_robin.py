@@ -1,58 +1,254 @@
-from typing import List, Any
-from process import Process
+from typing import Any, Callable, Iterator, List, Optional
+from process_table import ProcessTable
+from execution_trace import ExecutionTrace
+from scheduler_stats import SchedulerStats
 from scheduler.scheduler_base import Scheduler
+from scheduler.smp import CPU, CPUSet, EventLoop
 from collections import deque
 
 class RoundRobin(Scheduler):
-    def __init__(self, time_slice: int = 2):
+    def __init__(self, time_slice: int = 2, cpus: int = 1, balance_interval: int = 50):
+        if time_slice <= 0:
+            raise ValueError(f"time_slice must be > 0, got {time_slice}")
+        if cpus < 1 or balance_interval < 0:
+            raise ValueError(f"need cpus >= 1 and balance_interval >= 0, got {cpus}, {balance_interval}")
         self.time_slice = time_slice
+        # cpus > 1 runs the SMP mode: one ready queue per CPU, see scheduler/smp.py
+        self.cpus = cpus
+        # ms between periodic load balancing passes, 0 leaves it to idle CPUs pulling work
+        self.balance_interval = balance_interval
+
+    def run(self, table: ProcessTable, arrivals: Iterator[int], on_complete: Optional[Callable[[int], Any]] = None,
+            trace: Optional[ExecutionTrace] = None, stats: Optional[SchedulerStats] = None):
+        if self.cpus > 1:
+            return self.run_smp(table, arrivals, on_complete, trace, stats)
+
+        arrival_time = table.arrival_time
+        remaining_time = table.remaining_time
+        start_time = table.start_time
+        response_time = table.response_time
+        completion_time = table.completion_time
+        turnaround_time = table.turnaround_time
+        waiting_time = table.waiting_time
+        duration = table.duration
 
-    def schedule(self, processes: List[Process]):
         current_time = 0
-        completed_count = 0
-        n = len(processes)
         
         ready_queue = deque() 
         
-        sorted_processes = sorted(processes, key=lambda process: process.arrival_time)
-        arrival_queue = deque(sorted_processes) 
+        # next process to arrive, processes come sorted by arrival time
+        next_pid = next(arrivals, None)
+        # slices left before the next try at skipping whole rotations, one try per rotation at most
+        # keeps the O(len(ready_queue)) check amortized O(1) per slice
+        slices_to_skip_check = 0
 
-        while completed_count < n:
+        while next_pid is not None or ready_queue:
             # move the processes that have arrived to the ready queue
-            while arrival_queue and arrival_queue[0].arrival_time <= current_time:
-                arriving_process = arrival_queue.popleft()
-                ready_queue.append(arriving_process)
+            while next_pid is not None and arrival_time[next_pid] <= current_time:
+                ready_queue.append(next_pid)
+                if stats is not None:
+                    stats.enqueue(len(ready_queue))
+                next_pid = next(arrivals, None)
 
             if not ready_queue:
                 # if no process is ready we can fast forward to the next arrival time
-                if arrival_queue:
-                    current_time = arrival_queue[0].arrival_time
+                if stats is not None:
+                    stats.idle(arrival_time[next_pid] - current_time)
+                current_time = arrival_time[next_pid]
                 continue
 
-            process = ready_queue.popleft()
+            if slices_to_skip_check <= 0:
+                slices_to_skip_check = len(ready_queue)
+                # cheap tests first: the head has to outlast a rotation, which has to fit before the next arrival
+                if remaining_time[ready_queue[0]] > self.time_slice and (
+                        next_pid is None or arrival_time[next_pid] - current_time > slices_to_skip_check * self.time_slice):
+                    current_time = self.skip_rotations(table, ready_queue, current_time,
+                                                       arrival_time[next_pid] if next_pid is not None else None,
+                                                       trace, stats)
+            slices_to_skip_check -= 1
+
+            pid = ready_queue.popleft()
+            if stats is not None:
+                stats.dequeue()
+                stats.dispatch(pid)
 
             # if this is the first execution set response time and start time
-            if process.response_time == -1:
-                process.start_time = current_time
-                process.response_time = current_time - process.arrival_time
+            if response_time[pid] == -1:
+                start_time[pid] = current_time
+                response_time[pid] = current_time - arrival_time[pid]
+
+            execution_time = min(self.time_slice, remaining_time[pid])
+            if trace is not None:
+                trace.record(pid, current_time, execution_time)
 
-            execution_time = min(self.time_slice, process.remaining_time)
-            
             current_time += execution_time
-            process.remaining_time -= execution_time
+            remaining_time[pid] -= execution_time
 
             # add all the processes that have arrived during this execution
-            while arrival_queue and arrival_queue[0].arrival_time <= current_time:
-                arriving_process = arrival_queue.popleft()
-                ready_queue.append(arriving_process)
+            while next_pid is not None and arrival_time[next_pid] <= current_time:
+                ready_queue.append(next_pid)
+                if stats is not None:
+                    stats.enqueue(len(ready_queue))
+                next_pid = next(arrivals, None)
 
             # add the process back to the ready queue or mark as completed
-            if process.remaining_time > 0:
-                ready_queue.append(process)
+            if remaining_time[pid] > 0:
+                if stats is not None:
+                    if ready_queue:
+                        stats.preemptions += 1
+                    stats.enqueue(len(ready_queue) + 1)
+                ready_queue.append(pid)
+            else:
+                completion_time[pid] = current_time
+
+                turnaround_time[pid] = current_time - arrival_time[pid]
+                waiting_time[pid] = turnaround_time[pid] - duration[pid]
+
+                if stats is not None:
+                    stats.complete(pid)
+                if on_complete is not None:
+                    on_complete(pid)
+
+    def skip_rotations(self, table: ProcessTable, ready_queue: deque, current_time: int, next_arrival: Optional[int],
+                       trace: Optional[ExecutionTrace] = None, stats: Optional[SchedulerStats] = None) -> int:
+        """
+        run as many whole rotations of the ready queue as fit before the next arrival and before any
+        process could finish, in one go. every process then runs full slices in queue order and the
+        queue ends up in the same order, so the schedule is the same as slice by slice.
+        returns the new current time.
+        """
+        time_slice = self.time_slice
+        remaining_time = table.remaining_time
+        count = len(ready_queue)
+        if time_slice <= 0:
+            return current_time
+
+        # a process with remaining_time <= k * time_slice would finish inside the k-th rotation
+        rotations = (min(remaining_time[pid] for pid in ready_queue) - 1) // time_slice
+        rotation_time = count * time_slice
+        if next_arrival is not None:
+            # every slice has to end before the next arrival, it would otherwise join the queue
+            rotations = min(rotations, (next_arrival - current_time - 1) // rotation_time)
+        if rotations <= 0:
+            return current_time
+
+        start_time = table.start_time
+        response_time = table.response_time
+        arrival_time = table.arrival_time
+        run = rotations * time_slice
+        for i, pid in enumerate(ready_queue):
+            if response_time[pid] == -1:
+                start_time[pid] = current_time + i * time_slice
+                response_time[pid] = start_time[pid] - arrival_time[pid]
+            remaining_time[pid] -= run
+
+        if stats is not None:
+            stats.rotations(list(ready_queue), rotations)
+        if trace is not None:
+            if count == 1:
+                trace.record(ready_queue[0], current_time, run)
             else:
-                process.completion_time = current_time
+                # the trace itself has one segment per slice here
+                t = current_time
+                for _ in range(rotations):
+                    for pid in ready_queue:
+                        trace.record(pid, t, time_slice)
+                        t += time_slice
+
+        return current_time + rotations * rotation_time
+
+    def run_smp(self, table: ProcessTable, arrivals: Iterator[int], on_complete: Optional[Callable[[int], Any]] = None,
+                trace: Optional[ExecutionTrace] = None, stats: Optional[SchedulerStats] = None):
+        self.event_loop(table, arrivals, on_complete, trace, stats).run()
+
+    def event_loop(self, table: ProcessTable, arrivals: Iterator[int], on_complete: Optional[Callable[[int], Any]] = None,
+                   trace: Optional[ExecutionTrace] = None, stats: Optional[SchedulerStats] = None) -> EventLoop:
+        # slice by slice, no rotation skipping: the loop may stop between any two slices
+        arrival_time = table.arrival_time
+        remaining_time = table.remaining_time
+        start_time = table.start_time
+        response_time = table.response_time
+        completion_time = table.completion_time
+        turnaround_time = table.turnaround_time
+        waiting_time = table.waiting_time
+        duration = table.duration
+        time_slice = self.time_slice
+
+        cpus = CPUSet(self.cpus, deque)
+        if stats is not None:
+            stats.add_cpus(len(cpus))
+
+        def end_step(cpu: CPU, t: int):
+            pid = cpu.current
+            run = t - cpu.clock
+            remaining_time[pid] -= run
+            if trace is not None:
+                trace.record(pid, cpu.clock, run, cpu.index)
+            if stats is not None:
+                stats.cpu_busy[cpu.index] += run
+            if remaining_time[pid] > 0:
+                # stays current until dispatch requeues it behind the arrivals of time t
+                return
+            completion_time[pid] = t
+            turnaround_time[pid] = t - arrival_time[pid]
+            waiting_time[pid] = turnaround_time[pid] - duration[pid]
+            cpu.current = None
+            cpu.idle_since = t
+            cpus.updated(cpu)
+            if stats is not None:
+                stats.complete(pid, cpu.index)
+            if on_complete is not None:
+                on_complete(pid)
+
+        def arrive(pid: int, t: int) -> CPU:
+            cpu = cpus.place()
+            cpu.queue.append(pid)
+            if stats is not None:
+                stats.enqueue(len(cpu.queue))
+            cpus.updated(cpu)
+            return cpu
+
+        def migrate(src: CPU, dst: CPU):
+            dst.queue.append(src.queue.popleft())
+            cpus.updated(src)
+            cpus.updated(dst)
+            if stats is not None:
+                stats.migrations += 1
+                stats.dequeue()
+                stats.enqueue(len(dst.queue))
+
+        def dispatch(cpu: CPU, t: int):
+            queue = cpu.queue
+            if cpu.current is not None:
+                if stats is not None:
+                    if queue:
+                        stats.preemptions += 1
+                    stats.enqueue(len(queue) + 1)
+                queue.append(cpu.current)
+                cpu.current = None
+            if not queue:
+                src = cpus.busiest(exclude=cpu)
+                if src is None:
+                    cpus.updated(cpu)
+                    return
+                migrate(src, cpu)
+
+            pid = queue.popleft()
+            if stats is not None:
+                if cpu.idle_since is not None and t > cpu.idle_since:
+                    stats.idle(t - cpu.idle_since, cpu.index)
+                stats.dequeue()
+                stats.dispatch(pid, cpu.index)
+            cpu.idle_since = None
+            if response_time[pid] == -1:
+                start_time[pid] = t
+                response_time[pid] = t - arrival_time[pid]
+
+            cpu.current = pid
+            cpu.clock = t
+            cpus.schedule_event(cpu, t + min(time_slice, remaining_time[pid]))
+            cpus.updated(cpu)
 
-                process.turnaround_time = process.completion_time - process.arrival_time
-                process.waiting_time = process.turnaround_time - process.duration
-                
-                completed_count += 1
\ No newline at end of file
+        # nothing to balance on a single CPU
+        balance_interval = self.balance_interval if len(cpus) > 1 else 0
+        return EventLoop(cpus, arrival_time, arrivals, balance_interval, end_step, arrive, dispatch, migrate)
@@ -1,11 +1,130 @@
 from abc import ABC, abstractmethod
-from typing import List, Any
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Any, Optional, Tuple, Union
 from process import Process
+from process_table import ProcessTable
+from execution_trace import ExecutionTrace
+from scheduler_stats import SchedulerStats
+
+if TYPE_CHECKING:
+    from metrics_sink import MetricsSink
+    from scheduler.online import OnlineScheduler
+    from scheduler.smp import EventLoop
+
+# a job from a trace: (pid, arrival_time, duration, weight)
+Job = Tuple[str, int, int, float]
 
 class Scheduler(ABC):
+    # FCFS / SJF / Priority break arrival ties by pid name, RR / CFS keep the input order
+    ARRIVAL_BY_NAME = False
+    # FCFS / SJF / Priority have always returned their execution schedule from schedule(list)
+    RETURNS_SCHEDULE = False
+
+    def schedule(self, processes: Union[List[Process], ProcessTable], sink: Optional["MetricsSink"] = None,
+                 trace: Optional[ExecutionTrace] = None,
+                 stats: Optional[SchedulerStats] = None) -> Union[ExecutionTrace, List[Dict], None]:
+        """
+        run the scheduler over a list of Process objects or a ProcessTable.
+        a list is packed into a table and the results are written back onto the objects.
+        the finished processes are recorded into sink if given (see metrics_sink.MetricsSink),
+        the CPU timeline into trace and the dispatch counters into stats if given, trace is returned.
+        a list without a trace returns the execution schedule instead for schedulers with
+        RETURNS_SCHEDULE, see ExecutionTrace.as_dicts.
+        """
+        if isinstance(processes, ProcessTable):
+            return self.schedule_table(processes, sink, trace, stats)
+
+        table = ProcessTable.from_processes(processes)
+        if trace is None and self.RETURNS_SCHEDULE:
+            schedule = ExecutionTrace()
+            self.schedule_table(table, sink, schedule, stats)
+            table.store(processes)
+            return schedule.as_dicts(table)
+        self.schedule_table(table, sink, trace, stats)
+        table.store(processes)
+        return trace
+
+    def schedule_table(self, table: ProcessTable, sink: Optional["MetricsSink"] = None,
+                       trace: Optional[ExecutionTrace] = None,
+                       stats: Optional[SchedulerStats] = None) -> Optional[ExecutionTrace]:
+        self.run(table, iter(table.arrival_order(self.ARRIVAL_BY_NAME)), trace=trace, stats=stats)
+        if sink is not None:
+            sink.record_table(table)
+        return trace
+
+    def schedule_stream(self, jobs: Iterable[Job], on_complete: Optional[Callable[[Process], Any]] = None,
+                        sink: Optional["MetricsSink"] = None, stats: Optional[SchedulerStats] = None) -> int:
+        """
+        run the scheduler over jobs that are read lazily, in arrival order (see trace_io.read_trace).
+        only processes that have arrived and not finished are held in memory, each finished
+        process is recorded into sink, passed to on_complete as a Process and then forgotten.
+        returns the number of completed processes.
+        """
+        table = ProcessTable(names=[])
+        completed = 0
+
+        def finish(pid):
+            nonlocal completed
+            completed += 1
+            if sink is not None:
+                sink.record_row(table, pid)
+            if on_complete is not None:
+                on_complete(table.process(pid))
+            table.release(pid)
+
+        self.run(table, stream_arrivals(table, jobs, self.ARRIVAL_BY_NAME), finish, stats=stats)
+        return completed
+
+    def online(self, on_complete: Optional[Callable[[Process], Any]] = None, sink: Optional["MetricsSink"] = None,
+               stats: Optional[SchedulerStats] = None) -> "OnlineScheduler":
+        """
+        incremental interface: jobs are submitted one by one and the schedule is simulated as far
+        as asked, see scheduler/online.py.
+        """
+        from scheduler.online import OnlineScheduler
+        return OnlineScheduler(self, on_complete, sink, stats)
+
+    def event_loop(self, table: ProcessTable, arrivals: Iterator[int], on_complete: Optional[Callable[[int], Any]] = None,
+                   trace: Optional[ExecutionTrace] = None, stats: Optional[SchedulerStats] = None) -> "EventLoop":
+        """
+        the scheduler as a resumable event loop (see scheduler/smp.py), same arguments as run().
+        loop.run(until) simulates everything before until, so the online API can stop anywhere.
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} has no event loop")
+
     @abstractmethod
-    def schedule(self, processes: List[Process]):
+    def run(self, table: ProcessTable, arrivals: Iterator[int], on_complete: Optional[Callable[[int], Any]] = None,
+            trace: Optional[ExecutionTrace] = None, stats: Optional[SchedulerStats] = None):
         """
-        just signature for scheduler
+        core loop of the scheduler.
+        arrivals yields the pids of the table in arrival order, it may add the rows lazily.
+        on_complete(pid) is called as soon as the result columns of pid are final.
+        every stretch of CPU time is recorded into trace, dispatches, idle gaps and ready queue
+        operations into stats, when they are given.
         """
         pass
+
+def stream_arrivals(table: ProcessTable, jobs: Iterable[Job], by_name: bool = False) -> Iterator[int]:
+    # admit jobs into the table one by one, jobs that arrive together are sorted by pid name
+    # when by_name is set so the order matches ProcessTable.arrival_order
+    group = []
+    group_arrival = None
+    for job in jobs:
+        arrival_time = job[1]
+        if group_arrival is not None and arrival_time < group_arrival:
+            raise ValueError(f"jobs must be sorted by arrival time, {job[0]!r} arrives at {arrival_time} "
+                             f"after a job arriving at {group_arrival}")
+        if not by_name:
+            group_arrival = arrival_time
+            yield table.admit(*job)
+            continue
+        if group and arrival_time != group_arrival:
+            group.sort(key=lambda queued: queued[0])
+            for queued in group:
+                yield table.admit(*queued)
+            group = []
+        group_arrival = arrival_time
+        group.append(job)
+
+    group.sort(key=lambda queued: queued[0])
+    for queued in group:
+        yield table.admit(*queued)
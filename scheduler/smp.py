@@ -0,0 +1,216 @@
+import heapq
+from typing import Callable, List, Optional
+
+# Multi-CPU support shared by the SMP modes of RoundRobin and CFS, and the event engines behind
+# the online API (scheduler/online.py).
+# Every CPU has its own ready queue and runs its own process. Time only advances from one event
+# to the next (a slice expiry or completion on some CPU, an arrival, a periodic balance), so the
+# cost is per event and never per tick per CPU:
+#   - an arriving process goes to the least loaded CPU, idle CPUs first, ties to the lowest index
+#   - a CPU that would go idle pulls a waiting process from the busiest CPU
+#   - every balance_interval ms, while some process is waiting, processes move from the most
+#     to the least loaded CPUs until no two differ by more than one
+
+INFINITY = float("inf")
+
+class CPU:
+    __slots__ = ("index", "queue", "current", "clock", "event_time", "slice_remaining", "slice_vruntime",
+                 "slice_ran", "min_vruntime", "idle_since")
+
+    def __init__(self, index: int, queue):
+        self.index = index
+        self.queue = queue
+        # running process, None when idle
+        self.current = None
+        # time up to which the current process has been accounted for
+        self.clock = 0
+        # time of the next slice expiry or completion, None when idle
+        self.event_time = None
+        self.slice_remaining = 0
+        # CFS only: vruntime of the current process at dispatch, ms run since, queue min_vruntime
+        self.slice_vruntime = 0.0
+        self.slice_ran = 0
+        self.min_vruntime = 0.0
+        self.idle_since = None
+
+    def __repr__(self):
+        return f"CPU({self.index}, current={self.current}, queued={len(self.queue)})"
+
+    def load(self) -> int:
+        return len(self.queue) + (self.current is not None)
+
+class CPUSet:
+    def __init__(self, count: int, make_queue: Callable):
+        if count < 1:
+            raise ValueError("at least one CPU is needed")
+        self.cpus = [CPU(i, make_queue()) for i in range(count)]
+        # lazy min-heap of (load, index), entries whose load is out of date are skipped
+        self._loads = [(0, i) for i in range(count)]
+        # indexes of CPUs with processes waiting in their queue
+        self.overloaded = set()
+        # min-heap of (event time, index), stale entries are skipped
+        self._events = []
+
+    def __len__(self):
+        return len(self.cpus)
+
+    # must be called whenever the queue or the current process of cpu changes
+    def updated(self, cpu: CPU):
+        heapq.heappush(self._loads, (cpu.load(), cpu.index))
+        if len(self._loads) > 4 * len(self.cpus) + 64:
+            self._loads = [(c.load(), c.index) for c in self.cpus]
+            heapq.heapify(self._loads)
+        if cpu.queue:
+            self.overloaded.add(cpu.index)
+        else:
+            self.overloaded.discard(cpu.index)
+
+    def place(self) -> CPU:
+        loads = self._loads
+        while True:
+            load, index = loads[0]
+            if self.cpus[index].load() == load:
+                return self.cpus[index]
+            heapq.heappop(loads)
+
+    def busiest(self, exclude: Optional[CPU] = None) -> Optional[CPU]:
+        best = None
+        for index in self.overloaded:
+            cpu = self.cpus[index]
+            if cpu is exclude:
+                continue
+            if best is None or (len(cpu.queue), -cpu.index) > (len(best.queue), -best.index):
+                best = cpu
+        return best
+
+    def schedule_event(self, cpu: CPU, time: int):
+        cpu.event_time = time
+        heapq.heappush(self._events, (time, cpu.index))
+
+    def next_event_time(self):
+        events = self._events
+        while events:
+            time, index = events[0]
+            if self.cpus[index].event_time == time:
+                return time
+            heapq.heappop(events)
+        return INFINITY
+
+    # CPUs whose slice expiry or completion is at time, in index order
+    def pop_events(self, time: int) -> List[CPU]:
+        due = []
+        events = self._events
+        while events and events[0][0] == time:
+            _, index = heapq.heappop(events)
+            cpu = self.cpus[index]
+            if cpu.event_time == time:
+                cpu.event_time = None
+                due.append(cpu)
+        due.sort(key=lambda cpu: cpu.index)
+        return due
+
+    def balance(self, migrate: Callable[[CPU, CPU], None]) -> List[CPU]:
+        """
+        move waiting processes from the most to the least loaded CPUs, migrate(src, dst) moves one.
+        returns the CPUs that were idle and received work.
+        """
+        cpus = self.cpus
+        # min-heap of candidate destinations and max-heap of sources, refreshed lazily as loads change
+        lows = [(cpu.load(), cpu.index) for cpu in cpus]
+        highs = [(-cpus[index].load(), index) for index in self.overloaded]
+        heapq.heapify(lows)
+        heapq.heapify(highs)
+        woken = []
+        while highs:
+            load, index = highs[0]
+            src = cpus[index]
+            if not src.queue:
+                heapq.heappop(highs)
+                continue
+            if -load != src.load():
+                heapq.heapreplace(highs, (-src.load(), index))
+                continue
+            load, index = lows[0]
+            dst = cpus[index]
+            if load != dst.load():
+                heapq.heapreplace(lows, (dst.load(), index))
+                continue
+            if src.load() - dst.load() <= 1:
+                break
+            if dst.current is None and not dst.queue:
+                woken.append(dst)
+            migrate(src, dst)
+            heapq.heapreplace(lows, (dst.load(), index))
+        return woken
+
+class EventLoop:
+    """
+    event loop of the SMP modes. at every event time, in this order:
+      end_step(cpu, t)  for each CPU whose slice expires or process completes at t
+      arrive(pid, t)    for each process arriving at t, returns the CPU it was queued on
+      periodic balancing when t is a balance time
+      dispatch(cpu, t)  for each CPU that has to pick a process (slice over, completion, idle CPU
+                        that just got work), in index order
+    so with one CPU the order is the same as in the single CPU engines.
+    run(until) stops before the first event at or after until and picks up from there on the next
+    call, arrivals is polled again then if it ran dry (see scheduler/online.py).
+    """
+
+    def __init__(self, cpus: CPUSet, arrival_time, arrivals, balance_interval: int, end_step: Callable,
+                 arrive: Callable, dispatch: Callable, migrate: Callable):
+        self.cpus = cpus
+        self.arrival_time = arrival_time
+        self.arrivals = arrivals
+        self.balance_interval = balance_interval
+        self.end_step = end_step
+        self.arrive = arrive
+        self.dispatch = dispatch
+        self.migrate = migrate
+        # time of the last event handled
+        self.now = 0
+        self.next_pid = None
+
+    def run(self, until: float = INFINITY):
+        cpus = self.cpus
+        arrival_time = self.arrival_time
+        arrivals = self.arrivals
+        balance_interval = self.balance_interval
+        end_step, arrive, dispatch = self.end_step, self.arrive, self.dispatch
+        next_pid = self.next_pid
+        if next_pid is None:
+            next_pid = next(arrivals, None)
+        now = self.now
+        pending = set()
+        while True:
+            t = cpus.next_event_time()
+            if next_pid is not None and arrival_time[next_pid] < t:
+                t = arrival_time[next_pid]
+            balancing = False
+            if balance_interval and cpus.overloaded:
+                balance_time = (now // balance_interval + 1) * balance_interval
+                if balance_time <= t:
+                    t = balance_time
+                    balancing = True
+            if t >= until or t == INFINITY:
+                break
+            now = t
+
+            for cpu in cpus.pop_events(t):
+                end_step(cpu, t)
+                pending.add(cpu.index)
+
+            while next_pid is not None and arrival_time[next_pid] <= t:
+                cpu = arrive(next_pid, t)
+                if cpu.current is None:
+                    pending.add(cpu.index)
+                next_pid = next(arrivals, None)
+
+            if balancing:
+                for cpu in cpus.balance(self.migrate):
+                    pending.add(cpu.index)
+
+            for index in sorted(pending):
+                dispatch(cpus.cpus[index], t)
+            pending.clear()
+        self.next_pid = next_pid
+        self.now = now
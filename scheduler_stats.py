@@ -0,0 +1,120 @@
+from array import array
+from typing import Dict, List
+
+class SchedulerStats:
+    """
+    counters filled by a scheduler run when passed to Scheduler.schedule(stats=...),
+    schedulers skip all of this when there is none.
+      dispatches        times a process was picked to run (a process picked again right after its own
+                        slice counts, it is a scheduling decision but not a new run)
+      context_switches  the CPU went straight from one process to a different one
+      preemptions       a process with work left lost the CPU to another process
+      idle_time         ms the CPU had nothing to run after the first dispatch
+      runqueue_ops      inserts into and removals from the ready queue (FCFS has none)
+      vruntime_ties     CFS inserts whose vruntime equals one already queued, ordered by insertion
+      peak_runqueue     largest number of processes waiting in the ready queue
+      runs              per pid, how many separate times it got the CPU
+    SMP runs (RoundRobin / CFS with cpus > 1) also fill
+      migrations        processes moved to another CPU by idle pulls or periodic balancing
+      cpu_busy          per CPU, ms spent running processes
+    context switches, runs and idle time are then counted per CPU, peak_runqueue is the longest
+    single CPU queue.
+    """
+
+    def __init__(self):
+        self.dispatches = 0
+        self.context_switches = 0
+        self.preemptions = 0
+        self.idle_time = 0
+        self.runqueue_ops = 0
+        self.vruntime_ties = 0
+        self.peak_runqueue = 0
+        self.runs = array('q')
+        self.migrations = 0
+        self.cpu_busy = array('q')
+        # per CPU, process that held it last (None after an idle gap) and whether it finished
+        self.last_pid = [None]
+        self.last_done = [False]
+
+    def __repr__(self):
+        return (f"SchedulerStats(dispatches={self.dispatches}, context_switches={self.context_switches}, "
+                f"preemptions={self.preemptions}, idle_time={self.idle_time})")
+
+    def dispatch(self, pid: int, cpu: int = 0):
+        self.dispatches += 1
+        last_pid = self.last_pid
+        if cpu >= len(last_pid):
+            self.add_cpus(cpu + 1)
+        if pid == last_pid[cpu] and not self.last_done[cpu]:
+            return
+        if last_pid[cpu] is not None:
+            self.context_switches += 1
+        runs = self.runs
+        if pid >= len(runs):
+            runs.extend([0] * (pid + 1 - len(runs)))
+        runs[pid] += 1
+        last_pid[cpu] = pid
+        self.last_done[cpu] = False
+
+    def complete(self, pid: int, cpu: int = 0):
+        self.last_done[cpu] = True
+
+    def idle(self, gap: int, cpu: int = 0):
+        if self.dispatches:
+            self.idle_time += gap
+        self.last_pid[cpu] = None
+
+    def rotations(self, pids: List[int], count: int, cpu: int = 0):
+        # count round robin rotations over pids in queue order, every process running a full slice
+        # and going back to the queue (RoundRobin.skip_rotations)
+        if count <= 0 or not pids:
+            return
+        for pid in pids:
+            self.dispatch(pid, cpu)
+        rest = count - 1
+        self.dispatches += rest * len(pids)
+        self.runqueue_ops += 2 * count * len(pids)
+        if len(pids) > 1:
+            # every slice is a switch to another process and a new run
+            self.context_switches += rest * len(pids)
+            self.preemptions += count * len(pids)
+            for pid in pids:
+                self.runs[pid] += rest
+        if len(pids) > self.peak_runqueue:
+            self.peak_runqueue = len(pids)
+
+    def add_cpus(self, count: int):
+        extra = count - len(self.last_pid)
+        if extra > 0:
+            self.last_pid.extend([None] * extra)
+            self.last_done.extend([False] * extra)
+        if count > len(self.cpu_busy):
+            self.cpu_busy.extend([0] * (count - len(self.cpu_busy)))
+
+    # fraction of the makespan each CPU was busy (SMP runs)
+    def cpu_utilization(self, makespan: int) -> List[float]:
+        return [busy / makespan if makespan > 0 else 0.0 for busy in self.cpu_busy]
+
+    def enqueue(self, queue_length: int):
+        # queue_length is the length after the insert
+        self.runqueue_ops += 1
+        if queue_length > self.peak_runqueue:
+            self.peak_runqueue = queue_length
+
+    def dequeue(self):
+        self.runqueue_ops += 1
+
+    def runs_per_process(self, n: int) -> List[int]:
+        return [self.runs[pid] if pid < len(self.runs) else 0 for pid in range(n)]
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "dispatches": self.dispatches,
+            "context_switches": self.context_switches,
+            "preemptions": self.preemptions,
+            "idle_time": self.idle_time,
+            "runqueue_ops": self.runqueue_ops,
+            "vruntime_ties": self.vruntime_ties,
+            "peak_runqueue": self.peak_runqueue,
+            "migrations": self.migrations,
+        }
@@ -0,0 +1,139 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import random
+import unittest
+from process import Process
+from scheduler.cfs import CFS
+from test_cases import (
+    get_test_case_1,
+    get_test_case_2,
+    get_test_case_3,
+    get_test_case_4,
+    get_test_case_5,
+    get_test_case_7
+)
+from scheduler_test.helpers import random_processes
+
+def snapshot(processes):
+    return [(p.pid, p.start_time, p.completion_time, p.response_time, p.waiting_time, p.turnaround_time)
+            for p in processes]
+
+class TestCFS(unittest.TestCase):
+
+    def test_basic(self):
+        # a short job fits in its slice so equal jobs run back to back
+        processes = [
+            Process("A", 0, 4),
+            Process("B", 0, 4),
+            Process("C", 0, 4)
+        ]
+        cfs = CFS()
+        cfs.schedule(processes)
+
+        self.assertEqual(processes[0].completion_time, 4)
+        self.assertEqual(processes[1].completion_time, 8)
+        self.assertEqual(processes[2].completion_time, 12)
+        self.assertEqual(processes[1].response_time, 4)
+        self.assertEqual(processes[2].response_time, 8)
+
+    def test_time_sharing(self):
+        # two runnable processes split the 20 ms target latency
+        processes = [
+            Process("A", 0, 40),
+            Process("B", 0, 40)
+        ]
+        cfs = CFS()
+        cfs.schedule(processes)
+
+        self.assertEqual(processes[0].completion_time, 70)
+        self.assertEqual(processes[1].completion_time, 80)
+        self.assertEqual(processes[1].response_time, 10)
+
+    def test_weighted_share(self):
+        # B has twice the weight so its vruntime grows at half the speed
+        processes = [
+            Process("A", 0, 12, 1),
+            Process("B", 0, 12, 2)
+        ]
+        cfs = CFS()
+        cfs.schedule(processes)
+
+        self.assertEqual(processes[1].completion_time, 22)
+        self.assertEqual(processes[0].completion_time, 24)
+
+    def test_cpu_idle_period(self):
+        processes = [
+            Process("A", 0, 5),
+            Process("B", 20, 3)
+        ]
+        cfs = CFS()
+        cfs.schedule(processes)
+
+        self.assertEqual(processes[0].completion_time, 5)
+        self.assertEqual(processes[1].completion_time, 23)
+        self.assertEqual(processes[1].response_time, 0)
+
+    def test_zero_burst_time_takes_one_tick(self):
+        processes = [
+            Process("A", 0, 0),
+            Process("B", 0, 3)
+        ]
+        cfs = CFS()
+        cfs.schedule(processes)
+
+        self.assertEqual(processes[0].completion_time, 1)
+        self.assertEqual(processes[1].completion_time, 4)
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            CFS(mode="sometimes")
+
+    def test_event_engine_matches_tick_engine(self):
+        workloads = [get_test_case_1(), get_test_case_2(), get_test_case_3(), get_test_case_4(),
+                     get_test_case_5(), get_test_case_7()]
+        workloads += [random_processes(seed, n=30, span=300, max_duration=60, weights=[1, 2, 3, 5])
+                      for seed in range(20)]
+        configs = [
+            dict(latency_buffer=10),
+            dict(latency_buffer=-1),
+            dict(latency_buffer=3, target_latency=7, min_time_slice=0.5),
+        ]
+
+        for processes in workloads:
+            for config in configs:
+                ticked = [Process(p.pid, p.arrival_time, p.duration, p.weight) for p in processes]
+                evented = [Process(p.pid, p.arrival_time, p.duration, p.weight) for p in processes]
+                CFS(mode="tick", **config).schedule(ticked)
+                CFS(mode="event", **config).schedule(evented)
+
+                self.assertEqual(snapshot(ticked), snapshot(evented))
+                self.assertEqual([p.vruntime for p in ticked], [p.vruntime for p in evented])
+
+    def test_fluid_mode_shares_by_weight(self):
+        processes = [Process("A", 0, 10, 2), Process("B", 0, 10, 1), Process("C", 30, 5, 1)]
+        CFS(mode="fluid").schedule(processes)
+
+        # A gets 2/3 of the CPU until it finishes at 15, B then runs its last 5 ms alone
+        self.assertEqual([p.completion_time for p in processes], [15, 20, 35])
+        self.assertEqual([p.response_time for p in processes], [0, 0, 0])
+        self.assertEqual([p.waiting_time for p in processes], [5, 10, 0])
+
+        with self.assertRaises(ValueError):
+            CFS(mode="fluid", cpus=2)
+
+    def test_fluid_mode_close_to_exact_for_long_jobs(self):
+        rng = random.Random(3)
+        jobs = [(f"P{i}", rng.randint(0, 20000), rng.randint(200, 2000), rng.choice([1, 2, 3])) for i in range(60)]
+        exact = [Process(*job) for job in jobs]
+        fluid = [Process(*job) for job in jobs]
+        CFS().schedule(exact)
+        CFS(mode="fluid").schedule(fluid)
+
+        mean_exact = sum(p.turnaround_time for p in exact) / len(exact)
+        mean_fluid = sum(p.turnaround_time for p in fluid) / len(fluid)
+        self.assertLess(abs(mean_fluid - mean_exact) / mean_exact, 0.05)
+        self.assertTrue(all(p.completion_time >= p.arrival_time + p.duration for p in fluid))
+
+if __name__ == '__main__':
+    unittest.main()
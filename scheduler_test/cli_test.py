@@ -0,0 +1,57 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import contextlib
+import io
+import subprocess
+import tempfile
+import unittest
+import cli
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+def run_cli(args):
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        code = cli.main(args)
+    return code, out.getvalue()
+
+class TestCLI(unittest.TestCase):
+
+    def test_run_and_print_tables(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            results = os.path.join(tmp, "results")
+            code, out = run_cli(["run", "--scheduler", "RoundRobin", "time_slice=2,10", "--no-cache",
+                                 "--workers", "1", "--results", results])
+            self.assertEqual(code, 0)
+            self.assertIn("RoundRobin(time_slice=2)", out)
+            self.assertIn("RoundRobin(time_slice=10)", out)
+
+            code, out = run_cli(["table", results, "--print"])
+            self.assertEqual(code, 0)
+            self.assertEqual(out.count("RoundRobin(time_slice=10)"), 7)
+
+    def test_repeated_scheduler(self):
+        code, out = run_cli(["run", "--scheduler", "CFS", "latency_buffer=10", "--scheduler", "CFS",
+                             "latency_buffer=-1", "--no-cache", "--workers", "1"])
+        self.assertEqual(code, 0)
+        self.assertIn("CFS(latency_buffer=10)", out)
+        self.assertIn("CFS(latency_buffer=-1)", out)
+
+    def test_bad_scheduler(self):
+        with contextlib.redirect_stderr(io.StringIO()):
+            self.assertEqual(cli.main(["run", "--scheduler", "Lottery", "--no-cache"]), 2)
+            self.assertEqual(cli.main(["run", "--scheduler", "FCFS", "quantum=3", "--no-cache"]), 2)
+
+    def test_headless_run_skips_plotting_stack(self):
+        code = ("import sys, cli; cli.main(['run', '--scheduler', 'FCFS', '--no-cache', '--workers', '1']); "
+                "print(sorted({m.split('.')[0] for m in sys.modules} & {'matplotlib', 'pandas'}))")
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+        self.assertEqual(out.strip().splitlines()[-1], "[]")
+
+        code = "import sys, cli; print('numpy' in sys.modules)"
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+        self.assertEqual(out.strip(), "False")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,10 @@
 import sys, os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+import random
 import unittest
 from process import Process
+from process_table import ProcessTable
 from scheduler.fcfs import FCFS
 
 class TestFCFS(unittest.TestCase):
@@ -143,5 +145,28 @@ class TestFCFS(unittest.TestCase):
         self.assertEqual(processes[0].response_time, 0)
         self.assertEqual(processes[0].waiting_time, 0)
 
+    def test_vectorized_matches_scalar(self):
+        rng = random.Random(5)
+        for _ in range(30):
+            n = rng.randint(1, 40)
+            jobs = [(f"P{i+1}", rng.randint(0, 50), rng.randint(0, 8)) for i in range(n)]
+            scalar = [Process(*job) for job in jobs]
+            vectorized = [Process(*job) for job in jobs]
+            FCFS().schedule(scalar)
+            FCFS(vectorized=True).schedule(vectorized)
+
+            for a, b in zip(scalar, vectorized):
+                self.assertEqual(
+                    (a.start_time, a.completion_time, a.response_time, a.waiting_time, a.turnaround_time, a.remaining_time),
+                    (b.start_time, b.completion_time, b.response_time, b.waiting_time, b.turnaround_time, b.remaining_time))
+
+    def test_vectorized_sorted_table(self):
+        table = ProcessTable.from_columns([0, 1, 1, 20], [5, 3, 0, 2], [1, 1, 1, 1])
+        FCFS(vectorized=True).schedule(table)
+
+        self.assertEqual(list(table.start_time), [0, 5, 8, 20])
+        self.assertEqual(list(table.completion_time), [5, 8, 8, 22])
+        self.assertEqual(list(table.waiting_time), [0, 4, 7, 0])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,28 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import random
+from typing import List, Sequence
+from process import Process
+
+# Process factories shared by the tests. Every call builds fresh objects, the schedulers write
+# their results onto them.
+
+def random_processes(seed: int, n: int = 80, span: int = 600, min_duration: int = 0, max_duration: int = 40,
+                     weights: Sequence[float] = (1, 2, 3), sort: bool = False) -> List[Process]:
+    # P1..Pn arriving uniformly in [0, span], durations in [min_duration, max_duration],
+    # sort=True returns them in arrival order (stable) for the streaming APIs
+    rng = random.Random(seed)
+    processes = [Process(f"P{i+1}", rng.randint(0, span), rng.randint(min_duration, max_duration), rng.choice(weights))
+                 for i in range(n)]
+    return sorted(processes, key=lambda p: p.arrival_time) if sort else processes
+
+def sample_processes() -> List[Process]:
+    # small hand-checked workload: two arrivals tie out of name order, then an idle gap
+    return [
+        Process("B", 4, 3, 1),
+        Process("A", 4, 2, 2),
+        Process("C", 0, 6, 1),
+        Process("D", 9, 1, 3),
+        Process("E", 30, 6, 2)
+    ]
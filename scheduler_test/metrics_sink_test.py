@@ -0,0 +1,81 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import numpy as np
+from process_table import ProcessTable
+from metrics import compute_metrics, TIME_METRICS
+from metrics_sink import MetricsSink, QuantileSketch
+from scheduler.fcfs import FCFS
+from scheduler.round_robin import RoundRobin
+from scheduler.cfs import CFS
+from scheduler_test.helpers import random_processes
+
+class TestMetricsSink(unittest.TestCase):
+
+    def check_summary(self, summary, expected, values):
+        self.assertEqual(summary["count"], expected["count"])
+        self.assertEqual(summary["makespan"], expected["makespan"])
+        self.assertAlmostEqual(summary["throughput"], expected["throughput"])
+        for name in TIME_METRICS:
+            self.assertAlmostEqual(summary[name]["mean"], expected[name]["mean"])
+            self.assertAlmostEqual(summary[name]["max"], expected[name]["max"])
+            self.assertAlmostEqual(summary[name]["jain"], expected[name]["jain"])
+            self.assertAlmostEqual(summary[name]["variance"], float(np.var(values[name])), places=6)
+            for q in (50, 95, 99):
+                # within 1% of the value of rank q among the recorded ones
+                lower = np.percentile(values[name], q, method="lower")
+                higher = np.percentile(values[name], q, method="higher")
+                self.assertGreaterEqual(summary[name][f"p{q}"], lower * 0.99)
+                self.assertLessEqual(summary[name][f"p{q}"], higher * 1.01)
+
+    def test_stream_matches_batch(self):
+        processes = random_processes(1, n=300, span=3000, min_duration=1, sort=True)
+        jobs = [(p.pid, p.arrival_time, p.duration, p.weight) for p in processes]
+        for scheduler in [FCFS(), FCFS(vectorized=True), RoundRobin(time_slice=5), CFS()]:
+            table = ProcessTable.from_processes(processes)
+            batch_sink = MetricsSink()
+            scheduler.schedule(table, sink=batch_sink)
+            expected = compute_metrics(table)
+            values = {name: table.numpy_column(f"{name}_time") for name in TIME_METRICS}
+            self.check_summary(batch_sink.summary(), expected, values)
+
+            if scheduler.__class__ is FCFS and scheduler.vectorized:
+                continue
+            stream_sink = MetricsSink()
+            self.assertEqual(scheduler.schedule_stream(iter(jobs), sink=stream_sink), len(jobs))
+            self.check_summary(stream_sink.summary(), expected, values)
+
+    def test_merge(self):
+        processes = random_processes(2, n=300, span=3000, min_duration=1, sort=True)
+        table = ProcessTable.from_processes(processes)
+        CFS().schedule(table)
+
+        whole = MetricsSink()
+        whole.record_table(table)
+        left, right = MetricsSink(), MetricsSink()
+        for pid in range(len(table)):
+            (left if pid % 3 else right).record_row(table, pid)
+        left.merge(right)
+
+        merged, expected = left.summary(), whole.summary()
+        self.assertEqual(merged["count"], expected["count"])
+        self.assertEqual(merged["makespan"], expected["makespan"])
+        for name in TIME_METRICS:
+            for key, value in expected[name].items():
+                self.assertAlmostEqual(merged[name][key], value, places=6)
+
+    def test_sketch(self):
+        sketch = QuantileSketch(0.01)
+        for x in [0, -3, 5, 5, 100]:
+            sketch.add(x)
+        self.assertAlmostEqual(sketch.quantile(0), -3, delta=0.03)
+        self.assertEqual(sketch.quantile(0.25), 0)
+        self.assertAlmostEqual(sketch.quantile(0.5), 5, delta=0.05)
+        self.assertAlmostEqual(sketch.quantile(1), 100, delta=1)
+        self.assertEqual(MetricsSink().summary()["count"], 0)
+        with self.assertRaises(ValueError):
+            sketch.merge(QuantileSketch(0.05))
+
+if __name__ == '__main__':
+    unittest.main()
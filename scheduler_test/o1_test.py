@@ -0,0 +1,142 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+from collections import deque
+from process import Process
+from execution_trace import ExecutionTrace
+from scheduler_stats import SchedulerStats
+from scheduler.o1 import O1Scheduler, PriorityArray, RunQueue
+from scheduler_test.helpers import random_processes
+
+WORKLOAD = dict(weights=[0.5, 1, 2, 3])
+
+def tick_reference(processes, scheduler):
+    # the O(1) rules one ms at a time with plain lists, for comparison with the event engine
+    order = sorted(range(len(processes)), key=lambda i: processes[i].arrival_time)
+    remaining = [p.duration for p in processes]
+    start = [-1] * len(processes)
+    completion = [0] * len(processes)
+    slice_left = {}
+    active = [deque() for _ in range(40)]
+    expired = [deque() for _ in range(40)]
+    priority = lambda i: scheduler.level(processes[i].weight)[0]
+    current, t, k, done = None, 0, 0, 0
+    while done < len(processes):
+        while k < len(order) and processes[order[k]].arrival_time <= t:
+            i = order[k]
+            k += 1
+            slice_left[i] = scheduler.level(processes[i].weight)[1]
+            active[priority(i)].append(i)
+            if current is not None and priority(i) < priority(current):
+                active[priority(current)].appendleft(current)
+                current = None
+        while current is None or remaining[current] == 0:
+            if current is not None:
+                completion[current] = t
+                done += 1
+                current = None
+                if done == len(processes):
+                    break
+            if not any(active):
+                active, expired = expired, active
+            if not any(active):
+                break
+            current = next(queue for queue in active if queue).popleft()
+            if start[current] == -1:
+                start[current] = t
+        if current is not None and remaining[current] > 0:
+            remaining[current] -= 1
+            slice_left[current] -= 1
+            if remaining[current] == 0:
+                completion[current] = t + 1
+                done += 1
+                current = None
+            elif slice_left[current] == 0:
+                slice_left[current] = scheduler.level(processes[current].weight)[1]
+                expired[priority(current)].append(current)
+                current = None
+        t += 1
+    return [(start[i], completion[i]) for i in range(len(processes))]
+
+class TestO1(unittest.TestCase):
+
+    def test_priority_array(self):
+        array = PriorityArray()
+        for pid, priority in [(1, 20), (2, 5), (3, 20), (4, 39), (5, 5)]:
+            array.push(pid, priority)
+        array.push(6, 20, front=True)
+        self.assertEqual(array.highest(), 5)
+        self.assertEqual([array.pop() for _ in range(len(array))], [2, 5, 6, 1, 3, 4])
+        self.assertEqual(array.highest(), -1)
+        self.assertEqual(array.bitmap, 0)
+
+    def test_arrays_swap_when_active_is_empty(self):
+        rq = RunQueue()
+        rq.expired.push(1, 10)
+        rq.active.push(2, 30)
+        self.assertEqual(rq.pop(), 2)
+        self.assertEqual(rq.pop(), 1)
+        self.assertEqual(rq.swaps, 1)
+
+    def test_weight_levels(self):
+        scheduler = O1Scheduler()
+        self.assertEqual(scheduler.level(1), (20, 100))
+        # higher weight, better priority and a longer slice
+        self.assertEqual(scheduler.level(2), (17, 460))
+        self.assertEqual(scheduler.level(0.5), (23, 85))
+        self.assertEqual(scheduler.level(10**6), (0, 800))
+        self.assertEqual(scheduler.level(10**-6), (39, 5))
+        self.assertEqual(O1Scheduler(base_time_slice=10).level(1), (20, 10))
+
+    def test_matches_tick_reference(self):
+        for base_time_slice in [10, 3]:
+            for preempt in [True, False]:
+                scheduler = O1Scheduler(base_time_slice=base_time_slice, preempt=preempt)
+                for seed in range(4):
+                    processes = random_processes(seed, **WORKLOAD)
+                    expected = tick_reference(processes, scheduler) if preempt else None
+                    trace, stats = ExecutionTrace(), SchedulerStats()
+                    scheduler.schedule(processes, trace=trace, stats=stats)
+                    for p in processes:
+                        self.assertEqual(p.completion_time - p.arrival_time, p.turnaround_time)
+                        self.assertEqual(p.turnaround_time - p.duration, p.waiting_time)
+                        self.assertGreaterEqual(p.start_time, p.arrival_time)
+                    if expected is not None:
+                        self.assertEqual([(p.start_time, p.completion_time) for p in processes], expected)
+                    # the trace covers every ms of work exactly once
+                    busy = sum(length for _, _, length in trace.segments())
+                    self.assertEqual(busy, sum(p.duration for p in processes))
+                    self.assertGreaterEqual(stats.dispatches, len([p for p in processes if p.duration > 0]))
+
+    def test_higher_priority_arrival_preempts(self):
+        processes = [Process("A", 0, 100, 1), Process("B", 10, 20, 3)]
+        O1Scheduler().schedule(processes)
+        a, b = processes
+        self.assertEqual((b.start_time, b.completion_time), (10, 30))
+        self.assertEqual(a.completion_time, 120)
+
+        processes = [Process("A", 0, 100, 1), Process("B", 10, 20, 3)]
+        O1Scheduler(preempt=False).schedule(processes)
+        self.assertEqual(processes[1].start_time, 100)
+
+    def test_expired_processes_wait_for_the_next_round(self):
+        # B and C share a level, A of a worse one only runs once both used their slice
+        processes = [Process("A", 0, 30, 0.5), Process("B", 0, 150, 1), Process("C", 0, 150, 1)]
+        O1Scheduler().schedule(processes)
+        a, b, c = processes
+        self.assertEqual((b.start_time, c.start_time, a.start_time), (0, 100, 200))
+        self.assertEqual(a.completion_time, 230)
+
+    def test_online(self):
+        processes = random_processes(9, **WORKLOAD)
+        batch = [Process(p.pid, p.arrival_time, p.duration, p.weight) for p in processes]
+        O1Scheduler(base_time_slice=10).schedule(batch)
+        online = O1Scheduler(base_time_slice=10).online()
+        for p in sorted(processes, key=lambda p: p.arrival_time):
+            online.submit(p)
+        finished = {p.pid: p.completion_time for p in online.drain()}
+        self.assertEqual(finished, {p.pid: p.completion_time for p in batch})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import random
+import unittest
+from process import Process
+from process_table import ProcessTable
+from execution_trace import ExecutionTrace
+from scheduler_stats import SchedulerStats
+from scheduler.fcfs import FCFS
+from scheduler.sjf import SJF
+from scheduler.priority_scheduler import PriorityScheduler
+from scheduler.round_robin import RoundRobin
+from scheduler.cfs import CFS
+from scheduler_test.helpers import random_processes
+
+WORKLOAD = dict(n=150, span=2000, sort=True)
+
+def schedulers():
+    return [FCFS(), SJF(), PriorityScheduler(), RoundRobin(time_slice=4), CFS(), CFS(mode="tick"),
+            CFS(latency_buffer=-1), RoundRobin(time_slice=3, cpus=3), CFS(cpus=3)]
+
+def results(processes):
+    return {p.pid: (p.start_time, p.completion_time, p.response_time, p.waiting_time) for p in processes}
+
+class TestOnline(unittest.TestCase):
+
+    def batch_results(self, scheduler, processes):
+        processes = [Process(p.pid, p.arrival_time, p.duration, p.weight) for p in processes]
+        scheduler.schedule(processes)
+        return results(processes)
+
+    def test_drain_matches_batch(self):
+        for scheduler in schedulers():
+            for seed in range(2):
+                online = scheduler.online()
+                for p in random_processes(seed, **WORKLOAD):
+                    online.submit(p)
+                finished = online.drain()
+                self.assertEqual(results(finished), self.batch_results(scheduler, random_processes(seed, **WORKLOAD)),
+                                 scheduler)
+                self.assertEqual([p.completion_time for p in finished],
+                                 sorted(p.completion_time for p in finished))
+
+    def test_incremental_matches_batch(self):
+        # jobs trickle in shortly before they arrive, out of order, with decisions asked in between
+        for scheduler in schedulers():
+            for seed in range(3):
+                rng = random.Random(seed)
+                processes = random_processes(seed, **WORKLOAD)
+                online = scheduler.online()
+                finished, submitted = [], []
+                time, i = 0, 0
+                while i < len(processes):
+                    time += rng.randint(1, 60)
+                    window = [p for p in processes[i:] if p.arrival_time < time + 80]
+                    i += len(window)
+                    rng.shuffle(window)
+                    for p in window:
+                        online.submit(p)
+                    submitted += window
+                    if rng.random() < 0.3:
+                        online.pick_next()
+                    finished += online.advance(time)
+                finished += online.drain()
+                # RR / CFS break arrival ties in submission order
+                submitted.sort(key=lambda p: p.arrival_time)
+                self.assertEqual(results(finished), self.batch_results(scheduler, submitted), scheduler)
+
+    def test_pick_next(self):
+        online = CFS().online()
+        self.assertEqual(online.snapshot()["running"], [None])
+        online.submit(("A", 0, 30, 1))
+        self.assertEqual(online.pick_next(), "A")
+        # decisions at time 0 are settled
+        with self.assertRaises(ValueError):
+            online.submit(("B", 0, 10, 1))
+        online.submit(("B", 5, 10, 1))
+        self.assertEqual(online.advance(5), [])
+        # B waits for the end of the 20 ms slice of A
+        self.assertEqual(online.pick_next(), "A")
+        snapshot = online.snapshot()
+        self.assertEqual(snapshot["time"], 5)
+        self.assertEqual(snapshot["running"], ["A"])
+        self.assertEqual(snapshot["queued"], [1])
+        self.assertEqual(snapshot["submitted"], 2)
+        self.assertEqual(snapshot["completed"], 0)
+
+        online.advance(20)
+        self.assertEqual(online.pick_next(), "B")
+        with self.assertRaises(ValueError):
+            online.advance(4)
+        finished = online.drain()
+        self.assertEqual(sorted(p.pid for p in finished), ["A", "B"])
+        self.assertEqual(online.snapshot()["running"], [None])
+
+    def test_rows_are_reused(self):
+        online = RoundRobin(time_slice=2).online()
+        seen = []
+        online.on_complete = seen.append
+        for k in range(100):
+            online.submit((f"P{k}", k * 10, 5, 1))
+            online.advance(k * 10 + 10)
+        self.assertEqual(len(seen), 100)
+        self.assertLessEqual(len(online.table), 2)
+
+    def test_event_loop_matches_run(self):
+        # the non-preemptive event loops against their run(), trace and counters included
+        for scheduler in [FCFS(), SJF(), PriorityScheduler()]:
+            table = ProcessTable.from_processes(random_processes(4, **WORKLOAD))
+            expected_trace, expected_stats = ExecutionTrace(), SchedulerStats()
+            scheduler.run(table, iter(table.arrival_order(True)), trace=expected_trace, stats=expected_stats)
+            expected = [table.completion_time[pid] for pid in range(len(table))]
+
+            table.reset()
+            trace, stats = ExecutionTrace(), SchedulerStats()
+            scheduler.event_loop(table, iter(table.arrival_order(True)), trace=trace, stats=stats).run()
+            self.assertEqual([table.completion_time[pid] for pid in range(len(table))], expected)
+            self.assertEqual(list(trace.segments()), list(expected_trace.segments()))
+            self.assertEqual(stats.as_dict(), expected_stats.as_dict())
+
+    def test_cfs_burst_is_fifo(self):
+        # a burst shares one vruntime, the tree keeps the ties in submission order
+        online = CFS().online()
+        for i in range(2000):
+            online.submit((f"P{i}", 0, 1, 1))
+        finished = online.drain()
+        self.assertEqual([p.pid for p in finished], [f"P{i}" for i in range(2000)])
+
+    def test_fluid_has_no_online_mode(self):
+        with self.assertRaises(ValueError):
+            CFS(mode="fluid").online()
+
+if __name__ == "__main__":
+    unittest.main()
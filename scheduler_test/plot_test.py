@@ -0,0 +1,42 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import matplotlib
+matplotlib.use("Agg")
+from experiment import run_experiments
+from plot import (COLORS, align_completion_curves, cumulative_completion_over_time, generate_random_processes,
+                  scheduler_colors)
+from scheduler.fcfs import FCFS
+from scheduler.round_robin import RoundRobin
+from scheduler.cfs import CFS
+
+class TestCompletionCurves(unittest.TestCase):
+
+    def test_matches_per_ms_counts(self):
+        results = run_experiments([("random", generate_random_processes(40, seed=7))],
+                                  [FCFS(), RoundRobin(time_slice=10), CFS()], max_workers=1)
+        curves = [cumulative_completion_over_time(result) for result in results]
+        times, aligned, global_max = align_completion_curves(curves)
+
+        self.assertEqual(global_max, max(max(result.table.completion_time) for result in results))
+        self.assertEqual(times[-1], global_max)
+        for result, curve, counts in zip(results, curves, aligned):
+            # a step plot of the event points gives the per-ms count at every t
+            completions = list(result.table.completion_time)
+            for t in list(range(0, global_max + 1, 97)) + [global_max]:
+                expected = sum(1 for c in completions if c <= t)
+                index = max(i for i, time in enumerate(times) if time <= t)
+                self.assertEqual(counts[index], expected)
+            self.assertLessEqual(len(curve["times"]), len(completions) + 1)
+
+class TestColors(unittest.TestCase):
+
+    def test_one_color_per_scheduler(self):
+        self.assertEqual(scheduler_colors(7), COLORS)
+        for count in [3, 7, 12, 30]:
+            colors = scheduler_colors(count)
+            self.assertEqual(len(set(colors)), count)
+
+if __name__ == '__main__':
+    unittest.main()
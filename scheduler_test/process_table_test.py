@@ -0,0 +1,73 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+from process import Process
+from process_table import ProcessTable
+from scheduler.fcfs import FCFS
+from scheduler.sjf import SJF
+from scheduler.priority_scheduler import PriorityScheduler
+from scheduler.round_robin import RoundRobin
+from scheduler.cfs import CFS
+from scheduler_test.helpers import sample_processes
+
+class TestProcessTable(unittest.TestCase):
+
+    def test_round_trip(self):
+        processes = sample_processes()
+        table = ProcessTable.from_processes(processes)
+
+        self.assertEqual(len(table), 5)
+        self.assertEqual(table.pid_name(2), "C")
+        view = table.process(2)
+        self.assertEqual((view.pid, view.arrival_time, view.duration, view.weight), ("C", 0, 6, 1))
+        self.assertEqual(view.remaining_time, 6)
+        self.assertEqual(view.start_time, -1)
+
+    def test_process_has_no_dict(self):
+        with self.assertRaises(AttributeError):
+            Process("A", 0, 1).extra = 1
+
+    def test_from_columns(self):
+        table = ProcessTable.from_columns([0, 2], [5, 3], [1, 2])
+
+        self.assertEqual(table.pid_name(1), "1")
+        self.assertEqual(list(table.remaining_time), [5, 3])
+        self.assertEqual(list(table.start_time), [-1, -1])
+
+        with self.assertRaises(ValueError):
+            ProcessTable.from_columns([0, 2], [5], [1, 2])
+
+    def test_append(self):
+        table = ProcessTable(names=[])
+        self.assertEqual(table.append("A", 0, 4), 0)
+        self.assertEqual(table.append("B", 1, 2, 2), 1)
+
+        FCFS().schedule(table)
+        self.assertEqual(list(table.completion_time), [4, 6])
+
+    def test_schedulers_fill_table(self):
+        schedulers = [FCFS(), SJF(), PriorityScheduler(), RoundRobin(time_slice=3), CFS(), CFS(mode="tick")]
+        for scheduler in schedulers:
+            processes = sample_processes()
+            scheduler.schedule(processes)
+
+            table = ProcessTable.from_processes(sample_processes())
+            scheduler.schedule(table)
+
+            self.assertEqual(list(table.completion_time), [p.completion_time for p in processes])
+            self.assertEqual(list(table.response_time), [p.response_time for p in processes])
+            self.assertEqual(list(table.waiting_time), [p.waiting_time for p in processes])
+
+    def test_reset(self):
+        table = ProcessTable.from_processes(sample_processes())
+        RoundRobin(time_slice=3).schedule(table)
+        first = list(table.completion_time)
+
+        table.reset()
+        self.assertEqual(list(table.remaining_time), list(table.duration))
+        RoundRobin(time_slice=3).schedule(table)
+        self.assertEqual(list(table.completion_time), first)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import random
+import unittest
+from RBTree import RedBlackTree
+
+def check_invariants(test, tree):
+    # returns the black height, fails the test if a red-black property is broken
+    nil = tree._nil
+
+    def walk(node):
+        if node is nil:
+            return 1
+        if node.red:
+            test.assertFalse(node.left.red or node.right.red, "red node with a red child")
+        left = walk(node.left)
+        right = walk(node.right)
+        test.assertEqual(left, right, "unequal black height")
+        return left + (0 if node.red else 1)
+
+    test.assertFalse(tree._root.red)
+    return walk(tree._root)
+
+class TestRedBlackTree(unittest.TestCase):
+
+    def test_min_and_order(self):
+        tree = RedBlackTree()
+        tree.add("a", 5.0)
+        tree.add("b", 3.0)
+        tree.add("c", 8.0)
+
+        self.assertEqual(tree.get_min(), "b")
+        self.assertEqual(tree.min_vruntime(), 3.0)
+        self.assertEqual(tree.get_all_vruntime(), [3.0, 5.0, 8.0])
+        self.assertEqual(len(tree), 3)
+
+    def test_equal_vruntime_is_fifo(self):
+        tree = RedBlackTree()
+        for name in "abcdefg":
+            tree.add(name, 0.0)
+        tree.add("z", -1.0)
+
+        self.assertEqual([tree.pop_min() for _ in range(8)], list("zabcdefg"))
+        self.assertIsNone(tree.pop_min())
+        self.assertIsNone(tree.get_min())
+
+    def test_duplicate_item_rejected(self):
+        tree = RedBlackTree()
+        self.assertTrue(tree.add("a", 1.0))
+        self.assertFalse(tree.add("a", 2.0))
+        self.assertEqual(tree.find("a"), 1.0)
+
+    def test_remove_by_handle(self):
+        tree = RedBlackTree()
+        tree.add("a", 1.0)
+        tree.add("b", 2.0)
+        tree.add("c", 3.0)
+
+        self.assertTrue(tree.remove("a"))
+        self.assertFalse(tree.remove("a"))
+        self.assertNotIn("a", tree)
+        self.assertEqual(tree.get_min(), "b")
+        self.assertTrue(tree.remove("c"))
+        self.assertEqual(tree.get_all_vruntime(), [2.0])
+
+    def test_random_operations(self):
+        rng = random.Random(3)
+        tree = RedBlackTree()
+        reference = {}
+        seq = 0
+        for step in range(3000):
+            op = rng.random()
+            if op < 0.5 or not reference:
+                item = step
+                vruntime = float(rng.randint(0, 50))
+                tree.add(item, vruntime)
+                reference[item] = (vruntime, seq)
+                seq += 1
+            elif op < 0.75:
+                item = rng.choice(list(reference))
+                self.assertTrue(tree.remove(item))
+                del reference[item]
+            else:
+                expected = min(reference, key=reference.get)
+                self.assertEqual(tree.pop_min(), expected)
+                del reference[expected]
+
+            if step % 100 == 0:
+                check_invariants(self, tree)
+            self.assertEqual(len(tree), len(reference))
+            if reference:
+                self.assertEqual(tree.get_min(), min(reference, key=reference.get))
+
+        self.assertEqual([item for _, item in tree.items()], sorted(reference, key=reference.get))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import tempfile
+import time
+import unittest
+from workload import Workload
+from experiment import run_experiments
+from result_cache import ResultCache
+from scheduler.fcfs import FCFS
+from scheduler.round_robin import RoundRobin
+from scheduler.cfs import CFS
+from scheduler_test.helpers import random_processes
+
+def random_workload(seed):
+    return Workload.from_processes(random_processes(seed, n=60, span=800, min_duration=1))
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "cache")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_hit_returns_stored_results(self):
+        cache = ResultCache(self.path)
+        workloads = [("a", random_workload(1)), ("b", random_workload(2))]
+        schedulers = [FCFS(), RoundRobin(time_slice=4), CFS()]
+
+        first = run_experiments(workloads, schedulers, max_workers=1, collect_stats=True, cache=cache)
+        self.assertEqual((cache.hits, cache.misses), (0, 6))
+        second = run_experiments(workloads, schedulers, max_workers=1, collect_stats=True, cache=cache)
+        self.assertEqual((cache.hits, cache.misses), (6, 6))
+
+        for before, after in zip(first, second):
+            self.assertEqual(after.metrics, before.metrics)
+            self.assertEqual(list(after.table.completion_time), list(before.table.completion_time))
+            self.assertEqual(list(after.table.vruntime), list(before.table.vruntime))
+            self.assertEqual(list(after.trace.segments()), list(before.trace.segments()))
+            self.assertEqual(after.stats.as_dict(), before.stats.as_dict())
+            self.assertEqual(list(after.stats.runs), list(before.stats.runs))
+
+    def test_key_covers_workload_and_parameters(self):
+        cache = ResultCache(self.path)
+        workload = random_workload(3)
+        self.assertEqual(cache.key(workload, CFS()), cache.key(random_workload(3), CFS()))
+        self.assertNotEqual(cache.key(workload, CFS()), cache.key(random_workload(4), CFS()))
+        self.assertNotEqual(cache.key(workload, CFS()), cache.key(workload, CFS(target_latency=40)))
+        self.assertNotEqual(cache.key(workload, RoundRobin(2)), cache.key(workload, RoundRobin(3)))
+
+    def test_stats_requested_after_a_run_without(self):
+        cache = ResultCache(self.path)
+        workloads = [("a", random_workload(5))]
+        run_experiments(workloads, [CFS()], max_workers=1, cache=cache)
+        result, = run_experiments(workloads, [CFS()], max_workers=1, collect_stats=True, cache=cache)
+        self.assertEqual(cache.hits, 0)
+        self.assertGreater(result.stats.dispatches, 0)
+
+    def test_lru_eviction(self):
+        workloads = [random_workload(seed) for seed in range(4)]
+        cache = ResultCache(self.path)
+        for workload in workloads[:2]:
+            run_experiments([("w", workload)], [CFS()], max_workers=1, cache=cache)
+        entry_size = cache.size() // 2
+
+        # room for about two entries, the first one was used last so the second goes
+        cache.max_bytes = int(entry_size * 2.5)
+        time.sleep(0.01)
+        self.assertIsNotNone(cache.get(workloads[0], CFS()))
+        time.sleep(0.01)
+        run_experiments([("w", workloads[2])], [CFS()], max_workers=1, cache=cache)
+        self.assertLessEqual(cache.size(), cache.max_bytes)
+        self.assertIsNotNone(cache.get(workloads[0], CFS()))
+        self.assertIsNone(cache.get(workloads[1], CFS()))
+        self.assertIsNotNone(cache.get(workloads[2], CFS()))
+
+    def test_stale_temp_files_removed(self):
+        os.makedirs(self.path)
+        stale, fresh = os.path.join(self.path, "old.tmp"), os.path.join(self.path, "new.tmp")
+        for path in (stale, fresh):
+            with open(path, "wb") as f:
+                f.write(b"partial")
+        os.utime(stale, (time.time() - 2 * 3600,) * 2)
+        run_experiments([("w", random_workload(5))], [FCFS()], max_workers=1, cache=ResultCache(self.path))
+        # a crashed writer's file goes, one that may still be being written stays
+        self.assertFalse(os.path.exists(stale))
+        self.assertTrue(os.path.exists(fresh))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import tempfile
+import unittest
+from process import Process
+from experiment import run_experiments
+from results_store import load_results, save_results
+from scheduler.fcfs import FCFS
+from scheduler.round_robin import RoundRobin
+from scheduler.cfs import CFS
+from scheduler_test.helpers import sample_processes
+
+class TestResultsStore(unittest.TestCase):
+
+    def test_round_trip(self):
+        experiments = run_experiments([("small", sample_processes()), ("single", [Process("X", 5, 3, 1)])],
+                                      [FCFS(), RoundRobin(time_slice=3), CFS()], max_workers=1)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "results")
+            save_results(path, experiments)
+
+            for mmap in (True, False):
+                loaded = load_results(path, mmap=mmap)
+                self.assertEqual(len(loaded), len(experiments))
+                for saved, result in zip(experiments, loaded):
+                    self.assertEqual((result.workload, result.scheduler), (saved.workload, saved.scheduler))
+                    self.assertEqual(result.metrics, saved.metrics)
+                    for column in ("start_time", "completion_time", "response_time", "waiting_time", "weight"):
+                        self.assertEqual(list(getattr(result.table, column)), list(getattr(saved.table, column)))
+                    self.assertEqual(result.table.process(0).completion_time, saved.table.completion_time[0])
+
+            # loaded tables are read-only views
+            with self.assertRaises(TypeError):
+                load_results(path)[0].table.completion_time[0] = 1
+
+    def test_empty(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            save_results(tmp, [])
+            self.assertEqual(load_results(tmp), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,18 @@
 import sys, os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+import random
 import unittest
 from process import Process
+from execution_trace import ExecutionTrace
+from scheduler_stats import SchedulerStats
 from scheduler.round_robin import RoundRobin
 
+class SliceBySlice(RoundRobin):
+    # round robin without skipping whole rotations
+    def skip_rotations(self, table, ready_queue, current_time, next_arrival, trace=None, stats=None):
+        return current_time
+
 class TestRoundRobin(unittest.TestCase):
 
     def test_basic(self):
@@ -145,5 +153,30 @@ class TestRoundRobin(unittest.TestCase):
         self.assertEqual(processes[1].turnaround_time, 2)
         self.assertEqual(processes[1].response_time, 2)
 
+    def test_long_jobs_skip_rotations(self):
+        processes = [Process("A", 0, 1000), Process("B", 0, 1001), Process("C", 500, 3)]
+        RoundRobin(time_slice=2).schedule(processes)
+
+        # C arrives at 500 as B's slice ends and goes in ahead of B, A and B alternate around it
+        self.assertEqual(processes[2].start_time, 502)
+        self.assertEqual(processes[2].completion_time, 509)
+        self.assertEqual(processes[0].completion_time, 2001)
+        self.assertEqual(processes[1].completion_time, 2004)
+
+    def test_skipping_matches_slice_by_slice(self):
+        for seed in range(40):
+            rng = random.Random(seed)
+            jobs = [(f"P{i}", rng.randint(0, rng.choice([10, 2000])), rng.choice([rng.randint(0, 5), rng.randint(1, 400)]))
+                    for i in range(rng.randint(1, 30))]
+            time_slice = rng.choice([1, 3, 10])
+            results = []
+            for scheduler in (RoundRobin(time_slice), SliceBySlice(time_slice)):
+                processes = [Process(*job) for job in jobs]
+                trace, stats = ExecutionTrace(), SchedulerStats()
+                scheduler.schedule(processes, trace=trace, stats=stats)
+                results.append(([(p.start_time, p.completion_time, p.response_time) for p in processes],
+                                list(trace.segments()), stats.as_dict(), list(stats.runs)))
+            self.assertEqual(results[0], results[1])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
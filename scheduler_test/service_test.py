@@ -0,0 +1,150 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import asyncio
+import json
+import tempfile
+import unittest
+from metrics import compute_metrics, flatten
+from process import Process
+from scheduler.cfs import CFS
+from scheduler.fcfs import FCFS
+from scheduler.round_robin import RoundRobin
+from service import SimulationService, open_connection, parse_workload, query, run_batch
+
+JOBS = [["P1", 0, 30, 1], ["P2", 2, 10, 2], ["P3", 4, 50, 1], ["P4", 40, 5, 3]]
+
+def direct_metrics(scheduler):
+    processes = [Process(*job) for job in JOBS]
+    scheduler.schedule(processes)
+    return json.loads(json.dumps(flatten(compute_metrics(processes)), default=lambda value: value.item()))
+
+class TestService(unittest.TestCase):
+
+    def serve(self, client, **options):
+        # run client(path, service) against a fresh service on a Unix socket
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "service.sock")
+            service = SimulationService(max_workers=1, **options)
+
+            async def main():
+                await service.start(path=path)
+                try:
+                    return await client(path, service)
+                finally:
+                    await service.close()
+
+            return asyncio.run(main())
+
+    def test_metrics_match_direct_runs(self):
+        request = {"id": "a", "workload": {"processes": JOBS},
+                   "schedulers": [{"kind": "CFS", "params": {"latency_buffer": -1}}, "RoundRobin"]}
+        responses = self.serve(lambda path, service: query([request], path=path))["a"]
+
+        self.assertTrue(responses[-1]["done"])
+        metrics = {response["scheduler"]: response["metrics"] for response in responses[:-1]}
+        self.assertEqual(metrics, {
+            "CFS(latency_buffer=-1)": direct_metrics(CFS(latency_buffer=-1)),
+            "RoundRobin": direct_metrics(RoundRobin()),
+        })
+
+    def test_generated_workload_and_defaults(self):
+        request = {"id": 1, "workload": {"generator": {"arrivals": "bursty", "seed": 3}, "n": 50}}
+        responses = self.serve(lambda path, service: query([request], path=path))[1]
+        labels = [response["scheduler"] for response in responses[:-1]]
+        self.assertEqual(sorted(labels), sorted(["FCFS", "SJF", "PriorityScheduler", "RoundRobin", "CFS",
+                                                 "CFS_NoBuffer", "O1Scheduler"]))
+        self.assertTrue(all(response["metrics"]["count"] == 50 for response in responses[:-1]))
+
+    def test_bad_requests(self):
+        async def client(path, service):
+            reader, writer = await open_connection(path=path)
+            writer.write(b"not json\n")
+            writer.write(json.dumps({"id": 2, "workload": {"processes": JOBS}, "schedulers": ["Lottery"]}).encode() + b"\n")
+            writer.write(json.dumps({"id": 3, "workload": {"generator": {"arrivals": "fractal"}}}).encode() + b"\n")
+            writer.write(json.dumps({"id": 4, "workload": {"processes": [["P1", 0]]}}).encode() + b"\n")
+            await writer.drain()
+            messages = [json.loads(await reader.readline()) for _ in range(4)]
+            writer.close()
+            return messages
+
+        messages = self.serve(client)
+        self.assertEqual([message["id"] for message in messages], [None, 2, 3, 4])
+        self.assertTrue(all("error" in message and "scheduler" not in message for message in messages))
+
+    def test_bad_scheduler_params(self):
+        specs = [{"kind": "RoundRobin", "params": {"time_slice": 0}},
+                 {"kind": "RoundRobin", "params": {"cpus": 0}},
+                 {"kind": "CFS", "params": {"target_latency": -5}},
+                 {"kind": "CFS", "params": {"latency_buffer": -3}},
+                 {"kind": "O1", "params": {"base_time_slice": -1}},
+                 {"kind": "SJF", "params": {"time_slice": 2}}]
+        requests = [{"id": k, "workload": {"processes": JOBS}, "schedulers": [spec]} for k, spec in enumerate(specs)]
+        responses = self.serve(lambda path, service: query(requests, path=path))
+        for k in range(len(specs)):
+            self.assertEqual(len(responses[k]), 1)
+            self.assertIn("error", responses[k][0])
+
+    def test_pool_replaced_after_timeout_or_crash(self):
+        slow = {"id": "slow", "workload": {"generator": {"seed": 1}, "n": 100000},
+                "schedulers": [{"kind": "RoundRobin", "params": {"time_slice": 1}}]}
+        fast = {"id": "fast", "workload": {"processes": JOBS}, "schedulers": ["FCFS"]}
+
+        async def client(path, service):
+            slow_responses = (await query([slow], path=path))["slow"]
+            await query([fast], path=path)
+            # kill the idle workers of the new pool, the next batch gets another one
+            for worker in list(service.batcher.pool._processes.values()):
+                worker.kill()
+                worker.join()
+            fast_responses = (await query([fast], path=path))["fast"]
+            return slow_responses, fast_responses, service.batcher.restarts
+
+        slow_responses, fast_responses, restarts = self.serve(client, batch_timeout=1.0)
+        self.assertIn("TimeoutError", slow_responses[0]["error"])
+        self.assertTrue(slow_responses[-1]["done"])
+        self.assertEqual(fast_responses[0]["metrics"], direct_metrics(FCFS()))
+        self.assertEqual(restarts, 2)
+
+    def test_backpressure(self):
+        # far more simulations than may be pending, over several connections
+        def requests(client):
+            return [{"id": k, "workload": {"generator": {"seed": client}, "n": 20, "replicate": k},
+                     "schedulers": ["FCFS", "SJF", "CFS"]} for k in range(10)]
+
+        async def client(path, service):
+            return await asyncio.gather(*(query(requests(c), path=path) for c in range(4)))
+
+        results = self.serve(client, max_pending=4, batch_size=8)
+        for responses in results:
+            self.assertEqual(len(responses), 10)
+            for messages in responses.values():
+                self.assertEqual(len(messages), 4)
+                self.assertTrue(messages[-1]["done"])
+
+    def test_parse_workload(self):
+        kind, jobs = parse_workload({"processes": [["P1", 0, 5], ["P2", 1, 2, 2]]}, 10)
+        self.assertEqual(jobs, (("P1", 0, 5, 1.0), ("P2", 1, 2, 2.0)))
+        with self.assertRaises(ValueError):
+            parse_workload({"processes": JOBS}, 3)
+        with self.assertRaises(ValueError):
+            parse_workload({"generator": {}, "n": 0}, 10)
+        with self.assertRaises(TypeError):
+            parse_workload({"generator": {"colour": "red"}, "n": 5}, 10)
+        for row in (["P1", 0, 5, 0], ["P1", 0, -5], ["P1", -1, 5], ["P1", 0, 5, float("nan")]):
+            with self.assertRaises(ValueError):
+                parse_workload({"processes": [row]}, 10)
+        with self.assertRaises(ValueError):
+            parse_workload({"generator": {"weights": [1, 0]}, "n": 5}, 10)
+
+    def test_failed_simulation_spares_its_batch(self):
+        # a zero weight job that slipped past parse_workload fails alone
+        bad = (("processes", (("P1", 0, 5, 0.0),)), CFS())
+        good = (("processes", tuple(tuple(job) for job in JOBS)), RoundRobin())
+        results = run_batch([bad, good])
+        self.assertEqual(results[0][0], "error")
+        self.assertIn("ZeroDivisionError", results[0][1])
+        self.assertEqual(results[1], ("ok", direct_metrics(RoundRobin())))
+
+if __name__ == "__main__":
+    unittest.main()
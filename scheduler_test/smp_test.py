@@ -0,0 +1,91 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+from process import Process
+from execution_trace import ExecutionTrace
+from scheduler_stats import SchedulerStats
+from scheduler.round_robin import RoundRobin
+from scheduler.cfs import CFS
+from scheduler.smp import CPUSet
+from scheduler_test.helpers import random_processes
+
+WORKLOAD = dict(n=120, span=1500, min_duration=1, max_duration=60)
+
+def results(processes):
+    return [(p.start_time, p.completion_time, p.response_time, p.waiting_time) for p in processes]
+
+class TestSMP(unittest.TestCase):
+
+    def run_smp_directly(self, scheduler, processes):
+        # the SMP engine on one CPU, bypassing the cpus > 1 switch in run()
+        scheduler.run = scheduler.run_smp
+        trace, stats = ExecutionTrace(), SchedulerStats()
+        scheduler.schedule(processes, trace=trace, stats=stats)
+        return trace, stats
+
+    def test_one_cpu_matches_single_cpu_engines(self):
+        for make in [lambda: RoundRobin(time_slice=3), lambda: CFS()]:
+            for seed in range(3):
+                expected = random_processes(seed, **WORKLOAD)
+                expected_trace, expected_stats = ExecutionTrace(), SchedulerStats()
+                make().schedule(expected, trace=expected_trace, stats=expected_stats)
+
+                processes = random_processes(seed, **WORKLOAD)
+                trace, stats = self.run_smp_directly(make(), processes)
+                self.assertEqual(results(processes), results(expected))
+                self.assertEqual(list(trace.segments()), list(expected_trace.segments()))
+                self.assertEqual(stats.as_dict(), expected_stats.as_dict())
+
+    def test_multi_cpu_invariants(self):
+        for scheduler in [RoundRobin(time_slice=5, cpus=4), CFS(cpus=4), CFS(cpus=4, balance_interval=0)]:
+            # arrivals crowded into a short span so queues build up
+            processes = random_processes(4, n=200, span=300, min_duration=1, max_duration=60)
+            trace, stats = ExecutionTrace(), SchedulerStats()
+            scheduler.schedule(processes, trace=trace, stats=stats)
+
+            self.assertTrue(all(p.completion_time >= p.arrival_time + p.duration for p in processes))
+            self.assertEqual(sum(stats.cpu_busy), sum(p.duration for p in processes))
+            self.assertEqual(sum(trace.length), sum(p.duration for p in processes))
+            makespan = max(p.completion_time for p in processes)
+            utilization = stats.cpu_utilization(makespan)
+            self.assertEqual(len(utilization), 4)
+            self.assertTrue(all(0 < u <= 1 for u in utilization))
+
+            # a CPU runs one segment at a time
+            ends = {}
+            for pid, start, length, cpu in zip(trace.pid, trace.start, trace.length, trace.cpu):
+                self.assertGreaterEqual(start, ends.get(cpu, 0))
+                ends[cpu] = start + length
+            self.assertGreater(stats.migrations, 0)
+
+    def test_more_cpus_finish_sooner(self):
+        makespans = []
+        for cpus in (1, 2, 8):
+            processes = random_processes(5, n=200, span=300, min_duration=1, max_duration=60)
+            RoundRobin(time_slice=5, cpus=cpus).schedule(processes)
+            makespans.append(max(p.completion_time for p in processes))
+        self.assertGreater(makespans[0], makespans[1])
+        self.assertGreater(makespans[1], makespans[2])
+
+    def test_balance_evens_out_queues(self):
+        cpus = CPUSet(4, list)
+        cpus.cpus[0].queue.extend(range(9))
+        cpus.updated(cpus.cpus[0])
+
+        def migrate(src, dst):
+            dst.queue.append(src.queue.pop())
+            cpus.updated(src)
+            cpus.updated(dst)
+
+        woken = cpus.balance(migrate)
+        self.assertEqual(sorted(cpu.load() for cpu in cpus.cpus), [2, 2, 2, 3])
+        self.assertEqual([cpu.index for cpu in woken], [1, 2, 3])
+        self.assertEqual(cpus.place().index, 1)
+
+    def test_needs_a_cpu(self):
+        with self.assertRaises(ValueError):
+            CPUSet(0, list)
+
+if __name__ == "__main__":
+    unittest.main()
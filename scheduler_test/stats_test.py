@@ -0,0 +1,68 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+from process import Process
+from scheduler_stats import SchedulerStats
+from scheduler.fcfs import FCFS
+from scheduler.sjf import SJF
+from scheduler.priority_scheduler import PriorityScheduler
+from scheduler.round_robin import RoundRobin
+from scheduler.cfs import CFS
+from scheduler_test.helpers import random_processes
+
+WORKLOAD = dict(span=1500, min_duration=1)
+
+class TestSchedulerStats(unittest.TestCase):
+
+    def test_round_robin_counts(self):
+        processes = [Process("A", 0, 5, 1), Process("B", 0, 3, 1)]
+        stats = SchedulerStats()
+        RoundRobin(time_slice=2).schedule(processes, stats=stats)
+
+        # A2 B2 A2 B1 A1
+        self.assertEqual(stats.dispatches, 5)
+        self.assertEqual(stats.context_switches, 4)
+        self.assertEqual(stats.preemptions, 3)
+        self.assertEqual(stats.runs_per_process(2), [3, 2])
+        self.assertEqual(stats.runqueue_ops, 10)
+        self.assertEqual(stats.peak_runqueue, 2)
+        self.assertEqual(stats.idle_time, 0)
+
+    def test_idle_time(self):
+        for scheduler in [FCFS(), FCFS(vectorized=True), SJF(), PriorityScheduler(), RoundRobin(), CFS(),
+                          CFS(mode="tick")]:
+            processes = [Process("A", 3, 2, 1), Process("B", 10, 3, 1), Process("C", 13, 1, 1)]
+            stats = SchedulerStats()
+            scheduler.schedule(processes, stats=stats)
+            # idle from 5 to 10, nothing counted before the first arrival
+            self.assertEqual(stats.idle_time, 5)
+            self.assertEqual(stats.context_switches, 1)
+            self.assertEqual(stats.runs_per_process(3), [1, 1, 1])
+
+    def test_vectorized_fcfs_matches_loop(self):
+        loop, vectorized = SchedulerStats(), SchedulerStats()
+        FCFS().schedule(random_processes(1, **WORKLOAD), stats=loop)
+        FCFS(vectorized=True).schedule(random_processes(1, **WORKLOAD), stats=vectorized)
+        for key in ("dispatches", "context_switches", "idle_time"):
+            self.assertEqual(getattr(loop, key), getattr(vectorized, key))
+        self.assertEqual(list(loop.runs), list(vectorized.runs))
+
+    def test_cfs_modes_agree(self):
+        event, tick = SchedulerStats(), SchedulerStats()
+        CFS().schedule(random_processes(2, **WORKLOAD), stats=event)
+        CFS(mode="tick").schedule(random_processes(2, **WORKLOAD), stats=tick)
+        self.assertEqual(event.as_dict(), tick.as_dict())
+        self.assertEqual(list(event.runs), list(tick.runs))
+        self.assertGreater(event.preemptions, 0)
+        self.assertGreater(event.vruntime_ties, 0)
+
+    def test_stats_do_not_change_results(self):
+        for scheduler in [SJF(), RoundRobin(time_slice=3), CFS()]:
+            plain, counted = random_processes(3, **WORKLOAD), random_processes(3, **WORKLOAD)
+            scheduler.schedule(plain)
+            scheduler.schedule(counted, stats=SchedulerStats())
+            self.assertEqual([p.completion_time for p in plain], [p.completion_time for p in counted])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import tempfile
+import unittest
+from process import Process
+from process_table import ProcessTable
+from scheduler.scheduler_base import stream_arrivals
+from scheduler.fcfs import FCFS
+from scheduler.sjf import SJF
+from scheduler.priority_scheduler import PriorityScheduler
+from scheduler.round_robin import RoundRobin
+from scheduler.cfs import CFS
+from trace_io import read_trace, write_trace
+from scheduler_test.helpers import random_processes
+
+def schedulers():
+    return [FCFS(), SJF(), PriorityScheduler(), RoundRobin(time_slice=4), CFS(), CFS(mode="tick")]
+
+class TestStreaming(unittest.TestCase):
+
+    def test_stream_matches_batch(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for seed, suffix in [(1, ".csv"), (2, ".jsonl")]:
+                processes = random_processes(seed, n=60, span=400, max_duration=30, sort=True)
+                path = os.path.join(tmp, "trace" + suffix)
+                self.assertEqual(write_trace(path, processes), len(processes))
+
+                for scheduler in schedulers():
+                    batch = [Process(p.pid, p.arrival_time, p.duration, p.weight) for p in processes]
+                    scheduler.schedule(batch)
+                    expected = {p.pid: (p.start_time, p.completion_time, p.waiting_time) for p in batch}
+
+                    streamed = {}
+                    count = scheduler.schedule_stream(
+                        read_trace(path),
+                        lambda p: streamed.__setitem__(p.pid, (p.start_time, p.completion_time, p.waiting_time)))
+
+                    self.assertEqual(count, len(processes))
+                    self.assertEqual(streamed, expected)
+
+    def test_only_live_processes_are_held(self):
+        # one short job every 10 ms never overlaps with more than one other
+        jobs = [(f"P{i}", 10 * i, 5, 1.0) for i in range(1000)]
+        for scheduler in schedulers():
+            table = ProcessTable(names=[])
+            finished = []
+
+            def done(pid):
+                finished.append(table.completion_time[pid])
+                table.release(pid)
+
+            scheduler.run(table, stream_arrivals(table, iter(jobs), scheduler.ARRIVAL_BY_NAME), done)
+            self.assertEqual(len(finished), 1000)
+            self.assertLessEqual(len(table), 3)
+
+    def test_unsorted_trace_rejected(self):
+        jobs = [("A", 5, 1, 1.0), ("B", 2, 1, 1.0)]
+        with self.assertRaises(ValueError):
+            RoundRobin().schedule_stream(iter(jobs))
+
+    def test_bad_trace_line(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trace.csv")
+            with open(path, "w") as f:
+                f.write("pid,arrival,duration\nA,0,oops\n")
+            with self.assertRaises(ValueError):
+                list(read_trace(path))
+            with self.assertRaises(ValueError):
+                read_trace(os.path.join(tmp, "trace.txt"))
+
+if __name__ == '__main__':
+    unittest.main()
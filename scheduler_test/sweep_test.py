@@ -0,0 +1,92 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import csv
+import subprocess
+import tempfile
+import unittest
+from process import Process
+from metrics import compute_metrics, flatten
+from scheduler.cfs import CFS
+from sweep import expand_grid, parse_grid, run_sweep, main
+from test_cases import get_test_case_2, get_test_case_4
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+class TestSweep(unittest.TestCase):
+
+    def test_expand_grid(self):
+        self.assertEqual(expand_grid({"a": [1, 2], "b": ["x", "y"]}),
+                         [{"a": 1, "b": "x"}, {"a": 1, "b": "y"}, {"a": 2, "b": "x"}, {"a": 2, "b": "y"}])
+        self.assertEqual(expand_grid({}), [{}])
+
+    def test_parse_grid(self):
+        self.assertEqual(parse_grid(["CFS", "target_latency=10,20", "min_time_slice=0.5", "mode=tick"]),
+                         ("CFS", {"target_latency": [10, 20], "min_time_slice": [0.5], "mode": ["tick"]}))
+        with self.assertRaises(ValueError):
+            parse_grid(["CFS", "target_latency"])
+
+    def test_rows_match_single_runs(self):
+        workloads = [("two", get_test_case_2()), ("four", get_test_case_4())]
+        grids = {"CFS": {"target_latency": [10, 40], "min_time_slice": [1, 4]}, "RoundRobin": {"time_slice": [3]}}
+        for workers in (1, 2):
+            rows = run_sweep(workloads, grids, max_workers=workers)
+            self.assertEqual(len(rows), 2 * 5)
+            self.assertEqual([row["workload"] for row in rows], ["two"] * 5 + ["four"] * 5)
+            self.assertEqual([row["scheduler"] for row in rows[:5]], ["CFS"] * 4 + ["RoundRobin"])
+
+            processes = [Process(p.pid, p.arrival_time, p.duration, p.weight) for p in get_test_case_4()]
+            CFS(target_latency=40, min_time_slice=1).schedule(processes)
+            row = rows[5 + 2]
+            self.assertEqual((row["target_latency"], row["min_time_slice"]), (40, 1))
+            self.assertEqual(row["avg_turnaround"], flatten(compute_metrics(processes))["avg_turnaround"])
+            self.assertNotIn("time_slice", row)
+
+        # workloads are never modified
+        self.assertEqual(workloads[0][1][0].start_time, -1)
+
+    def test_bad_parameter_fails_early(self):
+        with self.assertRaises(TypeError):
+            run_sweep([("two", get_test_case_2())], {"RoundRobin": {"quantum": [1]}}, max_workers=1)
+        with self.assertRaises(ValueError):
+            run_sweep([("two", get_test_case_2())], {"Lottery": {}}, max_workers=1)
+
+    def test_cli_writes_tidy_csv(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = os.path.join(tmp, "sweep.csv")
+            code = main(["--grid", "CFS", "latency_buffer=-1,10", "--grid", "FCFS", "--test-cases",
+                         "--workers", "1", "--out", out])
+            self.assertEqual(code, 0)
+            with open(out, newline="") as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual(len(rows), 7 * 3)
+            self.assertEqual(rows[0]["latency_buffer"], "-1")
+            self.assertEqual(rows[2]["scheduler"], "FCFS")
+            self.assertEqual(rows[2]["latency_buffer"], "")
+
+    def test_repeated_scheduler_grids(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = os.path.join(tmp, "sweep.csv")
+            code = main(["--grid", "CFS", "latency_buffer=10", "--grid", "CFS", "latency_buffer=-1",
+                         "--grid", "CFS", "target_latency=40", "--test-cases", "--workers", "1", "--out", out])
+            self.assertEqual(code, 0)
+            with open(out, newline="") as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual(len(rows), 7 * 3)
+            self.assertEqual([(row["latency_buffer"], row["target_latency"]) for row in rows[:3]],
+                             [("10", ""), ("-1", ""), ("", "40")])
+
+    def test_cli_prints_without_pandas(self):
+        code = ("import sys, sweep; sweep.main(['--grid', 'CFS', 'latency_buffer=-1,10', '--grid', 'FCFS', "
+                "'--test-cases', '--workers', '1']); print('pandas' in sys.modules)")
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+        lines = out.rstrip().splitlines()
+        self.assertEqual(lines[-1], "False")
+        header = lines[0].split()
+        self.assertEqual(header[:3], ["workload", "scheduler", "latency_buffer"])
+        self.assertEqual(len(lines), 1 + 7 * 3 + 1)
+        # FCFS rows leave latency_buffer empty, the columns still line up
+        self.assertEqual(len({len(line) for line in lines[:-1]}), 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+from process_table import ProcessTable
+from execution_trace import ExecutionTrace
+from scheduler.fcfs import FCFS
+from scheduler.sjf import SJF
+from scheduler.priority_scheduler import PriorityScheduler
+from scheduler.round_robin import RoundRobin
+from scheduler.cfs import CFS
+from scheduler_test.helpers import random_processes
+
+# durations of at least 1 ms, so every process shows up in the trace
+WORKLOAD = dict(span=600, min_duration=1, max_duration=30)
+
+class TestExecutionTrace(unittest.TestCase):
+
+    def test_merges_adjacent_slices(self):
+        trace = ExecutionTrace()
+        trace.record(0, 0, 4)
+        trace.record(0, 4, 4)
+        trace.record(1, 8, 2)
+        trace.record(1, 12, 2)
+        trace.record(1, 14, 0)
+        self.assertEqual(list(trace.segments()), [(0, 0, 8), (1, 8, 2), (1, 12, 2)])
+        self.assertEqual(trace.context_switches(), 1)
+
+    def test_extend_merges_like_record(self):
+        import numpy as np
+        segments = [(0, 0, 8), (1, 8, 2), (1, 10, 3), (2, 20, 0), (1, 13, 1), (2, 20, 5)]
+        recorded = ExecutionTrace()
+        for segment in segments:
+            recorded.record(*segment)
+        extended = ExecutionTrace()
+        extended.record(*segments[0])
+        pid, start, length = (np.array(column) for column in zip(*segments[1:]))
+        extended.extend(pid, start, length)
+        self.assertEqual(list(extended.segments()), list(recorded.segments()))
+        self.assertEqual(list(extended.segments()), [(0, 0, 8), (1, 8, 6), (2, 20, 5)])
+        # later records keep merging onto the extended segments
+        extended.record(2, 25, 1)
+        self.assertEqual(list(extended.segments())[-1], (2, 20, 6))
+        self.assertEqual(len(extended.cpu), len(extended))
+
+    def test_trace_covers_every_process(self):
+        for scheduler in [FCFS(), FCFS(vectorized=True), SJF(), PriorityScheduler(), RoundRobin(time_slice=5), CFS()]:
+            processes = random_processes(1, **WORKLOAD)
+            trace = scheduler.schedule(processes, trace=ExecutionTrace())
+
+            ran = [0] * len(processes)
+            end = 0
+            for pid, start, length in trace.segments():
+                # segments are in time order and never overlap
+                self.assertGreaterEqual(start, end)
+                end = start + length
+                ran[pid] += length
+                self.assertLessEqual(processes[pid].start_time, start)
+                self.assertLessEqual(end, processes[pid].completion_time)
+            self.assertEqual(ran, [p.duration for p in processes])
+
+    def test_vectorized_fcfs_trace_matches_loop(self):
+        processes = random_processes(2, **WORKLOAD)
+        loop = FCFS().schedule(processes, trace=ExecutionTrace())
+        vectorized = FCFS(vectorized=True).schedule(random_processes(2, **WORKLOAD), trace=ExecutionTrace())
+        self.assertEqual(list(loop.segments()), list(vectorized.segments()))
+        self.assertEqual(loop.as_dicts(ProcessTable.from_processes(processes))[0]['process'],
+                         min(processes, key=lambda p: (p.arrival_time, p.pid)).pid)
+
+    def test_non_preemptive_schedule_returned(self):
+        for scheduler in [FCFS(), FCFS(vectorized=True), SJF(), PriorityScheduler()]:
+            processes = random_processes(4, **WORKLOAD)
+            schedule = scheduler.schedule(processes)
+            # each process runs once, whole, from its start time
+            expected = sorted(({'process': p.pid, 'start_time': p.start_time, 'duration': p.duration}
+                               for p in processes if p.duration > 0), key=lambda row: row['start_time'])
+            self.assertEqual(schedule, expected)
+            self.assertIsInstance(scheduler.schedule(random_processes(4, **WORKLOAD), trace=ExecutionTrace()), ExecutionTrace)
+
+    def test_cfs_modes_trace_identical(self):
+        event = CFS().schedule(random_processes(3, **WORKLOAD), trace=ExecutionTrace())
+        tick = CFS(mode="tick").schedule(random_processes(3, **WORKLOAD), trace=ExecutionTrace())
+        self.assertEqual(list(event.segments()), list(tick.segments()))
+        self.assertIsNone(CFS().schedule(random_processes(3, **WORKLOAD)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import random
+import unittest
+import numpy as np
+from workload_generator import WorkloadGenerator
+from plot import generate_random_processes
+from scheduler.cfs import CFS
+
+class TestWorkloadGenerator(unittest.TestCase):
+
+    def test_replicates_are_reproducible_and_independent(self):
+        generator = WorkloadGenerator(arrivals="bursty", durations="pareto", seed=11)
+        first = generator.columns(1000, replicate=3)
+        # a fresh generator, replicates drawn in another order
+        again = WorkloadGenerator(arrivals="bursty", durations="pareto", seed=11)
+        again.columns(1000, replicate=5)
+        for a, b in zip(first, again.columns(1000, replicate=3)):
+            np.testing.assert_array_equal(a, b)
+        self.assertFalse(np.array_equal(first[1], generator.columns(1000, replicate=4)[1]))
+        self.assertFalse(np.array_equal(first[1], WorkloadGenerator(arrivals="bursty", durations="pareto",
+                                                                    seed=12).columns(1000, replicate=3)[1]))
+
+    def test_columns_are_independent_streams(self):
+        lognormal = WorkloadGenerator(durations="lognormal", seed=2).columns(500)
+        pareto = WorkloadGenerator(durations="pareto", seed=2).columns(500)
+        np.testing.assert_array_equal(lognormal[0], pareto[0])
+        np.testing.assert_array_equal(lognormal[2], pareto[2])
+
+    def test_distributions(self):
+        n = 200000
+        for arrivals in ("uniform", "poisson", "bursty"):
+            for durations in ("exponential", "lognormal", "pareto"):
+                arrival, duration, weight = WorkloadGenerator(arrivals=arrivals, durations=durations, load=0.8,
+                                                              mean_duration=50).columns(n)
+                self.assertEqual((len(arrival), len(duration), len(weight)), (n, n, n))
+                self.assertTrue(np.all(np.diff(arrival) >= 0))
+                self.assertGreaterEqual(duration.min(), 1)
+                # ceil to whole ms adds about half a ms
+                self.assertAlmostEqual(duration.mean() / 50.5, 1.0, delta=0.1)
+                self.assertAlmostEqual(duration.sum() / arrival[-1], 0.8, delta=0.08)
+                self.assertEqual(set(np.unique(weight)), {1.0, 2.0, 3.0})
+
+        poisson = np.diff(WorkloadGenerator(arrivals="poisson").arrival_times(n)).astype(float)
+        bursty = np.diff(WorkloadGenerator(arrivals="bursty").arrival_times(n)).astype(float)
+        self.assertGreater(bursty.std() / bursty.mean(), 2 * poisson.std() / poisson.mean())
+
+        pareto = WorkloadGenerator(durations="pareto", alpha=1.2).duration_times(n)
+        exponential = WorkloadGenerator(durations="exponential").duration_times(n)
+        self.assertGreater(pareto.max(), 10 * exponential.max())
+
+    def test_bounds_and_weights(self):
+        generator = WorkloadGenerator(durations="uniform", min_duration=10, max_duration=20,
+                                      weights=(1, 5), weight_probs=(0.9, 0.1))
+        arrival, duration, weight = generator.columns(20000)
+        self.assertEqual((duration.min(), duration.max()), (10, 20))
+        self.assertAlmostEqual(float((weight == 5).mean()), 0.1, delta=0.02)
+        capped = WorkloadGenerator(durations="pareto", max_duration=300).duration_times(20000)
+        self.assertEqual(capped.max(), 300)
+
+        with self.assertRaises(ValueError):
+            WorkloadGenerator(durations="uniform")
+        with self.assertRaises(ValueError):
+            WorkloadGenerator(arrivals="periodic")
+        with self.assertRaises(ValueError):
+            WorkloadGenerator(durations="pareto", alpha=1.0)
+
+    def test_table_and_workload(self):
+        generator = WorkloadGenerator(seed=4)
+        workload = generator.workload(300, replicate=1)
+        table = workload.new_table()
+        CFS().schedule(table)
+        self.assertTrue(all(c > 0 for c in table.completion_time))
+        self.assertEqual([p.pid for p in generator.processes(3)], ["P1", "P2", "P3"])
+        self.assertEqual(len(generator.replicates(50, 3)), 3)
+
+    def test_plot_processes_leave_global_random_alone(self):
+        random.seed(5)
+        expected = random.random()
+        random.seed(5)
+        processes = generate_random_processes(50, seed=1)
+        self.assertEqual(random.random(), expected)
+        self.assertTrue(all(0 <= p.arrival_time <= 5000 and 10 <= p.duration <= 2000 for p in processes))
+        self.assertEqual([p.duration for p in processes], [p.duration for p in generate_random_processes(50, seed=1)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pickle
+import unittest
+from workload import Workload
+from scheduler.fcfs import FCFS
+from scheduler.sjf import SJF
+from scheduler.round_robin import RoundRobin
+from scheduler.cfs import CFS
+from scheduler_test.helpers import sample_processes
+
+class TestWorkload(unittest.TestCase):
+
+    def test_precomputed_orders(self):
+        workload = Workload.from_processes(sample_processes())
+
+        # stable by arrival for RR / CFS, then by pid name for FCFS / SJF / Priority
+        self.assertEqual(list(workload.orders[False]), [2, 0, 1, 3, 4])
+        self.assertEqual(list(workload.orders[True]), [2, 1, 0, 3, 4])
+        self.assertIs(workload.new_table().orders, workload.orders)
+
+    def test_inputs_are_read_only(self):
+        workload = Workload.from_processes(sample_processes())
+        table = workload.new_table()
+
+        with self.assertRaises(TypeError):
+            table.duration[0] = 10
+        with self.assertRaises(TypeError):
+            workload.arrival_time[0] = 1
+
+    def test_runs_do_not_share_state(self):
+        workload = Workload.from_processes(sample_processes())
+        for scheduler in [FCFS(), SJF(), RoundRobin(time_slice=2), CFS()]:
+            first = workload.new_table()
+            scheduler.schedule(first)
+            second = workload.new_table()
+            self.assertEqual(list(second.start_time), [-1] * 5)
+            scheduler.schedule(second)
+
+            processes = sample_processes()
+            scheduler.schedule(processes)
+            self.assertEqual(list(first.completion_time), [p.completion_time for p in processes])
+            self.assertEqual(list(second.completion_time), [p.completion_time for p in processes])
+
+    def test_pickle(self):
+        workload = Workload.from_processes(sample_processes(), name="small")
+        copy = pickle.loads(pickle.dumps(workload))
+
+        self.assertEqual(copy.name, "small")
+        self.assertEqual(list(copy.duration), [3, 2, 6, 1, 6])
+        self.assertEqual(copy.orders, workload.orders)
+
+        table = copy.new_table()
+        RoundRobin(time_slice=2).schedule(table)
+        restored = pickle.loads(pickle.dumps(table))
+        self.assertEqual(list(restored.completion_time), list(table.completion_time))
+
+if __name__ == '__main__':
+    unittest.main()
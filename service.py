@@ -0,0 +1,401 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from experiment import run_pair, scheduler_label
+from metrics import flatten
+from process import Process
+from scheduler.scheduler_base import Scheduler
+from sweep import config_label, make_scheduler
+from workload import Workload
+from workload_generator import WorkloadGenerator
+
+# Simulation service: a long running asyncio server that takes workload + scheduler specs over
+# localhost TCP or a Unix socket and streams the metrics back, so a dashboard can query without
+# starting a Python process per question.
+#   python -m cli serve --port 8765          (or --unix /tmp/scheduler.sock)
+# Protocol, one JSON object per line both ways:
+#   {"id": 7, "workload": {"processes": [["P1", 0, 10, 1], ["P2", 3, 5, 2]]},
+#    "schedulers": [{"kind": "CFS", "params": {"latency_buffer": -1}}, "RoundRobin"]}
+#   {"id": 8, "workload": {"generator": {"arrivals": "bursty", "load": 0.8}, "n": 200, "replicate": 3}}
+# answered, as each simulation finishes, by
+#   {"id": 7, "scheduler": "CFS(latency_buffer=-1)", "metrics": {"avg_turnaround": ..., ...}}
+#   {"id": 7, "scheduler": "RoundRobin", "error": "..."}
+# and then {"id": 7, "done": true, "ms": 12.3}. A request that cannot be parsed gets a single
+# {"id": ..., "error": "..."}. Without "schedulers" the default set of simulation.py runs.
+# Simulations run on a process pool:
+#   batching      a simulation goes to the pool right away while a worker is free, under load the
+#                 queued ones go out together (up to batch_size per pool task), so small simulations
+#                 do not pay one round trip each and an idle service adds no delay
+#   backpressure  at most max_pending simulations are accepted and not finished. when they are all
+#                 taken the service stops reading requests, the socket buffers fill up and clients
+#                 block on send instead of the server queueing without bound
+#   deadline      a pool task running over batch_timeout seconds fails its simulations and the pool
+#                 is replaced, a hung or crashed worker does not take the service down with it
+
+PORT = 8765
+# longest request line, a workload of 10^5 processes is about 3 MB
+LINE_LIMIT = 64 * 1024 * 1024
+
+# (kind, ...) workload spec shipped to the workers, see parse_workload
+WorkloadSpec = Tuple[Any, ...]
+
+def parse_workload(spec: Any, max_jobs: int) -> WorkloadSpec:
+    if not isinstance(spec, dict):
+        raise ValueError("workload must be an object with processes or generator")
+    if "processes" in spec:
+        jobs = []
+        for row in spec["processes"]:
+            if not isinstance(row, (list, tuple)) or len(row) not in (3, 4):
+                raise ValueError(f"bad process {row!r}, expected [pid, arrival_time, duration(, weight)]")
+            job = (str(row[0]), int(row[1]), int(row[2]), float(row[3]) if len(row) == 4 else 1.0)
+            if job[1] < 0 or job[2] < 0 or not job[3] > 0:
+                raise ValueError(f"bad process {row!r}, arrival_time and duration must be >= 0 and weight > 0")
+            jobs.append(job)
+        if len(jobs) > max_jobs:
+            raise ValueError(f"{len(jobs)} processes, at most {max_jobs} per request")
+        return ("processes", tuple(jobs))
+    if "generator" in spec:
+        params = dict(spec["generator"])
+        n = int(spec.get("n", 100))
+        if not 0 < n <= max_jobs:
+            raise ValueError(f"n must be between 1 and {max_jobs}")
+        # fails here on a bad parameter rather than in a worker
+        generator = WorkloadGenerator(**params)
+        if generator.min_duration < 0 or not all(weight > 0 for weight in generator.weights):
+            raise ValueError("generator min_duration must be >= 0 and weights > 0")
+        return ("generator", params, n, int(spec.get("replicate", 0)))
+    raise ValueError("workload must have processes or generator")
+
+def parse_schedulers(specs: Optional[Iterable[Any]]) -> List[Tuple[str, Scheduler]]:
+    # [(label, scheduler)], "CFS" is short for {"kind": "CFS"}
+    if specs is None:
+        from simulation import default_schedulers
+        return [(scheduler_label(scheduler), scheduler) for scheduler in default_schedulers()]
+    schedulers = []
+    for spec in specs:
+        if isinstance(spec, str):
+            spec = {"kind": spec}
+        if not isinstance(spec, dict) or "kind" not in spec:
+            raise ValueError(f"bad scheduler {spec!r}, expected a kind or {{\"kind\": ..., \"params\": {{...}}}}")
+        params = dict(spec.get("params") or {})
+        schedulers.append((config_label(spec["kind"], params), make_scheduler(spec["kind"], params)))
+    if not schedulers:
+        raise ValueError("no schedulers")
+    return schedulers
+
+# result cache of the worker process, set once by the pool initializer
+_cache = None
+
+def _init_worker(cache_path: Optional[str]):
+    global _cache
+    if cache_path is not None:
+        from result_cache import ResultCache
+        _cache = ResultCache(cache_path)
+
+def build_workload(spec: WorkloadSpec) -> Workload:
+    if spec[0] == "processes":
+        return Workload.from_processes([Process(*job) for job in spec[1]], name="request")
+    _, params, n, replicate = spec
+    return WorkloadGenerator(**params).workload(n, replicate)
+
+def run_batch(tasks: List[Tuple[WorkloadSpec, Scheduler]]) -> List[Tuple[str, Any]]:
+    """
+    run a batch of (workload spec, scheduler) in a worker, returns ("ok", flat metrics) or
+    ("error", message) for each. the simulations of one request share their workload spec object,
+    pickling keeps it shared, so it is compiled once per batch.
+    """
+    compiled = {}
+    results = []
+    for spec, scheduler in tasks:
+        try:
+            workload = compiled.get(id(spec))
+            if workload is None:
+                workload = compiled[id(spec)] = build_workload(spec)
+            results.append(("ok", flatten(run_pair("request", workload, scheduler, cache=_cache).metrics)))
+        except Exception as e:
+            # only this simulation fails, the others of the batch may come from other clients
+            results.append(("error", f"{type(e).__name__}: {e}"))
+    return results
+
+def _warm_up() -> int:
+    return os.getpid()
+
+class Batcher:
+    """
+    hands (workload spec, scheduler) tasks to the pool. while fewer than two batches per worker are
+    in flight a task goes out at once, otherwise it waits for the next finished batch and leaves
+    with up to batch_size others. a batch running longer than timeout seconds fails, and since its
+    worker may never return the pool is replaced, as it is when a worker dies (BrokenProcessPool).
+    the batches lost with a dead worker are retried once on the new pool.
+    """
+
+    def __init__(self, make_pool: Callable[[], ProcessPoolExecutor], workers: int, batch_size: int,
+                 timeout: Optional[float] = None):
+        self.make_pool = make_pool
+        self.pool = make_pool()
+        self.workers = workers
+        self.batch_size = max(1, batch_size)
+        self.timeout = timeout
+        self.queue = []
+        self.inflight = 0
+        self.batches = 0
+        self.restarts = 0
+
+    def submit(self, task: Tuple[WorkloadSpec, Scheduler]) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self.queue.append((task, future))
+        if self.inflight < 2 * self.workers:
+            self.flush()
+        return future
+
+    def flush(self):
+        batch, self.queue = self.queue[:self.batch_size], self.queue[self.batch_size:]
+        self.inflight += 1
+        self.batches += 1
+        done = asyncio.ensure_future(self._run(self.pool, [task for task, _ in batch]))
+        done.add_done_callback(lambda done: self._finished(done, [future for _, future in batch]))
+
+    async def _run(self, pool: ProcessPoolExecutor, tasks: List[Tuple[WorkloadSpec, Scheduler]]):
+        # simulations have no side effects, a batch lost with a dead worker runs once more on the
+        # new pool. the second loss is reported, the batch itself may be what kills the worker
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            try:
+                future = loop.run_in_executor(pool, run_batch, tasks)
+                return await asyncio.wait_for(future, self.timeout)
+            except asyncio.TimeoutError:
+                self.restart(pool)
+                raise TimeoutError(f"batch of {len(tasks)} simulations took over {self.timeout} s") from None
+            except BrokenProcessPool:
+                self.restart(pool)
+                if attempt:
+                    raise
+                pool = self.pool
+
+    def restart(self, pool: ProcessPoolExecutor):
+        # several batches of the same pool fail, only the first one replaces it
+        if pool is not self.pool:
+            return
+        self.restarts += 1
+        self.pool = self.make_pool()
+        # no public way to stop a busy worker, a hung one has to be killed
+        workers = list((getattr(pool, "_processes", None) or {}).values())
+        pool.shutdown(wait=False, cancel_futures=True)
+        for worker in workers:
+            worker.terminate()
+
+    def _finished(self, done: asyncio.Future, futures: List[asyncio.Future]):
+        self.inflight -= 1
+        error = asyncio.CancelledError() if done.cancelled() else done.exception()
+        for i, future in enumerate(futures):
+            if future.cancelled():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(done.result()[i])
+        while self.queue and self.inflight < 2 * self.workers:
+            self.flush()
+
+def _json_default(value):
+    # NumPy scalars from the metrics
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+def encode(message: Dict[str, Any]) -> bytes:
+    return json.dumps(message, default=_json_default, separators=(",", ":")).encode() + b"\n"
+
+class SimulationService:
+    def __init__(self, max_workers: Optional[int] = None, max_pending: int = 512, batch_size: int = 16,
+                 max_jobs: int = 100000, cache_path: Optional[str] = None, batch_timeout: Optional[float] = 300):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.max_jobs = max_jobs
+        self.cache_path = cache_path
+        self.batch_timeout = batch_timeout
+        self.batcher = None
+        self.slots = None
+        self.server = None
+        self.completed = 0
+
+    async def start(self, host: str = "127.0.0.1", port: int = PORT, path: Optional[str] = None):
+        self.batcher = Batcher(self.make_pool, self.max_workers, self.batch_size, self.batch_timeout)
+        loop = asyncio.get_running_loop()
+        # start every worker now, the first queries should not pay for the imports
+        await asyncio.gather(*(loop.run_in_executor(self.batcher.pool, _warm_up) for _ in range(self.max_workers)))
+        self.slots = asyncio.Semaphore(self.max_pending)
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self.handle, path=path, limit=LINE_LIMIT)
+        else:
+            self.server = await asyncio.start_server(self.handle, host, port, limit=LINE_LIMIT)
+        return self.server
+
+    def make_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                   initargs=(self.cache_path,))
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.batcher is not None:
+            self.batcher.pool.shutdown(cancel_futures=True)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        lock = asyncio.Lock()
+        requests = set()
+
+        async def send(message: Dict[str, Any]):
+            async with lock:
+                if writer.is_closing():
+                    return
+                writer.write(encode(message))
+                try:
+                    await writer.drain()
+                except ConnectionError:
+                    writer.close()
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, ConnectionError) as e:
+                    # line over LINE_LIMIT, or the client went away
+                    await send({"id": None, "error": str(e)})
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                request_id = None
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("request must be a JSON object")
+                    request_id = request.get("id")
+                    workload = parse_workload(request.get("workload"), self.max_jobs)
+                    schedulers = parse_schedulers(request.get("schedulers"))
+                except (ValueError, TypeError, KeyError) as e:
+                    await send({"id": request_id, "error": str(e)})
+                    continue
+
+                started = time.perf_counter()
+                simulations = []
+                for label, scheduler in schedulers:
+                    # backpressure: no more reading while max_pending simulations are unfinished
+                    await self.slots.acquire()
+                    simulations.append(asyncio.create_task(
+                        self.simulate(send, request_id, label, workload, scheduler)))
+                task = asyncio.create_task(self.finish_request(send, request_id, simulations, started))
+                requests.add(task)
+                task.add_done_callback(requests.discard)
+            if requests:
+                await asyncio.gather(*requests)
+        finally:
+            writer.close()
+
+    async def simulate(self, send, request_id: Any, label: str, workload: WorkloadSpec, scheduler: Scheduler):
+        try:
+            status, value = await self.batcher.submit((workload, scheduler))
+        except Exception as e:
+            # a crashed or timed out batch, its simulations report it
+            status, value = "error", f"{type(e).__name__}: {e}"
+        finally:
+            self.slots.release()
+        self.completed += 1
+        if status == "ok":
+            await send({"id": request_id, "scheduler": label, "metrics": value})
+        else:
+            await send({"id": request_id, "scheduler": label, "error": value})
+
+    async def finish_request(self, send, request_id: Any, simulations: List[asyncio.Task], started: float):
+        await asyncio.gather(*simulations)
+        await send({"id": request_id, "done": True, "ms": round((time.perf_counter() - started) * 1000, 3)})
+
+async def open_connection(host: str = "127.0.0.1", port: int = PORT, path: Optional[str] = None):
+    if path is not None:
+        return await asyncio.open_unix_connection(path, limit=LINE_LIMIT)
+    return await asyncio.open_connection(host, port, limit=LINE_LIMIT)
+
+async def query(requests: List[Dict[str, Any]], host: str = "127.0.0.1", port: int = PORT,
+                path: Optional[str] = None) -> Dict[Any, List[Dict[str, Any]]]:
+    """
+    send requests (with distinct ids) over one connection, returns the responses of each id
+    in arrival order, the last one being its done or error message.
+    """
+    reader, writer = await open_connection(host, port, path)
+
+    async def send_all():
+        for request in requests:
+            writer.write(encode(request))
+            await writer.drain()
+
+    sender = asyncio.create_task(send_all())
+    responses = {request.get("id"): [] for request in requests}
+    open_ids = set(responses)
+    try:
+        while open_ids:
+            line = await reader.readline()
+            if not line:
+                raise ConnectionError("the service closed the connection")
+            message = json.loads(line)
+            responses.setdefault(message.get("id"), []).append(message)
+            if message.get("done") or ("error" in message and "scheduler" not in message):
+                open_ids.discard(message.get("id"))
+        await sender
+    finally:
+        sender.cancel()
+        writer.close()
+    return responses
+
+async def serve(service: SimulationService, host: str, port: int, path: Optional[str]):
+    server = await service.start(host, port, path)
+    where = path or f"{host}:{port}"
+    print(f"serving on {where} with {service.max_workers} workers", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="serve scheduler simulations over a local socket")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--unix", help="listen on this Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, default one per CPU")
+    parser.add_argument("--max-pending", type=int, default=512,
+                        help="simulations accepted and not finished before reading stops")
+    parser.add_argument("--batch-size", type=int, default=16, help="most simulations per pool task")
+    parser.add_argument("--max-jobs", type=int, default=100000, help="most processes per workload")
+    parser.add_argument("--batch-timeout", type=float, default=300,
+                        help="seconds before a pool task fails and its workers are replaced")
+    parser.add_argument("--cache", action="store_true", help="use the result cache (see result_cache.py)")
+    args = parser.parse_args(argv)
+
+    cache_path = None
+    if args.cache:
+        from result_cache import CACHE_PATH
+        cache_path = CACHE_PATH
+    service = SimulationService(args.workers, args.max_pending, args.batch_size, args.max_jobs, cache_path,
+                                args.batch_timeout)
+    try:
+        asyncio.run(serve(service, args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"serve: {e}", file=sys.stderr)
+        return 2
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
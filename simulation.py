@@ -1,74 +1,50 @@
-import copy
-import csv
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from process import Process
+from metrics import compute_metrics, flatten
+from metrics_sink import MetricsSink
+from experiment import ExperimentResult, run_experiments, group_by_workload, scheduler_label
+from results_store import save_results
+from result_cache import ResultCache
+from trace_io import read_trace
 from scheduler.scheduler_base import Scheduler
 from scheduler.fcfs import FCFS
 from scheduler.sjf import SJF
 from scheduler.priority_scheduler import PriorityScheduler
 from scheduler.round_robin import RoundRobin
 from scheduler.cfs import CFS
-from test_cases import (
-    get_test_case_1,
-    get_test_case_2,
-    get_test_case_3,
-    get_test_case_4,
-    get_test_case_5,
-    get_test_case_6,
-    get_test_case_7
-)
+from scheduler.o1 import O1Scheduler
 
-def calculate_metrics(processes: List[Process]):
-    total_turnaround = 0
-    total_response = 0
-    total_waiting = 0
-    n = len(processes)
-    
-    if n == 0:
-        return {"avg_turnaround": 0, "avg_response": 0, "avg_waiting": 0, "throughput": 0}
-
-    max_completion_time = 0
-    min_arrival_time = float('inf')
+# per-process results of the test cases, read back by table.py and plot.py
+RESULTS_PATH = "scheduler_results"
 
-    for p in processes:
-        total_turnaround += p.turnaround_time
-        total_response += p.response_time
-        total_waiting += p.waiting_time
-        max_completion_time = max(max_completion_time, p.completion_time)
-        min_arrival_time = min(min_arrival_time, p.arrival_time)
+def calculate_metrics(processes: List[Process]):
+    # avg_turnaround, avg_response, avg_waiting, throughput plus tail percentiles and fairness,
+    # see metrics.compute_metrics
+    return flatten(compute_metrics(processes))
 
-    total_time = max_completion_time - min_arrival_time
-    # 1000 since time in milliseconds
-    throughput = 1000 * n / total_time if total_time > 0 else 0
+def result_row(result: ExperimentResult) -> Dict[str, Any]:
+    return metrics_row(result.scheduler, result.metrics)
 
+def metrics_row(scheduler: str, metrics: Dict[str, Any]) -> Dict[str, Any]:
+    # metrics from compute_metrics or MetricsSink.summary
+    metrics = flatten(metrics)
     return {
-        "avg_turnaround": total_turnaround / n,
-        "avg_response": total_response / n,
-        "avg_waiting": total_waiting / n,
-        "throughput": throughput
+        "Scheduler": scheduler,
+        "Avg Turnaround": metrics['avg_turnaround'],
+        "Avg Response": metrics['avg_response'],
+        "Avg Waiting": metrics['avg_waiting'],
+        "Throughput": metrics['throughput'],
+        "P95 Turnaround": metrics['p95_turnaround'],
+        "P99 Turnaround": metrics['p99_turnaround'],
+        "Jain Turnaround": metrics['jain_turnaround']
     }
 
-def run_test_case(name: str, processes: List[Process], schedulers: List[Scheduler]):
+def print_results(name: str, results: List[Dict[str, Any]]):
     print(f"\n=== {name} ===")
-    
-    results = []
-    for scheduler in schedulers:
-        # deep copy processes
-        test_processes = [copy.deepcopy(p) for p in processes]
-        scheduler_name = scheduler.name if hasattr(scheduler, 'name') else scheduler.__class__.__name__
-        
-        scheduler.schedule(test_processes)
-        metrics = calculate_metrics(test_processes)
-        results.append({
-            "Scheduler": scheduler_name,
-            "Avg Turnaround": metrics['avg_turnaround'],
-            "Avg Response": metrics['avg_response'],
-            "Avg Waiting": metrics['avg_waiting'],
-            "Throughput": metrics['throughput']
-        })
 
-    headers = ["Scheduler", "Avg Turnaround", "Avg Response", "Avg Waiting", "Throughput"]
-    col_widths = [20, 18, 18, 18, 15]
+    headers = ["Scheduler", "Avg Turnaround", "Avg Response", "Avg Waiting", "Throughput",
+               "P95 Turnaround", "P99 Turnaround", "Jain Turnaround"]
+    col_widths = [20, 18, 18, 18, 15, 18, 18, 15]
     
     header_row = "".join(f"{h:<{w}}" for h, w in zip(headers, col_widths))
     print("-" * len(header_row))
@@ -80,40 +56,79 @@ def run_test_case(name: str, processes: List[Process], schedulers: List[Schedule
               f"{row['Avg Turnaround']:<{col_widths[1]}.0f}"
               f"{row['Avg Response']:<{col_widths[2]}.2f}"
               f"{row['Avg Waiting']:<{col_widths[3]}.1f}"
-              f"{row['Throughput']:<{col_widths[4]}.2f}")
+              f"{row['Throughput']:<{col_widths[4]}.2f}"
+              f"{row['P95 Turnaround']:<{col_widths[5]}.0f}"
+              f"{row['P99 Turnaround']:<{col_widths[6]}.0f}"
+              f"{row['Jain Turnaround']:<{col_widths[7]}.3f}")
     print("-" * len(header_row))    
+
+def run_test_cases(test_cases: List[Tuple[str, List[Process]]], schedulers: List[Scheduler],
+                   max_workers: Optional[int] = None, results_path: Optional[str] = None,
+                   cache: Optional[ResultCache] = None) -> List[Dict[str, Any]]:
+    # every (test case, scheduler) pair runs in parallel, printing happens in test case order afterwards.
+    # the per-process results are saved to results_path if given, see results_store.
+    # pairs found in cache are not simulated again, see result_cache
+    experiments = run_experiments(test_cases, schedulers, max_workers=max_workers, cache=cache)
+    if results_path is not None:
+        save_results(results_path, experiments)
+
+    all_results = []
+    for name, results in group_by_workload(experiments).items():
+        rows = [result_row(result) for result in results]
+        print_results(name, rows)
+        for row in rows:
+            row['Test Case'] = name
+            all_results.append(row)
+    return all_results
+
+def run_trace(path: str, schedulers: List[Scheduler]) -> List[Dict[str, Any]]:
+    # stream a trace file through every scheduler, only the live processes and the sink are kept
+    results = []
+    for scheduler in schedulers:
+        sink = MetricsSink()
+        scheduler.schedule_stream(read_trace(path), sink=sink)
+        results.append(metrics_row(scheduler_label(scheduler), sink.summary()))
+    print_results(path, results)
     return results
-if __name__ == "__main__":
-    schedulers = [
+
+def run_test_case(name: str, processes: List[Process], schedulers: List[Scheduler]):
+    results = [result_row(result) for result in run_experiments([(name, processes)], schedulers)]
+    print_results(name, results)
+    return results
+
+def default_schedulers() -> List[Scheduler]:
+    return [
         FCFS(),
         SJF(),
         PriorityScheduler(),
         RoundRobin(time_slice=10),
         CFS("CFS", latency_buffer=10),
-        CFS("CFS_NoBuffer", latency_buffer=-1)
+        CFS("CFS_NoBuffer", latency_buffer=-1),
+        O1Scheduler()
     ]
 
-    all_results = []
-
-    def run_and_store(name, processes):
-        results = run_test_case(name, processes, schedulers)
-        for r in results:
-            r['Test Case'] = name
-            all_results.append(r)
+def default_test_cases() -> List[Tuple[str, List[Process]]]:
+    # imported here, only runs over the built-in test cases need them
+    from test_cases import (
+        get_test_case_1,
+        get_test_case_2,
+        get_test_case_3,
+        get_test_case_4,
+        get_test_case_5,
+        get_test_case_6,
+        get_test_case_7
+    )
+    return [
+        ("Test Case 1: Equal Weight Processes", get_test_case_1()),
+        ("Test Case 2: Different Weights", get_test_case_2()),
+        ("Test Case 3: Late Arrival Preemption", get_test_case_3()),
+        ("Test Case 4: Many Short Jobs + One Long Job", get_test_case_4()),
+        ("Test Case 5: CPU Idle Period + New Arrival", get_test_case_5()),
+        ("Test Case 6: Sleeper Fairness / Gaming the Scheduler", get_test_case_6()),
+        ("Test Case 7: Many Equal Processes", get_test_case_7()),
+    ]
 
-    run_and_store("Test Case 1: Equal Weight Processes", get_test_case_1())
-    run_and_store("Test Case 2: Different Weights", get_test_case_2())
-    run_and_store("Test Case 3: Late Arrival Preemption", get_test_case_3())
-    run_and_store("Test Case 4: Many Short Jobs + One Long Job", get_test_case_4())
-    run_and_store("Test Case 5: CPU Idle Period + New Arrival", get_test_case_5())
-    run_and_store("Test Case 6: Sleeper Fairness / Gaming the Scheduler", get_test_case_6())
-    run_and_store("Test Case 7: Many Equal Processes", get_test_case_7())
+if __name__ == "__main__":
+    run_test_cases(default_test_cases(), default_schedulers(), results_path=RESULTS_PATH, cache=ResultCache())
 
-    # csv export
-    if all_results:
-        fieldnames = ["Test Case", "Scheduler", "Avg Turnaround", "Avg Response", "Avg Waiting", "Throughput"]
-        with open('scheduler_results.csv', 'w', newline='') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(all_results)
-        print(f"\nResults exported to scheduler_results.csv")
+    print(f"\nResults saved to {RESULTS_PATH}/")
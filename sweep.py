@@ -0,0 +1,198 @@
+import argparse
+import ast
+import csv
+import inspect
+import itertools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from metrics import compute_metrics, flatten
+from process import Process
+from workload import Workload
+from scheduler.scheduler_base import Scheduler
+from scheduler.fcfs import FCFS
+from scheduler.sjf import SJF
+from scheduler.priority_scheduler import PriorityScheduler
+from scheduler.round_robin import RoundRobin
+from scheduler.cfs import CFS
+from scheduler.o1 import O1Scheduler
+
+# Parameter sweeps: every combination of a grid of scheduler parameters on every workload.
+#   run_sweep(workloads, {"CFS": {"target_latency": [10, 20, 40], "min_time_slice": [1, 2, 4]},
+#                         "RoundRobin": {"time_slice": [5, 10, 20]}})
+# returns one tidy row per (workload, config): workload, scheduler, one column per swept parameter
+# and the flattened metrics (see metrics.flatten). Workloads are compiled once and shipped to each
+# worker process once, the tasks only carry (workload index, scheduler, parameters) and the
+# results only the metrics, so hundreds of configs per workload stay cheap.
+#   python sweep.py --grid CFS target_latency=10,20,40 min_time_slice=1,2,4 --grid RoundRobin time_slice=5,10 \
+#                   --test-cases --trace jobs.csv --out sweep.csv
+
+SCHEDULERS = {
+    "FCFS": FCFS,
+    "SJF": SJF,
+    "Priority": PriorityScheduler,
+    "RoundRobin": RoundRobin,
+    "CFS": CFS,
+    "O1": O1Scheduler,
+}
+
+Grid = Dict[str, Sequence[Any]]
+# {scheduler: grid}, or [(scheduler, grid)] when one scheduler has several grids
+Grids = Union[Dict[str, Grid], Sequence[Tuple[str, Grid]]]
+
+def expand_grid(grid: Grid) -> List[Dict[str, Any]]:
+    # every combination, the last parameter varying fastest
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+def make_scheduler(kind: str, params: Dict[str, Any]) -> Scheduler:
+    if kind not in SCHEDULERS:
+        raise ValueError(f"unknown scheduler {kind!r}, expected one of {list(SCHEDULERS)}")
+    accepted = list(inspect.signature(SCHEDULERS[kind]).parameters)
+    unknown = [name for name in params if name not in accepted]
+    if unknown:
+        raise TypeError(f"unknown {kind} parameters {unknown}, expected some of {accepted}")
+    return SCHEDULERS[kind](**params)
+
+def config_label(kind: str, params: Dict[str, Any]) -> str:
+    # CFS(latency_buffer=-1), an explicit name parameter wins
+    if "name" in params:
+        return str(params["name"])
+    if not params:
+        return kind
+    return kind + "(" + ", ".join(f"{key}={value}" for key, value in params.items()) + ")"
+
+def configs(grids: Grids) -> List[Tuple[str, Dict[str, Any]]]:
+    result = []
+    for kind, grid in (grids.items() if isinstance(grids, dict) else grids):
+        for params in expand_grid(grid):
+            # fail on a bad parameter name here rather than in every worker
+            make_scheduler(kind, params)
+            result.append((kind, params))
+    return result
+
+# compiled workloads of the worker process, set once by the pool initializer
+_workloads: List[Tuple[str, Workload]] = []
+
+def _init_worker(workloads: List[Tuple[str, Workload]]):
+    global _workloads
+    _workloads = workloads
+
+def run_config(workload: Tuple[str, Workload], kind: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    name, compiled = workload
+    table = compiled.new_table()
+    make_scheduler(kind, params).schedule(table)
+    row = {"workload": name, "scheduler": kind}
+    row.update(params)
+    row.update(flatten(compute_metrics(table)))
+    return row
+
+def _run_task(task) -> Dict[str, Any]:
+    index, kind, params = task
+    return run_config(_workloads[index], kind, params)
+
+def run_sweep(workloads: Sequence[Tuple[str, Union[List[Process], Workload]]], grids: Grids,
+              max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    run every config of grids ({scheduler: {parameter: values}} or [(scheduler, {parameter: values})])
+    on every (name, processes or Workload).
+    rows come back workload by workload, configs in grid order, whatever finishes first.
+    parameters a config does not set are missing from its row (None in a DataFrame / empty in CSV).
+    max_workers defaults to the number of CPUs, 1 runs everything in this process.
+    """
+    compiled = [(name, workload if isinstance(workload, Workload) else Workload.from_processes(workload, name=name))
+                for name, workload in workloads]
+    tasks = [(index, kind, params) for index in range(len(compiled)) for kind, params in configs(grids)]
+
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) < 2:
+        return [run_config(compiled[index], kind, params) for index, kind, params in tasks]
+
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(compiled,)) as pool:
+        return list(pool.map(_run_task, tasks, chunksize=chunksize))
+
+def columns(rows: List[Dict[str, Any]]) -> List[str]:
+    # union of the row keys in first seen order, so parameters of every scheduler get a column
+    seen = {}
+    for row in rows:
+        for key in row:
+            seen.setdefault(key, None)
+    return list(seen)
+
+def results_frame(rows: List[Dict[str, Any]]):
+    import pandas as pd
+    return pd.DataFrame(rows, columns=columns(rows))
+
+def format_rows(rows: List[Dict[str, Any]]) -> str:
+    # right aligned fixed width table, the way main prints without pandas
+    names = columns(rows)
+    cells = [names] + [["" if row.get(name) is None else f"{row[name]:g}" if isinstance(row[name], float)
+                        else str(row[name]) for name in names] for row in rows]
+    widths = [max(len(line[i]) for line in cells) for i in range(len(names))]
+    return "\n".join(" ".join(cell.rjust(width) for cell, width in zip(line, widths)) for line in cells)
+
+def write_csv(path: str, rows: List[Dict[str, Any]]):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns(rows))
+        writer.writeheader()
+        writer.writerows(rows)
+
+def parse_value(text: str) -> Any:
+    # 10 -> int, 0.5 -> float, anything else stays a string (e.g. a CFS mode)
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return text
+
+def parse_grid(spec: List[str]) -> Tuple[str, Grid]:
+    # ["CFS", "target_latency=10,20", "mode=event"] -> ("CFS", {"target_latency": [10, 20], "mode": ["event"]})
+    kind, *assignments = spec
+    grid = {}
+    for assignment in assignments:
+        name, sep, values = assignment.partition("=")
+        if not sep or not name or not values:
+            raise ValueError(f"bad parameter {assignment!r}, expected name=value[,value...]")
+        grid[name] = [parse_value(value) for value in values.split(",")]
+    return kind, grid
+
+def test_case_workloads() -> List[Tuple[str, List[Process]]]:
+    from simulation import default_test_cases
+    return default_test_cases()
+
+def trace_workload(path: str) -> Tuple[str, Workload]:
+    from trace_io import read_trace
+    return path, Workload.from_processes((Process(*job) for job in read_trace(path)), name=path)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="sweep scheduler parameters over workloads")
+    parser.add_argument("--grid", nargs="+", action="append", required=True, metavar="ARG",
+                        help="scheduler followed by name=v1,v2,... parameters, repeat for more schedulers")
+    parser.add_argument("--test-cases", action="store_true", help="sweep the built-in test cases")
+    parser.add_argument("--trace", action="append", default=[], help="job trace file (.csv / .jsonl) to sweep")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, default one per CPU")
+    parser.add_argument("--out", help="write the results table as CSV, printed otherwise")
+    args = parser.parse_args(argv)
+
+    try:
+        # a list, --grid CFS a=1 --grid CFS b=2 sweeps both grids
+        grids = [parse_grid(spec) for spec in args.grid]
+        workloads = (test_case_workloads() if args.test_cases else []) + [trace_workload(path) for path in args.trace]
+        if not workloads:
+            parser.error("nothing to sweep, give --test-cases and / or --trace")
+        rows = run_sweep(workloads, grids, max_workers=args.workers)
+    except (ValueError, TypeError) as e:
+        print(f"sweep: {e}", file=sys.stderr)
+        return 2
+
+    if args.out:
+        write_csv(args.out, rows)
+        print(f"{len(rows)} runs written to {args.out}")
+    else:
+        print(format_rows(rows))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,24 @@
 import pandas as pd
-import matplotlib.pyplot as plt
 
-def draw_tables():
+from results_store import load_results
+from simulation import RESULTS_PATH, result_row
+
+def results_frame(path: str = RESULTS_PATH) -> pd.DataFrame:
+    # one row per (test case, scheduler), the aggregate metrics come from the results directory
+    rows = []
+    for result in load_results(path):
+        row = {"Test Case": result.workload}
+        row.update(result_row(result))
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+def draw_tables(path: str = RESULTS_PATH):
+    import matplotlib.pyplot as plt
+
     try:
-        df = pd.read_csv('scheduler_results.csv')
+        df = results_frame(path)
     except FileNotFoundError:
-        print("run simulation.py first to get scheduler_results.csv")
+        print(f"run simulation.py first to get {path}/")
         return
 
     test_cases = df['Test Case'].unique()
@@ -23,6 +36,11 @@ def draw_tables():
             display_df['Avg Waiting'] = display_df['Avg Waiting'].apply(lambda x: f'{x:.1f}')
         if 'Throughput' in display_df.columns:
             display_df['Throughput'] = display_df['Throughput'].apply(lambda x: f'{x:.2f}')
+        for column in ('P95 Turnaround', 'P99 Turnaround'):
+            if column in display_df.columns:
+                display_df[column] = display_df[column].apply(lambda x: f'{x:.0f}')
+        if 'Jain Turnaround' in display_df.columns:
+            display_df['Jain Turnaround'] = display_df['Jain Turnaround'].apply(lambda x: f'{x:.3f}')
 
         fig, ax = plt.subplots(figsize=(12, 4)) 
         
@@ -0,0 +1,78 @@
+import csv
+import json
+import os
+from typing import Iterable, Iterator, Optional, Union
+
+from process import Process
+from scheduler.scheduler_base import Job
+
+# Job traces on disk, one job per line: pid, arrival, duration, weight (weight optional, default 1).
+#   CSV   header row naming the columns, e.g. "pid,arrival,duration,weight"
+#   JSONL one object per line, e.g. {"pid": "P1", "arrival": 0, "duration": 40, "weight": 2}
+# arrival_time is accepted as an alias of arrival. Readers are generators, so a trace is never
+# materialized: feed read_trace(path) to Scheduler.schedule_stream.
+
+FORMATS = ("csv", "jsonl")
+
+def trace_format(path: str) -> str:
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix == ".csv":
+        return "csv"
+    if suffix in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise ValueError(f"cannot tell the trace format of {path!r}, expected .csv or .jsonl")
+
+def _job(record: dict, where: str) -> Job:
+    try:
+        arrival = record["arrival"] if "arrival" in record else record["arrival_time"]
+        weight = record.get("weight")
+        return (str(record["pid"]), int(arrival), int(record["duration"]),
+                float(weight) if weight not in (None, "") else 1.0)
+    except (KeyError, ValueError, TypeError) as e:
+        raise ValueError(f"bad job at {where}: {e!r}") from None
+
+def read_csv_trace(path: str) -> Iterator[Job]:
+    with open(path, newline="") as f:
+        for line, record in enumerate(csv.DictReader(f), start=2):
+            yield _job(record, f"{path}:{line}")
+
+def read_jsonl_trace(path: str) -> Iterator[Job]:
+    with open(path) as f:
+        for line, text in enumerate(f, start=1):
+            if text.strip():
+                yield _job(json.loads(text), f"{path}:{line}")
+
+def read_trace(path: str, format: Optional[str] = None) -> Iterator[Job]:
+    """
+    lazily yield (pid, arrival, duration, weight) jobs from a trace file.
+    the format comes from the file suffix unless given.
+    """
+    format = format or trace_format(path)
+    if format == "csv":
+        return read_csv_trace(path)
+    if format == "jsonl":
+        return read_jsonl_trace(path)
+    raise ValueError(f"unknown trace format {format!r}, expected one of {FORMATS}")
+
+def write_trace(path: str, jobs: Iterable[Union[Job, Process]], format: Optional[str] = None) -> int:
+    """
+    write jobs or Process objects to a trace file in the given order, returns the number written
+    """
+    format = format or trace_format(path)
+    if format not in FORMATS:
+        raise ValueError(f"unknown trace format {format!r}, expected one of {FORMATS}")
+
+    count = 0
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f) if format == "csv" else None
+        if writer:
+            writer.writerow(["pid", "arrival", "duration", "weight"])
+        for job in jobs:
+            if isinstance(job, Process):
+                job = (job.pid, job.arrival_time, job.duration, job.weight)
+            if writer:
+                writer.writerow(job)
+            else:
+                f.write(json.dumps({"pid": job[0], "arrival": job[1], "duration": job[2], "weight": job[3]}) + "\n")
+            count += 1
+    return count
@@ -0,0 +1,75 @@
+import hashlib
+from array import array
+from typing import Iterable, List, Optional
+
+from process import Process
+from process_table import ProcessTable, _copy_column
+
+class Workload:
+    """
+    Frozen, compiled workload.
+    The input columns are stored once behind read-only memoryviews and the arrival orders the
+    schedulers use are sorted at compile time. new_table() hands out a ProcessTable with fresh
+    state columns that shares the inputs and the orders, so a run costs a few array allocations
+    instead of a deep copy of every Process and a sort.
+    """
+
+    def __init__(self, table: ProcessTable, name: Optional[str] = None):
+        self.name = name
+        self.names = tuple(table.names) if table.names is not None else None
+        self._columns = {column: _copy_column(getattr(table, column)) for column in ProcessTable.INPUT_COLUMNS}
+        self._freeze()
+
+        # (arrival, pid name) order for FCFS / SJF / Priority, stable arrival order for RR / CFS
+        probe = self.new_table()
+        for by_name in (False, True):
+            self.orders[by_name] = array('q', probe.arrival_order(by_name))
+
+    @classmethod
+    def from_processes(cls, processes: Iterable[Process], name: Optional[str] = None) -> "Workload":
+        # only the inputs are compiled, every run starts from the Process.reset() state
+        return cls(ProcessTable.from_processes(processes), name=name)
+
+    def _freeze(self):
+        self.arrival_time = memoryview(self._columns["arrival_time"]).toreadonly()
+        self.duration = memoryview(self._columns["duration"]).toreadonly()
+        self.weight = memoryview(self._columns["weight"]).toreadonly()
+        if not hasattr(self, "orders"):
+            self.orders = {}
+
+    def __getstate__(self):
+        return {"name": self.name, "names": self.names, "_columns": self._columns, "orders": self.orders}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._freeze()
+
+    def __len__(self) -> int:
+        return len(self.arrival_time)
+
+    def __repr__(self):
+        return f"Workload(name={self.name!r}, n={len(self)})"
+
+    def new_table(self) -> ProcessTable:
+        # per-run mutable state over the shared inputs
+        table = ProcessTable(names=self.names)
+        table.arrival_time = self.arrival_time
+        table.duration = self.duration
+        table.weight = self.weight
+        table.orders = self.orders
+        table.reset()
+        return table
+
+    def digest(self) -> str:
+        # sha256 of the inputs (columns and pid names), the name plays no part
+        if getattr(self, "_digest", None) is None:
+            h = hashlib.sha256()
+            for column in ProcessTable.INPUT_COLUMNS:
+                h.update(self._columns[column].tobytes())
+            if self.names is not None:
+                h.update("\0".join(self.names).encode())
+            self._digest = h.hexdigest()
+        return self._digest
+
+    def processes(self) -> List[Process]:
+        return self.new_table().to_processes()
@@ -0,0 +1,142 @@
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from process import Process
+from process_table import ProcessTable
+from workload import Workload
+
+# Synthetic workloads drawn with NumPy straight into columns, 10^7 jobs take a few seconds.
+# Arrival processes:
+#   uniform  arrival times uniform over [0, span]
+#   poisson  exponential gaps, the CPU is offered load times its capacity
+#   bursty   bursts of about burst_size jobs burst_gap ms apart, the bursts arriving as a Poisson
+#            process with the same offered load
+# Durations (integer ms, at least min_duration, capped at max_duration when given):
+#   uniform      integers in [min_duration, max_duration]
+#   exponential  mean mean_duration
+#   lognormal    mean mean_duration, sigma the std dev of the underlying normal
+#   pareto       mean mean_duration, tail index alpha (> 1, heavier tails as it approaches 1)
+# Weights are drawn from weights with probabilities weight_probs (uniform when None).
+# Every replicate has its own seed sequence, (seed, replicate), split into one stream per column,
+# so a replicate comes out the same whichever process draws it and in whatever order, and
+# changing the duration distribution leaves the arrivals of a replicate untouched.
+
+ARRIVALS = ("uniform", "poisson", "bursty")
+DURATIONS = ("uniform", "exponential", "lognormal", "pareto")
+
+# stream index of each column within a replicate
+_ARRIVAL_STREAM, _DURATION_STREAM, _WEIGHT_STREAM = range(3)
+
+class WorkloadGenerator:
+    def __init__(self, arrivals: str = "poisson", durations: str = "lognormal", load: float = 0.9,
+                 span: Optional[int] = None, burst_size: float = 20, burst_gap: float = 1.0,
+                 mean_duration: float = 100.0, min_duration: int = 1, max_duration: Optional[int] = None,
+                 sigma: float = 1.0, alpha: float = 1.5,
+                 weights: Sequence[float] = (1.0, 2.0, 3.0), weight_probs: Optional[Sequence[float]] = None,
+                 seed: int = 0):
+        if arrivals not in ARRIVALS:
+            raise ValueError(f"unknown arrival process {arrivals!r}, expected one of {ARRIVALS}")
+        if durations not in DURATIONS:
+            raise ValueError(f"unknown duration distribution {durations!r}, expected one of {DURATIONS}")
+        if load <= 0:
+            raise ValueError("load must be positive")
+        if durations == "uniform" and max_duration is None:
+            raise ValueError("uniform durations need max_duration")
+        if durations == "pareto" and alpha <= 1:
+            raise ValueError("pareto durations need alpha > 1 for a finite mean")
+        self.arrivals = arrivals
+        self.durations = durations
+        self.load = load
+        self.span = span
+        self.burst_size = burst_size
+        self.burst_gap = burst_gap
+        self.mean_duration = mean_duration
+        self.min_duration = min_duration
+        self.max_duration = max_duration
+        self.sigma = sigma
+        self.alpha = alpha
+        self.weights = tuple(weights)
+        self.weight_probs = tuple(weight_probs) if weight_probs is not None else None
+        self.seed = seed
+
+    def __repr__(self):
+        return f"WorkloadGenerator(arrivals={self.arrivals!r}, durations={self.durations!r}, seed={self.seed})"
+
+    def rng(self, replicate: int, stream: int) -> np.random.Generator:
+        return np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=(replicate, stream)))
+
+    def expected_duration(self) -> float:
+        # the offered load is computed from this, the uncapped mean for the unbounded distributions
+        if self.durations == "uniform":
+            return (self.min_duration + self.max_duration) / 2
+        return self.mean_duration
+
+    def arrival_times(self, n: int, replicate: int = 0) -> np.ndarray:
+        rng = self.rng(replicate, _ARRIVAL_STREAM)
+        mean_gap = self.expected_duration() / self.load
+        if self.arrivals == "uniform":
+            span = self.span if self.span is not None else int(n * mean_gap)
+            return np.sort(rng.integers(0, span + 1, size=n))
+        if self.arrivals == "poisson":
+            times = np.cumsum(rng.exponential(mean_gap, size=n))
+        else:
+            # burst sizes until n jobs are covered, the last one cut short
+            sizes = rng.geometric(1.0 / max(self.burst_size, 1.0), size=max(1, int(n / self.burst_size * 1.2) + 8))
+            while sizes.sum() < n:
+                sizes = np.concatenate((sizes, rng.geometric(1.0 / max(self.burst_size, 1.0), size=len(sizes))))
+            ends = np.cumsum(sizes)
+            count = int(np.searchsorted(ends, n)) + 1
+            sizes = sizes[:count]
+            sizes[-1] -= ends[count - 1] - n
+
+            burst_start = np.cumsum(rng.exponential(mean_gap * self.burst_size, size=count))
+            gaps = rng.exponential(self.burst_gap, size=n)
+            # offset of each job from the start of its burst, the first job of a burst at 0
+            first = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+            gaps[first] = 0.0
+            offsets = np.cumsum(gaps)
+            offsets -= np.repeat(offsets[first], sizes)
+            times = np.sort(np.repeat(burst_start, sizes) + offsets)
+        return np.floor(times).astype(np.int64)
+
+    def duration_times(self, n: int, replicate: int = 0) -> np.ndarray:
+        rng = self.rng(replicate, _DURATION_STREAM)
+        if self.durations == "uniform":
+            return rng.integers(self.min_duration, self.max_duration + 1, size=n, dtype=np.int64)
+        mean = self.mean_duration
+        if self.durations == "exponential":
+            values = rng.exponential(mean, size=n)
+        elif self.durations == "lognormal":
+            values = rng.lognormal(np.log(mean) - self.sigma ** 2 / 2, self.sigma, size=n)
+        else:
+            # Lomax draws shifted to a classic Pareto with minimum x_m, mean alpha x_m / (alpha - 1)
+            x_m = mean * (self.alpha - 1) / self.alpha
+            values = (rng.pareto(self.alpha, size=n) + 1.0) * x_m
+        values = np.ceil(values)
+        upper = self.max_duration if self.max_duration is not None else np.iinfo(np.int64).max // 2
+        return np.clip(values, self.min_duration, upper).astype(np.int64)
+
+    def weight_values(self, n: int, replicate: int = 0) -> np.ndarray:
+        rng = self.rng(replicate, _WEIGHT_STREAM)
+        return rng.choice(np.asarray(self.weights, dtype=np.float64), size=n, p=self.weight_probs)
+
+    def columns(self, n: int, replicate: int = 0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # (arrival_time, duration, weight), arrivals sorted
+        return self.arrival_times(n, replicate), self.duration_times(n, replicate), self.weight_values(n, replicate)
+
+    def table(self, n: int, replicate: int = 0) -> ProcessTable:
+        # anonymous table (pids are the row numbers)
+        return ProcessTable.from_columns(*self.columns(n, replicate))
+
+    def workload(self, n: int, replicate: int = 0, name: Optional[str] = None) -> Workload:
+        return Workload(self.table(n, replicate), name=name or f"{self.arrivals}-{self.durations}-{n}-r{replicate}")
+
+    def replicates(self, n: int, count: int) -> List[Workload]:
+        return [self.workload(n, replicate) for replicate in range(count)]
+
+    def processes(self, n: int, replicate: int = 0) -> List[Process]:
+        # Process objects named P1..Pn, for the list based APIs and small runs
+        arrival, duration, weight = self.columns(n, replicate)
+        return [Process(f"P{i+1}", a, d, w) for i, (a, d, w) in
+                enumerate(zip(arrival.tolist(), duration.tolist(), weight.tolist()))]